@@ -0,0 +1,137 @@
+"""Admission control for /api/predict: bounded concurrency and a short queue.
+
+A request runs only while fewer than `limit` requests are in flight in
+this worker. Otherwise it waits in a queue of at most ADMISSION_QUEUE_SIZE
+requests for up to ADMISSION_QUEUE_TIMEOUT_MS, and is shed with 503 and
+Retry-After when the queue is full or the wait runs out. Shedding takes
+microseconds, so under a burst the requests that are admitted keep their
+normal latency instead of everyone waiting behind everyone else.
+
+The limit adapts to observed latency (AIMD): every request that finishes
+within ADMISSION_TARGET_MS while the limit was in use raises it by
+1/limit, about one per limit's worth of requests, and one that takes
+longer cuts it by ADMISSION_BACKOFF, at most once per target interval so
+a single slow batch does not collapse it. The limit stays between
+ADMISSION_MIN_LIMIT and ADMISSION_MAX_LIMIT.
+
+Limits are per process and only see requests that a worker thread has
+picked up. With gunicorn's gthread workers, connections beyond the thread
+count wait in gunicorn's own queue, which is invisible here, so a worker
+needs more threads than ADMISSION_MAX_LIMIT + ADMISSION_QUEUE_SIZE for
+the excess to reach the limiter and be shed. gunicorn.conf.py sizes the
+pool with worker_threads(); with synchronous workers gunicorn runs one
+request at a time per worker and the limiter never engages.
+
+Environment (defaults in brackets):
+    ADMISSION_LIMIT               initial in-flight limit [8]; 0 disables
+    ADMISSION_MIN_LIMIT           [1]
+    ADMISSION_MAX_LIMIT           [16]
+    ADMISSION_QUEUE_SIZE          requests allowed to wait [8]
+    ADMISSION_QUEUE_TIMEOUT_MS    longest wait before shedding [50]
+    ADMISSION_TARGET_MS           latency above which the limit shrinks [100]
+    ADMISSION_BACKOFF             multiplicative decrease [0.9]
+    ADMISSION_RETRY_AFTER         Retry-After seconds on 503 [1]
+"""
+import os
+import threading
+import time
+
+# Worker threads beyond the limit and queue, which only ever answer 503
+SHED_THREADS = 8
+
+
+class AdmissionController:
+    def __init__(self, limit=8, min_limit=1, max_limit=16, queue_size=8, queue_timeout=0.05,
+                 target_latency=0.1, backoff=0.9, retry_after=1, on_shed=None, clock=time.monotonic):
+        self.limit = float(limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.retry_after = retry_after
+        self.on_shed = on_shed
+        self.clock = clock
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed = 0
+        self._last_decrease = float('-inf')
+        self._ready = threading.Condition(threading.Lock())
+
+    def _reject(self, reason):
+        self.shed += 1
+        if self.on_shed is not None:
+            self.on_shed(reason)
+        return False
+
+    def acquire(self):
+        """True if the request may run (call release() when it ends); False if it is shed."""
+        with self._ready:
+            if self.in_flight >= int(self.limit):
+                if self.queued >= self.queue_size:
+                    return self._reject('queue_full')
+                self.queued += 1
+                try:
+                    deadline = self.clock() + self.queue_timeout
+                    while self.in_flight >= int(self.limit):
+                        remaining = deadline - self.clock()
+                        if remaining <= 0:
+                            return self._reject('queue_timeout')
+                        self._ready.wait(remaining)
+                finally:
+                    self.queued -= 1
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+    def release(self, latency):
+        """End an admitted request that ran for `latency` seconds and adjust the limit."""
+        with self._ready:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            if latency > self.target_latency:
+                now = self.clock()
+                if now - self._last_decrease >= self.target_latency:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_decrease = now
+            elif saturated:
+                # Only grow a limit that is actually being reached
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._ready.notify()
+
+    def stats(self):
+        return {
+            'limit': round(self.limit, 3),
+            'in_flight': self.in_flight,
+            'queued': self.queued,
+            'admitted': self.admitted,
+            'shed': self.shed,
+        }
+
+
+def load_controller(on_shed=None):
+    """The controller configured by ADMISSION_* variables, or None when ADMISSION_LIMIT is 0."""
+    limit = int(os.environ.get('ADMISSION_LIMIT', 8))
+    if limit <= 0:
+        return None
+    return AdmissionController(
+        limit=limit,
+        min_limit=int(os.environ.get('ADMISSION_MIN_LIMIT', 1)),
+        max_limit=int(os.environ.get('ADMISSION_MAX_LIMIT', 16)),
+        queue_size=int(os.environ.get('ADMISSION_QUEUE_SIZE', 8)),
+        queue_timeout=float(os.environ.get('ADMISSION_QUEUE_TIMEOUT_MS', 50)) / 1000,
+        target_latency=float(os.environ.get('ADMISSION_TARGET_MS', 100)) / 1000,
+        backoff=float(os.environ.get('ADMISSION_BACKOFF', 0.9)),
+        retry_after=int(os.environ.get('ADMISSION_RETRY_AFTER', 1)),
+        on_shed=on_shed,
+    )
+
+
+def worker_threads():
+    """Threads per gunicorn worker so that load beyond the limit and queue is shed, not queued unseen."""
+    if int(os.environ.get('ADMISSION_LIMIT', 8)) <= 0:
+        return SHED_THREADS
+    return (int(os.environ.get('ADMISSION_MAX_LIMIT', 16)) + int(os.environ.get('ADMISSION_QUEUE_SIZE', 8))
+            + SHED_THREADS)
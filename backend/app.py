@@ -1,18 +1,38 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
+import time
+from functools import lru_cache
+
+import numpy as np
 from dotenv import load_dotenv
+import batch
+from admission import load_controller
+from bundle import load_bundle
+from drift import load_monitor
+from events import load_store
+from forest import BUNDLE_NAME
+from inference import load_engine
+from metrics import (CounterFunction, Gauge, MODEL_LOAD_SECONDS, MODEL_WARM_UP_SECONDS, PREDICTION_ERRORS,
+                     PREDICTIONS, REQUESTS_SHED, STAGE_SECONDS, registry)
+from prediction_table import MODEL_DIR
+from releases import ModelWatcher, ReleaseStore, load_release
+from shadow import ShadowScorer
+from request_log import configure_logging, log_request, logger
 
 # Load environment variables from .env file
 load_dotenv()
 
 app = Flask(__name__)
 
+configure_logging()
+
 # Get frontend URL from environment variable or use default
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'https://mind-recommend.vercel.app')
 
 # Enable CORS for all origins in development
-CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=False)
+CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=False,
+     expose_headers=['Retry-After', 'X-Model-Version'])
 
 # Add CORS headers to all responses
 @app.after_request
@@ -21,6 +41,8 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', '*')
     response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+    # Flask-CORS leaves responses that already carry Allow-Origin alone, so expose headers here too
+    response.headers.add('Access-Control-Expose-Headers', 'Retry-After,X-Model-Version')
     # Don't use credentials with wildcard origin
     # response.headers.add('Access-Control-Allow-Credentials', 'true')
     return response
@@ -34,98 +56,467 @@ conditions = [
     'Adjustment Disorder', 'Normal'
 ]
 
-recommendations = {
-    'Depression': "Engage in regular exercise, maintain social connections, and seek support from friends/family. If symptoms persist, consult a mental health professional.",
-    'Anxiety': "Practice relaxation techniques (deep breathing, meditation). Maintain a routine, avoid excessive caffeine, and talk to someone you trust. Seek professional help if anxiety interferes with daily life.",
-    'Stress': "Try mindfulness, yoga, or physical activity. Break tasks into manageable steps and take regular breaks. Reach out to support groups or counselors if needed.",
-    'ADHD': "Establish routines, use reminders, and break tasks into smaller steps. Consider professional evaluation for therapy or medication if attention issues are persistent.",
-    'PTSD': "Seek trauma-informed counseling. Practice grounding techniques and connect with support groups. Professional therapy (CBT, EMDR) is highly recommended.",
-    'OCD': "Cognitive-behavioral therapy (CBT) is effective. Practice exposure and response prevention with professional guidance. Medication may help in some cases.",
-    'Bipolar Disorder': "Consult a psychiatrist for mood stabilizers and therapy. Maintain regular sleep and activity patterns. Avoid substance misuse and seek ongoing support.",
-    'Eating Disorder': "Seek help from a nutritionist and mental health professional. Join support groups and involve family in recovery. Early intervention is key.",
-    'Adjustment Disorder': "Talk to a counselor about recent changes. Practice stress management and self-care. Most cases resolve with time and support.",
-    'Normal': "Continue healthy habits: regular sleep, balanced diet, exercise, and social engagement. Monitor your well-being and seek help if you notice changes."
-}
+# Recommendation text ships in the model bundle (vivek/recommendations.json,
+# exported by export_forest.py), so every client shows the same advice. The
+# 'model' backend answers with its release's own text (see recommendation_for)
+recommendations = dict(load_bundle(os.path.join(MODEL_DIR, BUNDLE_NAME), verify=False).recommendations)
+
+def recommendation_for(current, condition):
+    # Read through the engine a request captured, so a hot swap never mixes one
+    # release's prediction with another's text
+    source = current.bundle.recommendations if current.bundle is not None else recommendations
+    return source.get(condition, '')
+
+# Inference backend: 'rules' (hand-written cascade), 'table' (precomputed
+# random forest predictions) or 'model' (the random forest itself, compiled
+# to NumPy arrays). It is loaded and warmed up once at import time; run
+# gunicorn with --preload so workers share it copy-on-write. The 'model'
+# backend serves the current release from releases.py when one has been
+# published, and hot-swaps to new releases (see releases.py); 'rules' and
+# 'table' do not use releases, so production runs 'model'.
+INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND', 'rules')
+
+release_store = ReleaseStore()
+engine = None
+engine_status = {'backend': INFERENCE_BACKEND, 'ready': False}
+
+def install_engine(loaded):
+    # Make a loaded and warmed-up engine the one requests use. Handlers read
+    # `engine` once per request, so a swap never splits a request
+    global engine
+    new_engine, load_seconds, warm_up_seconds = loaded
+    status = {'backend': INFERENCE_BACKEND, 'ready': True, 'version': new_engine.version,
+              'load_seconds': round(load_seconds, 4), 'warm_up_seconds': round(warm_up_seconds, 4)}
+    if new_engine.bundle is not None:
+        status['bundle'] = {
+            'path': os.path.basename(new_engine.bundle.path),
+            'schema_version': new_engine.bundle.meta['schema_version'],
+            'content_hash': new_engine.bundle.content_hash,
+            'load_seconds': round(new_engine.bundle.load_seconds, 4),
+        }
+    engine = new_engine
+    # Updated in place: asgi.py holds a reference to this dict
+    engine_status.clear()
+    engine_status.update(status)
+    MODEL_LOAD_SECONDS.set(load_seconds)
+    MODEL_WARM_UP_SECONDS.set(warm_up_seconds)
+
+release_path = None
+try:
+    if INFERENCE_BACKEND == 'model':
+        # A release that fails to load falls back to an earlier one or the shipped bundle
+        loaded, release_path = load_release(release_store, lambda path: load_engine('model', academic_options, path))
+    else:
+        loaded = load_engine(INFERENCE_BACKEND, academic_options)
+    install_engine(loaded)
+except Exception as e:
+    engine_status['error'] = f'{type(e).__name__}: {e}'
+    logger.exception('Failed to load inference backend %r', INFERENCE_BACKEND)
+
+# Shadow mode: SHADOW_BACKEND re-scores every prediction on background
+# threads and records agreement with the primary backend (see shadow.py)
+SHADOW_BACKEND = os.environ.get('SHADOW_BACKEND')
+shadow = None
+if SHADOW_BACKEND and SHADOW_BACKEND != INFERENCE_BACKEND:
+    try:
+        shadow = ShadowScorer(load_engine(SHADOW_BACKEND, academic_options)[0], conditions,
+                              workers=int(os.environ.get('SHADOW_WORKERS', 1)),
+                              queue_size=int(os.environ.get('SHADOW_QUEUE_SIZE', 1024)))
+        registry.register(CounterFunction('shadow_samples_scored_total',
+                                          'Requests re-scored by the shadow backend.', lambda: shadow.scored))
+        registry.register(CounterFunction('shadow_samples_dropped_total',
+                                          'Shadow samples dropped because the queue was full.', lambda: shadow.dropped))
+    except Exception:
+        logger.exception('Failed to load shadow backend %r', SHADOW_BACKEND)
+
+# Input drift: live answers binned per time bucket and compared with the
+# training data's histograms on demand (see drift.py)
+drift = None
+try:
+    drift = load_monitor()
+    registry.register(Gauge('drift_max_psi', 'Largest per-feature PSI of live inputs against training data.',
+                            lambda: drift.report()['max_psi'] or 0))
+except Exception:
+    logger.exception('Failed to load drift baseline')
+
+def engine_unavailable():
+    return jsonify({'error': 'Inference backend is not available', 'status': engine_status}), 503
+
+def parse_features(data):
+    # Feature row in model order from a /api/predict payload; missing fields default to 0.
+    # Values beyond batch.FEATURE_LIMIT raise ValueError, so every row fits an int array
+    row = []
+    for name in batch.FEATURE_COLUMNS:
+        value = batch.feature_int(name, data.get(name, 0))
+        row.append(value == 1 if name in batch.BOOL_COLUMNS else value)
+    return tuple(row)
 
 @app.route('/api/predict', methods=['POST', 'OPTIONS'])
 def predict():
     # Handle OPTIONS request for CORS preflight
     if request.method == 'OPTIONS':
         return jsonify({}), 200
+    start = time.perf_counter()
     try:
         data = request.json
+        parsed = time.perf_counter()
+        STAGE_SECONDS.labels('parse').observe(parsed - start)
         if not data:
+            PREDICTION_ERRORS.inc('no_data')
             return jsonify({'error': 'No data provided'}), 400
 
-        # Log received data for debugging
-        print("Received data:", data)
-
         # Extract features from request with better error handling
         try:
-            sleep_hours = int(data.get('sleep_hours', 0))
-            academic_performance = int(data.get('academic_performance', 0))
-            bullied = int(data.get('bullied', 0)) == 1
-            has_close_friends = int(data.get('has_close_friends', 0)) == 1
-            homesick_level = int(data.get('homesick_level', 0))
-            mess_food_rating = int(data.get('mess_food_rating', 0))
-            sports_participation = int(data.get('sports_participation', 0)) == 1
-            social_activities = int(data.get('social_activities', 0))
-            study_hours = int(data.get('study_hours', 0))
-            screen_time = int(data.get('screen_time', 0))
+            row = parse_features(data)
         except (ValueError, TypeError) as e:
+            PREDICTION_ERRORS.inc('invalid_input')
             return jsonify({'error': f'Invalid data format: {str(e)}'}), 400
 
-        # Simple rule-based prediction (similar to the original logic in hello.ipynb)
-        # This is a simplified version of the model
-        # academic_performance: 0 = Poor, 1 = Average, 2 = Good
-
-        # Depression indicators
-        if (sleep_hours <= 5 and screen_time >= 7) or (bullied and not has_close_friends) or (academic_performance == 0 and social_activities <= 2):
-            condition = 'Depression'
-        # Anxiety indicators
-        elif (homesick_level >= 4 and bullied) or (academic_performance == 0 and sleep_hours <= 6) or (screen_time >= 8 and social_activities <= 2):
-            condition = 'Anxiety'
-        # Stress indicators
-        elif (study_hours >= 7) or (sleep_hours <= 5 and academic_performance == 0) or (homesick_level >= 4 and study_hours >= 6):
-            condition = 'Stress'
-        # ADHD indicators
-        elif (study_hours <= 2 and screen_time >= 8 and academic_performance == 0) or (social_activities >= 4 and academic_performance == 0):
-            condition = 'ADHD'
-        # PTSD indicators
-        elif bullied and sleep_hours <= 5 and homesick_level >= 4:
-            condition = 'PTSD'
-        # OCD indicators
-        elif (study_hours >= 7 and social_activities <= 1) or (academic_performance == 2 and mess_food_rating <= 2 and study_hours >= 6):
-            condition = 'OCD'
-        # Bipolar Disorder indicators
-        elif (sleep_hours <= 4 or sleep_hours >= 9) and (social_activities >= 4 or sports_participation) and screen_time >= 8:
-            condition = 'Bipolar Disorder'
-        # Eating Disorder indicators
-        elif mess_food_rating <= 2 and sleep_hours <= 5 and homesick_level >= 4:
-            condition = 'Eating Disorder'
-        # Adjustment Disorder indicators
-        elif homesick_level >= 4 and academic_performance == 1 and 5 <= sleep_hours <= 7:
-            condition = 'Adjustment Disorder'
-        # Normal
-        else:
-            condition = 'Normal'
+        current = engine
+        if current is None:
+            PREDICTION_ERRORS.inc('backend_unavailable')
+            return engine_unavailable()
+        try:
+            current.check_row(row)
+        except ValueError as e:
+            PREDICTION_ERRORS.inc('invalid_input')
+            return jsonify({'error': str(e)}), 400
+        validated = time.perf_counter()
+        STAGE_SECONDS.labels('validate').observe(validated - parsed)
+
+        condition = current.predict(row)
+        inferred = time.perf_counter()
+        STAGE_SECONDS.labels('inference').observe(inferred - validated)
+
+        # Drift, shadow and event recording only update counters or enqueue
+        if drift is not None:
+            drift.observe(row)
+        if shadow is not None:
+            shadow.submit(row, condition)
+        if events is not None:
+            events.record(row, condition, current.version)
+        monitored = time.perf_counter()
+        STAGE_SECONDS.labels('monitoring').observe(monitored - inferred)
+
+        recommendation = recommendation_for(current, condition)
+        recommended = time.perf_counter()
+        STAGE_SECONDS.labels('recommendation').observe(recommended - monitored)
+
+        # Only an enqueue; formatting, redaction and output happen on the log thread
+        log_request('prediction', data=data, condition=condition, backend=INFERENCE_BACKEND, model_version=current.version)
 
         # Return prediction and recommendation
-        return jsonify({
+        response = jsonify({
             'condition': condition,
-            'recommendation': recommendations.get(condition, '')
+            'recommendation': recommendation,
+            'model_version': current.version
         })
+        STAGE_SECONDS.labels('serialize').observe(time.perf_counter() - recommended)
+        PREDICTIONS.inc(condition)
+        return response
 
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"Error in predict endpoint: {str(e)}")
-        print(f"Error details: {error_details}")
+        PREDICTION_ERRORS.inc(type(e).__name__)
+        logger.exception('Error in predict endpoint')
         return jsonify({
             'error': str(e),
             'message': 'An error occurred while processing your request. Please check your input data and try again.'
         }), 400
 
+# GET /api/predict is a pure function of ten small integers and the model
+# version, so answers are cached in-process and marked cacheable for browsers,
+# CDNs and proxies
+PREDICT_CACHE_SIZE = int(os.environ.get('PREDICT_CACHE_SIZE', 4096))
+PREDICT_CACHE_MAX_AGE = int(os.environ.get('PREDICT_CACHE_MAX_AGE', 86400))
+
+@lru_cache(maxsize=PREDICT_CACHE_SIZE)
+def cached_prediction(current, key):
+    return current.predict(key)
+
+CACHE_HITS = registry.register(CounterFunction(
+    'prediction_cache_hits_total', 'GET /api/predict answers served from the in-process cache.',
+    lambda: cached_prediction.cache_info().hits))
+CACHE_MISSES = registry.register(CounterFunction(
+    'prediction_cache_misses_total', 'GET /api/predict answers computed by the inference backend.',
+    lambda: cached_prediction.cache_info().misses))
+
+def reload_engine(loaded):
+    # Called on the watcher thread with a new release, already warmed up
+    previous = engine.version if engine is not None else None
+    install_engine(loaded)
+    # Cached answers hold references to the old engine
+    cached_prediction.cache_clear()
+    logger.info('Swapped inference model %s -> %s', previous, engine.version)
+
+model_watcher = None
+if INFERENCE_BACKEND == 'model':
+    model_watcher = ModelWatcher(release_store, lambda path: load_engine('model', academic_options, path),
+                                 reload_engine, active_path=release_path)
+    if release_store.current() not in (None, release_path):
+        # CURRENT failed to load at startup; try it again once it changes, as after a failed reload
+        model_watcher.failed_path = release_store.current()
+    MODEL_RELOADS = registry.register(CounterFunction(
+        'model_reloads_total', 'Model releases swapped in by this worker.', lambda: model_watcher.reloads))
+
+@app.before_request
+def start_model_watcher():
+    # Started on the first request so each gunicorn worker runs its own watcher
+    if model_watcher is not None:
+        model_watcher.start()
+
+# Anonymized prediction events, recorded off the request path into SQLite
+# with hourly aggregates for /api/stats (see events.py)
+events = None
+try:
+    events = load_store()
+    if events is not None:
+        registry.register(CounterFunction('prediction_events_recorded_total',
+                                          'Prediction events committed by this worker.', lambda: events.recorded))
+        registry.register(CounterFunction('prediction_events_dropped_total',
+                                          'Prediction events dropped because the queue was full.', lambda: events.dropped))
+except Exception:
+    logger.exception('Failed to open prediction event store')
+
+# Admission control: a bounded, latency-adaptive number of /api/predict
+# requests run at once per worker; the rest queue briefly or are shed with
+# 503 and Retry-After (see admission.py)
+admission = load_controller(on_shed=REQUESTS_SHED.inc)
+if admission is not None:
+    registry.register(Gauge('admission_limit', 'Current in-flight limit for /api/predict.', lambda: admission.limit))
+    registry.register(Gauge('admission_in_flight', '/api/predict requests running now.', lambda: admission.in_flight))
+    registry.register(Gauge('admission_queued', '/api/predict requests waiting for admission.', lambda: admission.queued))
+
+@app.before_request
+def admit():
+    if admission is None or request.path != '/api/predict' or request.method == 'OPTIONS':
+        return None
+    if not admission.acquire():
+        response = jsonify({'error': 'Server is busy, please retry shortly'})
+        response.headers['Retry-After'] = str(admission.retry_after)
+        return response, 503
+    g.admitted_at = time.perf_counter()
+    return None
+
+@app.teardown_request
+def release_admission(exc):
+    admitted_at = g.pop('admitted_at', None)
+    if admitted_at is not None:
+        admission.release(time.perf_counter() - admitted_at)
+
+@app.route('/api/predict', methods=['GET'])
+def predict_get():
+    current = engine
+    if current is None:
+        return engine_unavailable()
+    try:
+        row = parse_features(request.args)
+        current.check_row(row)
+    except (ValueError, TypeError) as e:
+        PREDICTION_ERRORS.inc('invalid_input')
+        return jsonify({'error': f'Invalid data format: {str(e)}'}), 400
+
+    # Canonical key: the ten feature values as ints, e.g. 7.1.0.1.2.3.1.5.4.3
+    key = tuple(int(value) for value in row)
+    if drift is not None:
+        drift.observe(key)
+    etag = f"{current.version}-{'.'.join(map(str, key))}"
+    if request.args.get('v') == current.version:
+        # The URL pins the model version, so the answer can never change
+        cache_control = 'public, max-age=31536000, immutable'
+    else:
+        cache_control = f'public, max-age={PREDICT_CACHE_MAX_AGE}'
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        condition = cached_prediction(current, key)
+        PREDICTIONS.inc(condition)
+        if shadow is not None:
+            shadow.submit(key, condition)
+        if events is not None:
+            events.record(key, condition, current.version)
+        response = jsonify({
+            'condition': condition,
+            'recommendation': recommendation_for(current, condition),
+            'model_version': current.version
+        })
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+@app.route('/api/predict/batch', methods=['POST', 'OPTIONS'])
+def predict_batch():
+    # Handle OPTIONS request for CORS preflight
+    if request.method == 'OPTIONS':
+        return jsonify({}), 200
+    current = engine
+    if current is None:
+        return engine_unavailable()
+    # Rows are read from the request stream, scored and written back one
+    # chunk at a time, so memory stays bounded whatever the upload size
+    try:
+        chunk_size = min(int(request.args.get('chunk_size', batch.DEFAULT_CHUNK_SIZE)), batch.MAX_CHUNK_SIZE)
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive')
+        records = batch.iter_records(request.stream, request.content_type)
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    fmt = request.args.get('format')
+    if fmt is None:
+        fmt = 'csv' if request.accept_mimetypes.best == 'text/csv' else 'ndjson'
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({'error': f'Unsupported format: {fmt}'}), 400
+
+    score = current.predict_batch
+    if drift is not None or events is not None:
+        def score(X):
+            if drift is not None:
+                drift.observe_batch(X)
+            predictions = current.predict_batch(X)
+            if events is not None:
+                events.record_batch(X, predictions, current.version)
+            return predictions
+
+    lines = batch.stream_predictions(records, score, academic_options, chunk_size, fmt)
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(lines), mimetype=mimetype, headers={'X-Model-Version': current.version})
+
+# /api/explain needs the random forest itself. With the 'model' backend it
+# explains with the serving engine; other backends load the shipped bundle
+# alongside (per-leaf contributions are precomputed during its warm-up)
+MAX_EXPLAIN_ROWS = int(os.environ.get('MAX_EXPLAIN_ROWS', 1000))
+explainer = None
+if INFERENCE_BACKEND != 'model':
+    try:
+        explainer = load_engine('model', academic_options)[0]
+    except Exception:
+        logger.exception('Failed to load the model for /api/explain')
+
+def current_explainer():
+    current = engine
+    if current is not None and current.name == 'model':
+        return current
+    return explainer
+
+def explanation(current, proba, bias, contributions, all_conditions):
+    classes = current.model.condition_classes
+    predicted = int(proba.argmax())
+    condition = classes[predicted]
+    result = {
+        'condition': condition,
+        'probabilities': {name: round(float(p), 6) for name, p in zip(classes, proba)},
+        'base_probabilities': {name: round(float(p), 6) for name, p in zip(classes, bias)},
+    }
+    if all_conditions:
+        result['contributions'] = {feature: {name: round(float(c), 6) for name, c in zip(classes, row)}
+                                   for feature, row in zip(current.model.feature_names, contributions)}
+    else:
+        # Change in the predicted condition's probability credited to each answer
+        result['contributions'] = {feature: round(float(row[predicted]), 6)
+                                   for feature, row in zip(current.model.feature_names, contributions)}
+    return result
+
+@app.route('/api/explain', methods=['POST', 'OPTIONS'])
+def explain():
+    # Handle OPTIONS request for CORS preflight
+    if request.method == 'OPTIONS':
+        return jsonify({}), 200
+    current = current_explainer()
+    if current is None:
+        return engine_unavailable()
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    try:
+        row = parse_features(data)
+        current.check_row(row)
+    except (ValueError, TypeError, AttributeError, OverflowError) as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}'}), 400
+
+    proba, bias, contributions = current.explain_batch(np.array([row], dtype=np.int64))
+    result = explanation(current, proba[0], bias, contributions[0], request.args.get('all_conditions') == '1')
+    result['recommendation'] = recommendation_for(current, result['condition'])
+    result['model_version'] = current.version
+    return jsonify(result)
+
+@app.route('/api/explain/batch', methods=['POST', 'OPTIONS'])
+def explain_batch():
+    # Handle OPTIONS request for CORS preflight
+    if request.method == 'OPTIONS':
+        return jsonify({}), 200
+    current = current_explainer()
+    if current is None:
+        return engine_unavailable()
+    data = request.get_json(silent=True)
+    records = data.get('rows') if isinstance(data, dict) else data
+    if not isinstance(records, list) or not records:
+        return jsonify({'error': 'Expected a JSON list of /api/predict payloads, or {"rows": [...]}'}), 400
+    if len(records) > MAX_EXPLAIN_ROWS:
+        return jsonify({'error': f'At most {MAX_EXPLAIN_ROWS} rows per request; use /api/predict/batch for labels only'}), 413
+
+    # Invalid rows get an error entry; the rest are explained in one vectorized call
+    rows, positions, results = [], [], [None] * len(records)
+    for i, record in enumerate(records):
+        try:
+            row = parse_features(record)
+            current.check_row(row)
+        except (ValueError, TypeError, AttributeError, OverflowError) as e:
+            results[i] = {'error': f'Invalid data format: {str(e)}'}
+            continue
+        rows.append(row)
+        positions.append(i)
+    if rows:
+        all_conditions = request.args.get('all_conditions') == '1'
+        proba, bias, contributions = current.explain_batch(np.array(rows, dtype=np.int64))
+        for k, i in enumerate(positions):
+            results[i] = explanation(current, proba[k], bias, contributions[k], all_conditions)
+    return jsonify({'model_version': current.version, 'results': results})
+
+@app.route('/api/shadow', methods=['GET'])
+def shadow_stats():
+    # Agreement between the primary and shadow backends, for this worker
+    if shadow is None:
+        return jsonify({'error': 'Shadow mode is off; set SHADOW_BACKEND to a backend other than INFERENCE_BACKEND'}), 404
+    result = shadow.stats()
+    result.update(primary_backend=INFERENCE_BACKEND, shadow_backend=SHADOW_BACKEND)
+    return jsonify(result)
+
+@app.route('/api/drift', methods=['GET'])
+def drift_report():
+    # PSI of this worker's recent inputs against the training data; ?window=<seconds>
+    if drift is None:
+        return jsonify({'error': 'Drift baseline is not available'}), 404
+    try:
+        window = request.args.get('window', type=int)
+        if window is not None and window < 1:
+            raise ValueError('window must be a positive number of seconds')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(drift.report(window))
+
+MAX_STATS_HOURS = 24 * 90
+
+@app.route('/api/stats', methods=['GET'])
+def stats():
+    # Prediction counts by condition and by answer bucket over the last ?hours= hours (default 24)
+    if events is None:
+        return jsonify({'error': 'Prediction event recording is off; set EVENTS_DB'}), 404
+    hours = request.args.get('hours', 24, type=int)
+    if not 1 <= hours <= MAX_STATS_HOURS:
+        return jsonify({'error': f'hours must be between 1 and {MAX_STATS_HOURS}'}), 400
+    condition = request.args.get('condition')
+    if condition is not None and condition not in conditions:
+        return jsonify({'error': f'Unknown condition: {condition}'}), 400
+    return jsonify(events.stats(hours, condition))
+
+@app.route('/api/admission', methods=['GET'])
+def admission_stats():
+    # Admission limit and counts for this worker
+    if admission is None:
+        return jsonify({'error': 'Admission control is off; set ADMISSION_LIMIT above 0'}), 404
+    return jsonify(admission.stats())
+
 @app.route('/api/academic-options', methods=['GET', 'OPTIONS'])
 def get_academic_options():
     # Handle OPTIONS request for CORS preflight
@@ -133,6 +524,16 @@ def get_academic_options():
         return jsonify({}), 200
     return jsonify(academic_options)
 
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    # Readiness probe: 200 once the inference backend is loaded and warmed up
+    return jsonify(engine_status), 200 if engine is not None else 503
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    # Prometheus text exposition format; values are per gunicorn worker
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/', methods=['GET', 'OPTIONS'])
 def home():
     # Handle OPTIONS request for CORS preflight
@@ -140,8 +541,18 @@ def home():
         return jsonify({}), 200
     return jsonify({
         'message': 'Mental Health Assessment API is running',
+        'model_version': engine.version if engine is not None else None,
         'endpoints': {
             'predict': '/api/predict',
+            'predict_batch': '/api/predict/batch',
+            'explain': '/api/explain',
+            'explain_batch': '/api/explain/batch',
+            'ready': '/api/ready',
+            'shadow': '/api/shadow',
+            'drift': '/api/drift',
+            'admission': '/api/admission',
+            'stats': '/api/stats',
+            'metrics': '/metrics',
             'academic_options': '/api/academic-options'
         }
     })
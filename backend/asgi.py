@@ -0,0 +1,140 @@
+"""ASGI entry point that micro-batches /api/predict.
+
+Same /api/predict contract as the Flask app, but concurrent requests are
+coalesced into micro-batches and scored with one vectorized call per batch.
+Run it with uvicorn workers, for example:
+
+    gunicorn asgi:app -k uvicorn.workers.UvicornWorker --preload --bind 0.0.0.0:$PORT
+
+MICROBATCH_MAX_SIZE and MICROBATCH_WAIT_MS set the batch size cap and the
+collection window; /api/batching reports batch size, queue wait and
+inference time so the window can be tuned. With the 'model' backend the
+worker hot-swaps to newly published releases like the Flask app does.
+"""
+import json
+import os
+
+import app as flask_app
+from app import academic_options, engine_status, parse_features, recommendation_for
+from batching import MicroBatcher
+
+MAX_BODY_BYTES = 64 * 1024
+
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-headers', b'Content-Type,Authorization'),
+    (b'access-control-allow-methods', b'GET,PUT,POST,DELETE,OPTIONS'),
+]
+
+
+def score_batch(X):
+    # One engine per batch, so every row reports the version and text of the release that scored it
+    current = flask_app.engine
+    if flask_app.drift is not None:
+        flask_app.drift.observe_batch(X)
+    conditions = current.predict_batch(X)
+    if flask_app.events is not None:
+        flask_app.events.record_batch(X, conditions, current.version, source='api')
+    return [(condition, current.version, recommendation_for(current, condition)) for condition in conditions]
+
+
+batcher = MicroBatcher(
+    score_batch,
+    max_batch_size=int(os.environ.get('MICROBATCH_MAX_SIZE', 64)),
+    max_wait_ms=float(os.environ.get('MICROBATCH_WAIT_MS', 2.0)),
+)
+
+
+async def send_json(send, payload, status=200):
+    body = json.dumps(payload).encode()
+    headers = [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers + CORS_HEADERS})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY_BYTES:
+            raise ValueError('Request body too large')
+        if not message.get('more_body'):
+            return body
+
+
+async def predict(receive, send):
+    try:
+        data = json.loads(await read_body(receive) or b'null')
+    except ValueError as e:
+        return await send_json(send, {'error': str(e)}, 400)
+    if not data:
+        return await send_json(send, {'error': 'No data provided'}, 400)
+
+    try:
+        row = parse_features(data)
+    except (ValueError, TypeError, AttributeError, OverflowError) as e:
+        return await send_json(send, {'error': f'Invalid data format: {str(e)}'}, 400)
+
+    current = flask_app.engine
+    if current is None:
+        return await send_json(send, {'error': 'Inference backend is not available', 'status': engine_status}, 503)
+    try:
+        current.check_row(row)
+    except ValueError as e:
+        return await send_json(send, {'error': str(e)}, 400)
+
+    condition, model_version, recommendation = await batcher.submit(row)
+    if flask_app.shadow is not None:
+        flask_app.shadow.submit(row, condition)
+    await send_json(send, {
+        'condition': condition,
+        'recommendation': recommendation,
+        'model_version': model_version
+    })
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            batcher.start()
+            if flask_app.model_watcher is not None:
+                flask_app.model_watcher.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await batcher.stop()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    method, path = scope['method'], scope['path']
+    if method == 'OPTIONS':
+        return await send_json(send, {})
+    if path == '/api/predict' and method == 'POST':
+        return await predict(receive, send)
+    if path == '/api/batching' and method == 'GET':
+        return await send_json(send, batcher.stats())
+    if path == '/api/academic-options' and method == 'GET':
+        return await send_json(send, academic_options)
+    if path == '/api/ready' and method == 'GET':
+        return await send_json(send, engine_status, 200 if flask_app.engine is not None else 503)
+    if path == '/' and method == 'GET':
+        current = flask_app.engine
+        return await send_json(send, {
+            'message': 'Mental Health Assessment API is running',
+            'model_version': current.version if current is not None else None,
+            'endpoints': {
+                'predict': '/api/predict',
+                'academic_options': '/api/academic-options',
+                'ready': '/api/ready',
+                'batching': '/api/batching'
+            }
+        })
+    await send_json(send, {'error': 'Not found'}, 404)
@@ -0,0 +1,292 @@
+import codecs
+import csv
+import itertools
+import json
+import time
+
+import numpy as np
+
+# Feature columns, in the order used by the model and boarding_school_mental_health_2500.csv
+FEATURE_COLUMNS = [
+    'sleep_hours', 'academic_performance', 'bullied', 'has_close_friends',
+    'homesick_level', 'mess_food_rating', 'sports_participation',
+    'social_activities', 'study_hours', 'screen_time'
+]
+BOOL_COLUMNS = {'bullied', 'has_close_friends', 'sports_participation'}
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'no', 'n'}
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 10000
+READ_SIZE = 64 * 1024
+# Longest single element of a JSON array body; a row is a few hundred characters
+MAX_RECORD_CHARS = 64 * 1024
+# Largest accepted magnitude of a feature value. Answers outside a question's own
+# range are still scored (the model clamps them), but rows are scored as int32 arrays
+FEATURE_LIMIT = 10 ** 6
+
+
+class BatchFormatError(ValueError):
+    """The request body cannot be parsed as a batch of rows."""
+
+
+def _iter_text(stream):
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        while True:
+            block = stream.read(READ_SIZE)
+            if not block:
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    yield tail
+                return
+            yield decoder.decode(block)
+    except UnicodeDecodeError as e:
+        raise BatchFormatError(f'Request body is not valid UTF-8: {e}')
+
+
+def _iter_lines(stream):
+    pending = ''
+    for text in _iter_text(stream):
+        lines = (pending + text).split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line + '\n'
+    if pending:
+        yield pending
+
+
+def iter_csv_records(stream):
+    try:
+        yield from csv.DictReader(_iter_lines(stream))
+    except csv.Error as e:
+        raise BatchFormatError(f'Invalid CSV: {e}')
+
+
+def iter_ndjson_records(stream):
+    for line_no, line in enumerate(_iter_lines(stream), 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise BatchFormatError(f'Invalid JSON on line {line_no}: {e}')
+
+
+def _definitely_invalid(error, buf):
+    # raw_decode also fails on an element cut off at the end of the buffer. An error well
+    # before the end (past any partial escape), other than an unterminated string, cannot
+    # be fixed by reading more.
+    return error.pos < len(buf) - 16 and not error.msg.startswith('Unterminated string')
+
+
+def iter_json_array_records(stream):
+    """Yield the elements of a top-level JSON array without reading it all into memory.
+
+    Malformed input is reported as soon as it is seen: an element that
+    fails to decode, or is still incomplete after MAX_RECORD_CHARS, raises
+    BatchFormatError without buffering the rest of the body. Missing or
+    repeated commas and anything but whitespace after the closing ']' are
+    errors too.
+    """
+    decoder = json.JSONDecoder()
+    texts = _iter_text(stream)
+    buf = ''
+    pos = 0
+    eof = False
+    # 'open': expecting '['; 'first': an element or ']'; 'element': an element;
+    # 'separator': ',' or ']'; 'closed': only whitespace may follow
+    expect = 'open'
+    index = 0
+
+    while True:
+        while pos < len(buf) and buf[pos].isspace():
+            pos += 1
+        if pos < len(buf):
+            char = buf[pos]
+            if expect == 'open':
+                if char != '[':
+                    raise BatchFormatError('Expected a JSON array')
+                expect, pos = 'first', pos + 1
+                continue
+            if expect == 'closed':
+                raise BatchFormatError('Unexpected data after the end of the JSON array')
+            if expect == 'separator' or (expect == 'first' and char == ']'):
+                if char == ']':
+                    expect, pos = 'closed', pos + 1
+                elif char == ',':
+                    expect, pos = 'element', pos + 1
+                else:
+                    raise BatchFormatError(f"Expected ',' or ']' after element {index - 1}")
+                continue
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except ValueError as e:
+                if eof or len(buf) - pos > MAX_RECORD_CHARS or _definitely_invalid(e, buf):
+                    raise BatchFormatError(f'Invalid JSON in element {index}: {e}')
+            else:
+                # A number ending exactly at the buffer end may continue in the next block
+                if end < len(buf) or eof:
+                    yield record
+                    index += 1
+                    expect = 'separator'
+                    buf, pos = buf[end:], 0
+                    continue
+            if len(buf) - pos > MAX_RECORD_CHARS:
+                raise BatchFormatError(f'Element {index} is longer than {MAX_RECORD_CHARS} characters')
+        elif eof:
+            if expect == 'closed':
+                return
+            raise BatchFormatError('Unexpected end of JSON array')
+
+        text = next(texts, None)
+        if text is None:
+            eof = True
+        else:
+            buf = buf[pos:] + text
+            pos = 0
+
+
+def iter_records(stream, content_type):
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type in ('text/csv', 'application/csv'):
+        return iter_csv_records(stream)
+    if content_type in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+        return iter_ndjson_records(stream)
+    if content_type == 'application/json':
+        return iter_json_array_records(stream)
+    raise BatchFormatError(f'Unsupported content type: {content_type or "none"}')
+
+
+def feature_int(column, value):
+    """int(value), raising ValueError when it is infinite or beyond FEATURE_LIMIT."""
+    try:
+        number = int(value)
+    except OverflowError:
+        raise ValueError(f'{column} out of range: {value}')
+    if not -FEATURE_LIMIT <= number <= FEATURE_LIMIT:
+        raise ValueError(f'{column} out of range: {value}')
+    return number
+
+
+def encode_value(column, value, academic_options):
+    """Encode one raw value the way /api/predict does (academic_performance: 0 = Poor, 1 = Average, 2 = Good)."""
+    if isinstance(value, str):
+        value = value.strip()
+    if column == 'academic_performance':
+        if value in academic_options:
+            return academic_options.index(value)
+        code = feature_int(column, value)
+        if not 0 <= code < len(academic_options):
+            raise ValueError(f'invalid academic_performance: {value}')
+        return code
+    if column in BOOL_COLUMNS:
+        text = str(value).lower()
+        if text in TRUE_VALUES:
+            return 1
+        if text in FALSE_VALUES:
+            return 0
+        raise ValueError(f'invalid boolean for {column}: {value}')
+    return feature_int(column, value)
+
+
+def encode_chunk(records, academic_options):
+    """Encode a list of row dicts into an (n, 10) int array.
+
+    Returns the array, a boolean mask of valid rows and a dict mapping the
+    position of each invalid row to its error message.
+    """
+    X = np.zeros((len(records), len(FEATURE_COLUMNS)), dtype=np.int32)
+    valid = np.ones(len(records), dtype=bool)
+    errors = {}
+    for j, column in enumerate(FEATURE_COLUMNS):
+        col = X[:, j]
+        for i, record in enumerate(records):
+            if not valid[i]:
+                continue
+            try:
+                col[i] = encode_value(column, record[column], academic_options)
+            except KeyError:
+                valid[i] = False
+                errors[i] = f'missing column: {column}'
+            except (ValueError, TypeError, OverflowError) as e:
+                valid[i] = False
+                errors[i] = f'Invalid data format: {e}'
+    return X, valid, errors
+
+
+def _format_row(fmt, row, condition=None, error=None):
+    if fmt == 'csv':
+        return f'{row},{condition or ""},{_csv_quote(error or "")}\n'
+    result = {'row': row}
+    if error is None:
+        result['condition'] = condition
+    else:
+        result['error'] = error
+    return json.dumps(result) + '\n'
+
+
+def _format_chunk_stats(fmt, stats):
+    if fmt == 'csv':
+        return '# ' + ' '.join(f'{key}={value}' for key, value in stats.items()) + '\n'
+    return json.dumps(stats) + '\n'
+
+
+def _csv_quote(text):
+    if any(c in text for c in ',"\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def stream_predictions(records, score_batch, academic_options, chunk_size=DEFAULT_CHUNK_SIZE, fmt='ndjson'):
+    """Score rows chunk by chunk and yield output lines as soon as each chunk is done.
+
+    score_batch takes an (n, 10) array of encoded rows and returns n
+    condition names. Only one chunk of rows is held in memory at a time.
+    Each chunk's rows are followed by a stats line with its timings; in CSV
+    output the stats lines are '#' comments.
+    """
+    if fmt == 'csv':
+        yield 'row,condition,error\n'
+
+    records = iter(records)
+    offset = 0
+    for chunk_index in itertools.count():
+        start = time.perf_counter()
+        chunk = []
+        failure = None
+        try:
+            chunk.extend(itertools.islice(records, chunk_size))
+        except BatchFormatError as e:
+            failure = e
+        if not chunk:
+            if failure is not None:
+                yield _format_row(fmt, offset, error=str(failure))
+            return
+        X, valid, errors = encode_chunk(chunk, academic_options)
+        encoded = time.perf_counter()
+
+        conditions = score_batch(X[valid]) if valid.any() else []
+        scored = time.perf_counter()
+
+        scored_conditions = iter(conditions)
+        lines = []
+        for i in range(len(chunk)):
+            if valid[i]:
+                lines.append(_format_row(fmt, offset + i, condition=next(scored_conditions)))
+            else:
+                lines.append(_format_row(fmt, offset + i, error=errors[i]))
+        lines.append(_format_chunk_stats(fmt, {
+            'chunk': chunk_index,
+            'rows': len(chunk),
+            'errors': len(errors),
+            'read_ms': round((encoded - start) * 1000, 3),
+            'score_ms': round((scored - encoded) * 1000, 3),
+        }))
+        offset += len(chunk)
+        if failure is not None:
+            lines.append(_format_row(fmt, offset, error=str(failure)))
+        yield ''.join(lines)
+        if failure is not None:
+            return
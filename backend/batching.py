@@ -0,0 +1,130 @@
+import asyncio
+import collections
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Number of recent batches kept for the percentile figures in stats()
+STATS_WINDOW = 1024
+
+
+def _percentiles(samples):
+    if not samples:
+        return None
+    p50, p95, p99 = np.percentile(np.fromiter(samples, dtype=float), [50, 95, 99])
+    return {'p50': round(p50, 3), 'p95': round(p95, 3), 'p99': round(p99, 3), 'max': round(max(samples), 3)}
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row predictions into vectorized batches.
+
+    Callers await submit(row). A collector task takes the first queued row,
+    keeps collecting for up to max_wait_ms or until max_batch_size rows are
+    queued, then scores them with one predict_batch call on a worker thread
+    and hands every caller its own result. If that call fails, the rows are
+    scored one at a time so a bad row only fails its own caller. The next
+    batch collects while the previous one is being scored.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=64, max_wait_ms=2.0):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._task = None
+        self._executor = None
+
+        self.batches = 0
+        self.rows = 0
+        self._batch_sizes = collections.deque(maxlen=STATS_WINDOW)
+        self._queue_wait_ms = collections.deque(maxlen=STATS_WINDOW)
+        self._inference_ms = collections.deque(maxlen=STATS_WINDOW)
+
+    def start(self):
+        if self._task is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='microbatch')
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._executor.shutdown(wait=False)
+
+    async def submit(self, row):
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(pending) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._score(loop, pending)
+
+    def _predict(self, rows):
+        # A fixed dtype, so an odd row cannot turn the whole batch into an object array
+        return self.predict_batch(np.array(rows, dtype=np.int64))
+
+    async def _score(self, loop, pending):
+        start = time.perf_counter()
+        rows = [row for row, _, _ in pending]
+        try:
+            outcomes = [(result, None) for result in
+                        await loop.run_in_executor(self._executor, self._predict, rows)]
+        except Exception as e:
+            if len(rows) == 1:
+                outcomes = [(None, e)]
+            else:
+                # Score the rows one at a time, so only the caller whose row fails gets the error
+                outcomes = []
+                for row in rows:
+                    try:
+                        result, = await loop.run_in_executor(self._executor, self._predict, [row])
+                    except Exception as row_error:
+                        outcomes.append((None, row_error))
+                    else:
+                        outcomes.append((result, None))
+        done = time.perf_counter()
+
+        for (_, future, _), (result, error) in zip(pending, outcomes):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+        self.batches += 1
+        self.rows += len(pending)
+        self._batch_sizes.append(len(pending))
+        self._queue_wait_ms.extend((start - queued) * 1000 for _, _, queued in pending)
+        self._inference_ms.append((done - start) * 1000)
+
+    def stats(self):
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'rows': self.rows,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'batch_size': _percentiles(self._batch_sizes),
+            'queue_wait_ms': _percentiles(self._queue_wait_ms),
+            'inference_ms': _percentiles(self._inference_ms),
+        }
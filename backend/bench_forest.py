@@ -0,0 +1,93 @@
+"""Compare serving cost of the compiled forest against the sklearn pickle.
+
+Reports import time, model load time, single-row latency and batch
+throughput. The sklearn side needs scikit-learn, pandas and joblib:
+
+    python bench_forest.py [--rows 2000] [--batch 10000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import warnings
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VIVEK_DIR = os.path.join(HERE, '..', 'vivek')
+
+
+def import_time(statement):
+    # Fresh interpreter each time so nothing is already imported
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, '-W', 'ignore', '-c', code], cwd=HERE,
+                         check=True, capture_output=True, text=True)
+    return float(out.stdout.strip())
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def random_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ranges = [(2, 12), (0, 2), (0, 1), (0, 1), (1, 5), (1, 5), (0, 1), (0, 5), (0, 10), (1, 12)]
+    return np.column_stack([rng.integers(lo, hi + 1, n) for lo, hi in ranges])
+
+
+def bench_compiled(rows, batch):
+    from forest import CompiledForest
+
+    results = {'import_s': import_time('import forest')}
+    results['load_s'], forest = timed(CompiledForest.load)
+    per_row, _ = timed(lambda: [forest.predict_one(row) for row in rows])
+    results['row_latency_us'] = per_row / len(rows) * 1e6
+    batch_s, _ = timed(lambda: forest.predict(batch), repeat=3)
+    results['batch_rows_per_s'] = len(batch) / batch_s
+    return results
+
+
+def bench_sklearn(rows, batch):
+    import joblib
+    import pandas as pd
+
+    results = {'import_s': import_time('import joblib, pandas, sklearn.ensemble')}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        results['load_s'], clf = timed(lambda: joblib.load(os.path.join(VIVEK_DIR, 'mental_health_rf_model.pkl')))
+    names = list(clf.feature_names_in_)
+
+    # Same per-request path as student_assessment.py and gui.py: a fresh one-row DataFrame
+    sample = rows[:200]
+    per_row, _ = timed(lambda: [clf.predict(pd.DataFrame([row], columns=names)) for row in sample])
+    results['row_latency_us'] = per_row / len(sample) * 1e6
+    batch_df = pd.DataFrame(batch, columns=names)
+    batch_s, _ = timed(lambda: clf.predict(batch_df), repeat=3)
+    results['batch_rows_per_s'] = len(batch) / batch_s
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000, help="rows scored one at a time")
+    parser.add_argument('--batch', type=int, default=10000, help="rows in the batch measurement")
+    args = parser.parse_args()
+
+    rows = random_rows(args.rows).tolist()
+    batch = random_rows(args.batch, seed=1)
+
+    report = {'compiled': bench_compiled(rows, batch)}
+    try:
+        report['sklearn'] = bench_sklearn(rows, batch)
+    except ImportError as e:
+        report['sklearn'] = {'skipped': str(e)}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Throughput of the rule table: per-request evaluation against whole-batch masks.
+
+    python bench_rules.py [--rows 200000]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from bench_forest import random_rows
+from rules import RuleSet
+
+
+def rows_per_second(fn, n_rows, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return n_rows / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    args = parser.parse_args()
+
+    rule_set = RuleSet()
+    # random_rows draws model-encoded rows; academic_performance only needs the same 0-2 range here
+    X = random_rows(args.rows).astype(np.int8)
+    rows = X.tolist()
+
+    report = {
+        'rows': args.rows,
+        'per_request_rows_per_s': rows_per_second(lambda: [rule_set.predict_one(row) for row in rows], len(rows)),
+        'batch_rows_per_s': rows_per_second(lambda: rule_set.predict(X), len(rows)),
+    }
+    report['speedup'] = report['batch_rows_per_s'] / report['per_request_rows_per_s']
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
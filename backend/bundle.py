@@ -0,0 +1,136 @@
+"""Single-file, versioned model bundle.
+
+Layout: an 8-byte magic, a little-endian uint64 header length, a JSON header
+and then the raw arrays, each aligned to 64 bytes. The header holds the
+schema version, the feature order, both encoders' class lists, the
+recommendation text, each array's dtype/shape/offset and a SHA-256 content
+hash over the header (without the hash) and all array bytes.
+
+Loading memory-maps the arrays straight from the file instead of
+unpickling anything, so workers forked after loading share the pages.
+"""
+import hashlib
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+MAGIC = b'MRBUNDLE'
+SCHEMA_VERSION = 1
+ALIGNMENT = 64
+_LENGTH = struct.Struct('<Q')
+
+
+class BundleError(ValueError):
+    """The file is not a valid model bundle, or fails its integrity check."""
+
+
+def _padding(offset):
+    return (-offset) % ALIGNMENT
+
+
+def _content_hash(meta, arrays):
+    digest = hashlib.sha256(json.dumps(meta, sort_keys=True).encode())
+    for name in sorted(arrays):
+        digest.update(np.ascontiguousarray(arrays[name]).data)
+    return digest.hexdigest()
+
+
+def write_bundle(path, arrays, meta):
+    """Write arrays (name -> ndarray) and JSON-serializable meta to path; returns the content hash."""
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    layout = {}
+    offset = 0
+    for name in sorted(arrays):
+        offset += _padding(offset)
+        layout[name] = {
+            'dtype': arrays[name].dtype.str,
+            'shape': list(arrays[name].shape),
+            'offset': offset,
+            'nbytes': arrays[name].nbytes,
+        }
+        offset += arrays[name].nbytes
+
+    # Round-trip through JSON so the hash matches what load_bundle() parses back
+    header = json.loads(json.dumps(dict(meta, schema_version=SCHEMA_VERSION, arrays=layout)))
+    header['content_hash'] = _content_hash(header, arrays)
+    header_bytes = json.dumps(header, sort_keys=True).encode()
+    data_start = len(MAGIC) + _LENGTH.size + len(header_bytes)
+    data_start += _padding(data_start)
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b'\0' * (data_start - f.tell()))
+        for name in sorted(arrays):
+            f.write(b'\0' * (data_start + layout[name]['offset'] - f.tell()))
+            f.write(arrays[name].data)
+    # Readers never see a half-written bundle
+    os.replace(tmp_path, path)
+    return header['content_hash']
+
+
+class Bundle:
+    """A loaded bundle: `meta` is the JSON header, `arrays` the memory-mapped arrays."""
+
+    def __init__(self, path, meta, arrays, load_seconds):
+        self.path = path
+        self.meta = meta
+        self.arrays = arrays
+        self.load_seconds = load_seconds
+
+    @property
+    def content_hash(self):
+        return self.meta['content_hash']
+
+    @property
+    def version(self):
+        return self.content_hash[:12]
+
+    @property
+    def feature_names(self):
+        return self.meta['feature_names']
+
+    @property
+    def academic_classes(self):
+        return self.meta['academic_classes']
+
+    @property
+    def condition_classes(self):
+        return self.meta['condition_classes']
+
+    @property
+    def recommendations(self):
+        return self.meta['recommendations']
+
+
+def load_bundle(path, verify=True):
+    """Memory-map a bundle. With verify, the content hash is recomputed and checked."""
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise BundleError(f'{path} is not a model bundle')
+        (header_length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+        meta = json.loads(f.read(header_length))
+    if meta.get('schema_version') != SCHEMA_VERSION:
+        raise BundleError(f"{path} has schema version {meta.get('schema_version')}, expected {SCHEMA_VERSION}")
+
+    data_start = len(MAGIC) + _LENGTH.size + header_length
+    data_start += _padding(data_start)
+    arrays = {}
+    for name, layout in meta['arrays'].items():
+        if layout['nbytes'] == 0:
+            arrays[name] = np.zeros(layout['shape'], dtype=layout['dtype'])
+            continue
+        arrays[name] = np.memmap(path, dtype=np.dtype(layout['dtype']), mode='r',
+                                 offset=data_start + layout['offset'], shape=tuple(layout['shape']))
+
+    if verify:
+        unhashed = {key: value for key, value in meta.items() if key != 'content_hash'}
+        if _content_hash(unhashed, arrays) != meta['content_hash']:
+            raise BundleError(f'{path} failed its integrity check')
+    return Bundle(path, meta, arrays, time.perf_counter() - start)
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# test_api.py is a manual smoke test against deployed URLs (run it with
+# `python test_api.py`), not a pytest module
+collect_ignore = ['test_api.py']
+
+# Keep predictions made by the tests out of the real event store
+os.environ.setdefault('EVENTS_DB', os.path.join(tempfile.mkdtemp(prefix='events-'), 'events.sqlite3'))
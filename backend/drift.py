@@ -0,0 +1,239 @@
+"""Input drift monitor: live /api/predict inputs against the training data.
+
+Each feature has fixed integer bins over its answer range, plus one bin
+for values below it and one above. Counts are kept in a ring of time
+buckets (DRIFT_BUCKET_SECONDS each, DRIFT_BUCKETS of them), so memory is
+constant however much traffic is served and old traffic ages out. Every
+thread records into its own ring, as metrics.py does, so an observation
+is a few array increments and takes no lock; the rings of finished
+threads are folded into a shared one.
+
+Drift is computed only when asked for: the buckets inside the requested
+window are summed and each feature's histogram is compared with the
+training histogram (model/drift_baseline.json) by the population
+stability index, PSI = sum((p - q) * ln(p / q)). Rule of thumb: below 0.1
+stable, 0.1-0.25 moderate shift, above 0.25 significant shift.
+
+Rebuild the baseline after retraining on new data with:
+
+    python drift.py ../vivek/boarding_school_mental_health_2500.csv
+"""
+import csv
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from batch import BOOL_COLUMNS, FEATURE_COLUMNS
+from prediction_table import MODEL_DIR
+
+BASELINE_PATH = os.path.join(MODEL_DIR, 'drift_baseline.json')
+ACADEMIC_OPTIONS = ['Poor', 'Average', 'Good']
+
+# Answer range per feature in the API encoding (academic_performance: 0 = Poor, 1 = Average, 2 = Good)
+FEATURE_RANGES = {
+    'sleep_hours': (2, 12),
+    'academic_performance': (0, 2),
+    'bullied': (0, 1),
+    'has_close_friends': (0, 1),
+    'homesick_level': (1, 5),
+    'mess_food_rating': (1, 5),
+    'sports_participation': (0, 1),
+    'social_activities': (0, 5),
+    'study_hours': (0, 10),
+    'screen_time': (1, 12),
+}
+# Probability floor for empty bins, so PSI stays finite
+EPSILON = 1e-4
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+
+class Bins:
+    """Flat bin layout: per feature, [below, lo, ..., hi, above]."""
+
+    def __init__(self, ranges=FEATURE_RANGES):
+        self.features = list(FEATURE_COLUMNS)
+        self.lows = np.array([ranges[name][0] for name in self.features])
+        self.widths = np.array([ranges[name][1] - ranges[name][0] + 1 for name in self.features])
+        sizes = self.widths + 2
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        self.size = int(sizes.sum())
+        self.labels = {
+            name: ['below'] + [str(v) for v in range(ranges[name][0], ranges[name][1] + 1)] + ['above']
+            for name in self.features
+        }
+
+    def index(self, X):
+        """Flat bin index of every value of an (n, 10) array of rows, or of one row.
+
+        Values are clamped before any arithmetic, so integers of any size
+        land in the below or above bin.
+        """
+        X = np.clip(np.asarray(X), self.lows - 1, self.lows + self.widths).astype(np.int64)
+        return X - self.lows + 1 + self.offsets
+
+    def split(self, counts):
+        return {name: counts[start:start + width + 2]
+                for name, start, width in zip(self.features, self.offsets, self.widths)}
+
+
+def build_baseline(csv_path, bins=None):
+    """Training histograms (bin counts per feature) from a training-format CSV."""
+    bins = bins or Bins()
+    with open(csv_path, newline='') as f:
+        rows = []
+        for record in csv.DictReader(f):
+            row = []
+            for name in FEATURE_COLUMNS:
+                value = record[name]
+                if name == 'academic_performance':
+                    row.append(ACADEMIC_OPTIONS.index(value))
+                elif name in BOOL_COLUMNS:
+                    row.append(1 if value == 'True' else 0)
+                else:
+                    row.append(int(value))
+            rows.append(row)
+    counts = np.bincount(bins.index(np.array(rows)).ravel(), minlength=bins.size)
+    return {
+        'source': os.path.basename(csv_path),
+        'rows': len(rows),
+        'ranges': FEATURE_RANGES,
+        'counts': {name: part.tolist() for name, part in bins.split(counts).items()},
+    }
+
+
+def merge_rings(base, ring):
+    """Slot by slot: counts for the same epoch add up, and the older epoch's counts are dropped."""
+    counts, epochs = base[0].copy(), base[1].copy()
+    ring_counts, ring_epochs = ring
+    same = ring_epochs == epochs
+    counts[same] += ring_counts[same]
+    newer = ring_epochs > epochs
+    counts[newer] = ring_counts[newer]
+    epochs[newer] = ring_epochs[newer]
+    return counts, epochs
+
+
+def psi(observed, expected):
+    p = np.maximum(observed / max(observed.sum(), 1), EPSILON)
+    q = np.maximum(expected / max(expected.sum(), 1), EPSILON)
+    return float(((p - q) * np.log(p / q)).sum())
+
+
+class DriftMonitor:
+    def __init__(self, baseline, bucket_seconds=60, buckets=60, clock=time.time):
+        self.bins = Bins()
+        self.baseline = {name: np.array(counts, dtype=float) for name, counts in baseline['counts'].items()}
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+        self.clock = clock
+        self._local = threading.local()
+        self._base = self._empty_ring()
+        self._rings = []
+        self._lock = threading.Lock()
+
+    def _empty_ring(self):
+        # counts[slot] holds the bins for epoch epochs[slot]
+        return np.zeros((self.buckets, self.bins.size), dtype=np.int64), np.full(self.buckets, -1, dtype=np.int64)
+
+    def _ring(self):
+        try:
+            return self._local.ring
+        except AttributeError:
+            ring = self._empty_ring()
+            with self._lock:
+                self._fold_finished()
+                self._rings.append((threading.current_thread(), ring))
+            self._local.ring = ring
+            return ring
+
+    def _fold_finished(self):
+        # As in metrics._Sharded: a finished thread's ring moves into a new base ring;
+        # the old base is replaced, not changed, since window_counts() may be reading it
+        live = []
+        for thread, ring in self._rings:
+            if thread.is_alive():
+                live.append((thread, ring))
+            else:
+                self._base = merge_rings(self._base, ring)
+        self._rings = live
+
+    def _slot(self):
+        counts, epochs = self._ring()
+        epoch = int(self.clock() // self.bucket_seconds)
+        slot = epoch % self.buckets
+        if epochs[slot] != epoch:
+            counts[slot] = 0
+            epochs[slot] = epoch
+        return counts[slot]
+
+    def observe(self, row):
+        """Count one request's answers (API encoding)."""
+        # One bin per feature, so the fancy-index increment never repeats an index
+        self._slot()[self.bins.index(row)] += 1
+
+    def observe_batch(self, X):
+        if len(X):
+            self._slot()[:] += np.bincount(self.bins.index(X).ravel(), minlength=self.bins.size)
+
+    def window_counts(self, seconds=None):
+        """Bin counts summed over the buckets that overlap the last `seconds` (default: all kept)."""
+        now_epoch = int(self.clock() // self.bucket_seconds)
+        span = self.buckets if seconds is None else max(1, min(self.buckets, -(-int(seconds) // self.bucket_seconds)))
+        total = np.zeros(self.bins.size, dtype=np.int64)
+        with self._lock:
+            self._fold_finished()
+            rings = [self._base] + [ring for _, ring in self._rings]
+        for counts, epochs in rings:
+            recent = (epochs > now_epoch - span) & (epochs <= now_epoch)
+            total += counts[recent].sum(axis=0)
+        return total, span * self.bucket_seconds
+
+    def report(self, seconds=None):
+        counts, window = self.window_counts(seconds)
+        histograms = self.bins.split(counts)
+        requests = int(histograms[self.bins.features[0]].sum())
+        features = {}
+        for name in self.bins.features:
+            score = psi(histograms[name], self.baseline[name]) if requests else None
+            features[name] = {
+                'psi': round(score, 6) if score is not None else None,
+                'bins': self.bins.labels[name],
+                'live': histograms[name].tolist(),
+                'training': self.baseline[name].astype(int).tolist(),
+            }
+        scores = [item['psi'] for item in features.values() if item['psi'] is not None]
+        worst = max(scores) if scores else None
+        if worst is None:
+            status = 'no_data'
+        elif worst > PSI_SIGNIFICANT:
+            status = 'significant'
+        elif worst > PSI_MODERATE:
+            status = 'moderate'
+        else:
+            status = 'stable'
+        return {'window_seconds': window, 'requests': requests, 'max_psi': worst, 'status': status,
+                'features': features}
+
+
+def load_monitor(path=BASELINE_PATH):
+    with open(path) as f:
+        baseline = json.load(f)
+    return DriftMonitor(baseline, bucket_seconds=int(os.environ.get('DRIFT_BUCKET_SECONDS', 60)),
+                        buckets=int(os.environ.get('DRIFT_BUCKETS', 60)))
+
+
+def write_baseline(csv_path, path=BASELINE_PATH):
+    with open(path, 'w') as f:
+        json.dump(build_baseline(csv_path), f, indent=1)
+        f.write('\n')
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    write_baseline(sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'vivek', 'boarding_school_mental_health_2500.csv'))
@@ -0,0 +1,257 @@
+"""Append-only store of anonymized prediction events, with running aggregates.
+
+Every prediction is recorded in a SQLite database in WAL mode. Nothing
+that identifies a student is kept: no IP, request id or exact time (the
+timestamp is truncated to the hour), and each answer is coarsened to a
+bucket such as sleep_hours '5-6' or study_hours '>=6'.
+
+Request handlers only put the event on a bounded queue and never wait on
+disk; when the queue is full the event is dropped and counted. A writer
+thread commits events in groups (whatever has queued, up to BATCH_SIZE,
+waiting at most EVENTS_FLUSH_MS for more) and in the same transaction adds
+them to hourly aggregate tables:
+
+    condition_counts(hour, condition, count)
+    feature_counts(hour, feature, level, condition, count)
+
+so /api/stats reads a few small aggregate rows instead of scanning the
+events table. All gunicorn workers write to the same file; SQLite
+serializes their commits and stats cover every worker.
+
+Environment:
+    EVENTS_DB           database path (default backend/events.sqlite3);
+                        empty disables recording
+    EVENTS_QUEUE_SIZE   events buffered before dropping (default 10000)
+    EVENTS_FLUSH_MS     longest wait to fill a group commit (default 200)
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from request_log import STUDENT_FIELDS, logger
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(HERE, 'events.sqlite3')
+HOUR = 3600
+# Events committed per transaction, at most
+BATCH_SIZE = 1024
+ACADEMIC_LEVELS = ('Poor', 'Average', 'Good')
+BOOL_FEATURES = ('bullied', 'has_close_friends', 'sports_participation')
+# Upper bounds of each bucket but the last, for the numeric answers
+BUCKET_EDGES = {
+    'sleep_hours': (4, 6, 8),
+    'homesick_level': (2, 3),
+    'mess_food_rating': (2, 3),
+    'social_activities': (1, 3),
+    'study_hours': (2, 5),
+    'screen_time': (3, 6),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    hour INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    model_version TEXT,
+    condition TEXT NOT NULL,
+    sleep_hours TEXT, academic_performance TEXT, bullied TEXT, has_close_friends TEXT,
+    homesick_level TEXT, mess_food_rating TEXT, sports_participation TEXT,
+    social_activities TEXT, study_hours TEXT, screen_time TEXT
+);
+CREATE TABLE IF NOT EXISTS condition_counts (
+    hour INTEGER NOT NULL,
+    condition TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (hour, condition)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS feature_counts (
+    hour INTEGER NOT NULL,
+    feature TEXT NOT NULL,
+    level TEXT NOT NULL,
+    condition TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (hour, feature, level, condition)
+) WITHOUT ROWID;
+"""
+INSERT_EVENT = (f"INSERT INTO events (hour, source, model_version, condition, {', '.join(STUDENT_FIELDS)}) "
+                f"VALUES ({', '.join('?' * (4 + len(STUDENT_FIELDS)))})")
+ADD_CONDITION = ("INSERT INTO condition_counts VALUES (?, ?, ?) "
+                 "ON CONFLICT (hour, condition) DO UPDATE SET count = count + excluded.count")
+ADD_FEATURE = ("INSERT INTO feature_counts VALUES (?, ?, ?, ?, ?) "
+               "ON CONFLICT (hour, feature, level, condition) DO UPDATE SET count = count + excluded.count")
+
+
+def bucket_label(value, edges):
+    low = None
+    for edge in edges:
+        if value <= edge:
+            break
+        low = edge
+    else:
+        return f'>={edges[-1] + 1}'
+    if low is None:
+        return f'<={edge}'
+    return str(edge) if edge == low + 1 else f'{low + 1}-{edge}'
+
+
+def anonymize(row):
+    """Bucket labels for one feature row in API encoding (academic performance 0 = Poor)."""
+    levels = []
+    for name, value in zip(STUDENT_FIELDS, row):
+        value = int(value)
+        if name == 'academic_performance':
+            levels.append(ACADEMIC_LEVELS[value] if 0 <= value < len(ACADEMIC_LEVELS) else 'other')
+        elif name in BOOL_FEATURES:
+            levels.append('yes' if value else 'no')
+        else:
+            levels.append(bucket_label(value, BUCKET_EDGES[name]))
+    return levels
+
+
+def connect(path):
+    db = sqlite3.connect(path, timeout=30, isolation_level=None)
+    db.execute('PRAGMA journal_mode=WAL')
+    # With WAL, NORMAL only risks the last commits on power loss, never corruption
+    db.execute('PRAGMA synchronous=NORMAL')
+    return db
+
+
+class EventStore:
+    """Queue-fed SQLite writer; like the log listener, started lazily in each process."""
+
+    def __init__(self, path, queue_size=10000, flush_interval=0.2, clock=time.time):
+        self.path = path
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.recorded = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        db = connect(path)
+        db.executescript(SCHEMA)
+        db.close()
+
+    def _ensure_writer(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # A queue inherited across fork may hold a lock taken by the parent's writer
+            self._queue = queue.Queue(self.queue_size)
+            threading.Thread(target=self._run, name='events', daemon=True).start()
+            self._pid = os.getpid()
+
+    def _put(self, item):
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += len(item[2])
+
+    def record(self, row, condition, model_version, source='api'):
+        """Queue one prediction; never blocks."""
+        self._put((int(self.clock()) // HOUR * HOUR, source, [(row, condition)], model_version))
+
+    def record_batch(self, X, conditions, model_version, source='batch'):
+        """Queue a scored chunk of rows as one item."""
+        self._put((int(self.clock()) // HOUR * HOUR, source, list(zip(X.tolist(), conditions)), model_version))
+
+    def _run(self):
+        db = connect(self.path)
+        items = self._queue
+        while True:
+            batch = [items.get()]
+            size = len(batch[0][2])
+            deadline = time.monotonic() + self.flush_interval
+            while size < BATCH_SIZE:
+                try:
+                    batch.append(items.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+                size += len(batch[-1][2])
+            self.write(db, batch)
+            for _ in batch:
+                items.task_done()
+
+    def write(self, db, batch):
+        """Append a group of queued items and fold them into the aggregates, in one transaction."""
+        events = []
+        conditions = Counter()
+        features = Counter()
+        for hour, source, predictions, model_version in batch:
+            for row, condition in predictions:
+                levels = anonymize(row)
+                events.append((hour, source, model_version, condition, *levels))
+                conditions[hour, condition] += 1
+                for name, level in zip(STUDENT_FIELDS, levels):
+                    features[hour, name, level, condition] += 1
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            db.executemany(INSERT_EVENT, events)
+            db.executemany(ADD_CONDITION, [key + (count,) for key, count in conditions.items()])
+            db.executemany(ADD_FEATURE, [key + (count,) for key, count in features.items()])
+            db.execute('COMMIT')
+        except sqlite3.Error:
+            if db.in_transaction:
+                db.execute('ROLLBACK')
+            logger.exception('Failed to record %d prediction events', len(events))
+            self.failed += len(events)
+            return
+        self.recorded += len(events)
+
+    def wait(self):
+        """Block until every queued event has been committed (for tests and benchmarks)."""
+        if self._queue is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def _reader(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = connect(self.path)
+        return db
+
+    def stats(self, hours=24, condition=None):
+        """Counts over the last `hours` whole hours (including the current one), from the aggregates."""
+        now = int(self.clock()) // HOUR * HOUR
+        since = now - (hours - 1) * HOUR
+        db = self._reader()
+        timeline = {}
+        totals = Counter()
+        for hour, name, count in db.execute(
+                'SELECT hour, condition, count FROM condition_counts WHERE hour >= ? ORDER BY hour', (since,)):
+            timeline.setdefault(hour, {})[name] = count
+            totals[name] += count
+        query = 'SELECT feature, level, SUM(count) FROM feature_counts WHERE hour >= ?'
+        args = [since]
+        if condition is not None:
+            query += ' AND condition = ?'
+            args.append(condition)
+        features = {name: {} for name in STUDENT_FIELDS}
+        for name, level, count in db.execute(query + ' GROUP BY feature, level', args):
+            features[name][level] = count
+        return {
+            'window_hours': hours,
+            'since': since,
+            'total': sum(totals.values()),
+            'conditions': dict(totals.most_common()),
+            'features': features,
+            'feature_condition': condition,
+            'timeline': [{'hour': hour, 'conditions': counts} for hour, counts in sorted(timeline.items())],
+        }
+
+
+def load_store():
+    """The store configured by EVENTS_DB, or None when recording is disabled."""
+    path = os.environ.get('EVENTS_DB', DEFAULT_PATH)
+    if not path:
+        return None
+    return EventStore(path, queue_size=int(os.environ.get('EVENTS_QUEUE_SIZE', 10000)),
+                      flush_interval=float(os.environ.get('EVENTS_FLUSH_MS', 200)) / 1000)
@@ -0,0 +1,171 @@
+import os
+
+import numpy as np
+
+from bundle import load_bundle
+from prediction_table import MODEL_DIR
+
+BUNDLE_NAME = 'mental_health_model.bundle'
+
+# Rows per block in batch evaluation; bounds the (n_trees, rows) work arrays
+BLOCK_SIZE = 4096
+
+
+class CompiledForest:
+    """Random forest evaluator over flat node arrays, using only NumPy.
+
+    The arrays come from a model bundle written by vivek/export_forest.py
+    (see bundle.py). Predictions are
+    bit-identical to RandomForestClassifier.predict_proba: inputs are
+    compared as float32 against float64 thresholds, and per-tree leaf
+    probabilities are summed in tree order before dividing by the number of
+    trees. Rows are model-encoded feature values in feature_names order.
+    """
+
+    def __init__(self, arrays, bundle=None):
+        self.bundle = bundle
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.value = arrays['value']
+        self.root = arrays['root']
+        self.max_depth = int(arrays['max_depth'])
+        self.feature_names = [str(name) for name in arrays['feature_names']]
+        self.academic_classes = [str(name) for name in arrays['academic_classes']]
+        self.condition_classes = [str(name) for name in arrays['condition_classes']]
+        self._condition_array = np.array(self.condition_classes, dtype=object)
+        self._leaf_contributions = None
+
+        self._feature_intp = self.feature.astype(np.intp)
+        self._root_intp = self.root.astype(np.intp)
+        self._children = np.stack([self.left, self.right], axis=1).ravel().astype(np.intp)
+
+        # Python lists make single-row traversal much cheaper than NumPy scalar indexing
+        self._feature_list = self.feature.tolist()
+        self._threshold_list = self.threshold.tolist()
+        self._left_list = self.left.tolist()
+        self._right_list = self.right.tolist()
+        self._value_list = self.value.tolist()
+        self._root_list = self.root.tolist()
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        arrays = dict(bundle.arrays, max_depth=bundle.meta['max_depth'], feature_names=bundle.feature_names,
+                      academic_classes=bundle.academic_classes, condition_classes=bundle.condition_classes)
+        return cls(arrays, bundle)
+
+    @classmethod
+    def load(cls, path=None, verify=True):
+        if path is None:
+            path = os.path.join(MODEL_DIR, BUNDLE_NAME)
+        return cls.from_bundle(load_bundle(path, verify))
+
+    @property
+    def n_trees(self):
+        return len(self.root)
+
+    def _leaves(self, X):
+        # (n_trees, n_rows) leaf indices for a block of float32 rows. All
+        # trees descend together: one gather per step over a flat
+        # (tree, row) node array, feature-major X and interleaved children.
+        n_rows = X.shape[0]
+        X_flat = X.T.ravel()
+        rows = np.tile(np.arange(n_rows), self.n_trees)
+        nodes = np.repeat(self._root_intp, n_rows)
+        for _ in range(self.max_depth):
+            go_right = ~(X_flat.take(self._feature_intp.take(nodes) * n_rows + rows) <= self.threshold.take(nodes))
+            nodes = self._children.take(2 * nodes + go_right)
+        return nodes.reshape(self.n_trees, n_rows)
+
+    def predict_proba(self, X):
+        """Class probabilities for an (n, n_features) array of rows."""
+        X = np.asarray(X, dtype=np.float32)
+        proba = np.zeros((X.shape[0], self.value.shape[1]), dtype=np.float64)
+        for start in range(0, X.shape[0], BLOCK_SIZE):
+            leaves = self._leaves(X[start:start + BLOCK_SIZE])
+            block = proba[start:start + BLOCK_SIZE]
+            for tree_leaves in leaves:
+                block += self.value.take(tree_leaves, axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        """Condition names for an (n, n_features) array of rows."""
+        return self._condition_array[self.predict_proba(X).argmax(axis=1)].tolist()
+
+    def predict_proba_one(self, row):
+        """Class probabilities for a single row, as a list."""
+        x = np.asarray(row, dtype=np.float32).tolist()
+        feature, threshold = self._feature_list, self._threshold_list
+        left, right, value = self._left_list, self._right_list, self._value_list
+
+        total = [0.0] * len(value[0])
+        for node in self._root_list:
+            while left[node] != node:
+                node = left[node] if x[feature[node]] <= threshold[node] else right[node]
+            leaf_value = value[node]
+            for k in range(len(total)):
+                total[k] += leaf_value[k]
+        n_trees = len(self._root_list)
+        return [p / n_trees for p in total]
+
+    def predict_one(self, row):
+        proba = self.predict_proba_one(row)
+        return self.condition_classes[proba.index(max(proba))]
+
+    def prepare_explanations(self):
+        """Precompute per-leaf feature contributions (Saabas' method); done once, on first use.
+
+        Every node stores the class probabilities of the training rows that
+        reach it. Descending from a node to a child changes them by
+        value[child] - value[node], which is credited to the feature the
+        node splits on. Summed along the path to a leaf this gives
+        value[leaf] = value[root] + contributions[leaf].sum(axis=0), so an
+        explanation needs only the leaves that prediction already finds.
+        """
+        if self._leaf_contributions is not None:
+            return
+        n_nodes, n_classes = self.value.shape
+        node_ids = np.arange(n_nodes)
+        internal = node_ids[self.left != node_ids]
+        parent = np.full(n_nodes, -1)
+        parent[self.left[internal]] = internal
+        parent[self.right[internal]] = internal
+
+        # Path contributions per node, filled top-down one depth level at a time
+        path = np.zeros((n_nodes, len(self.feature_names), n_classes))
+        level = self.root.astype(np.intp)
+        while True:
+            children = np.concatenate([self.left[level][self.left[level] != level],
+                                       self.right[level][self.right[level] != level]]).astype(np.intp)
+            if not len(children):
+                break
+            parents = parent[children]
+            path[children] = path[parents]
+            path[children, self._feature_intp[parents]] += self.value[children] - self.value[parents]
+            level = children
+
+        leaves = node_ids[self.left == node_ids]
+        self._leaf_index = np.full(n_nodes, -1, dtype=np.intp)
+        self._leaf_index[leaves] = np.arange(len(leaves))
+        self._leaf_contributions = path[leaves]
+        self._bias = self.value.take(self._root_intp, axis=0).mean(axis=0)
+
+    def explain(self, X):
+        """Probabilities, bias and contributions for an (n, n_features) array of rows.
+
+        Returns (proba (n, n_classes), bias (n_classes,), contributions
+        (n, n_features, n_classes)), with proba == bias + contributions.sum(axis=1)
+        up to rounding.
+        """
+        self.prepare_explanations()
+        X = np.asarray(X, dtype=np.float32)
+        contributions = np.zeros((X.shape[0], len(self.feature_names), self.value.shape[1]))
+        for start in range(0, X.shape[0], BLOCK_SIZE):
+            leaves = self._leaves(X[start:start + BLOCK_SIZE])
+            block = contributions[start:start + BLOCK_SIZE]
+            for tree_leaves in leaves:
+                block += self._leaf_contributions.take(self._leaf_index.take(tree_leaves), axis=0)
+        contributions /= self.n_trees
+        return self.predict_proba(X), self._bias, contributions
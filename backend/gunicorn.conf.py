@@ -0,0 +1,11 @@
+"""gunicorn settings, read from the working directory (backend/).
+
+Threaded workers sized from admission control: more threads than the
+largest in-flight limit plus its queue, so requests beyond them reach the
+limiter and get a quick 503 instead of waiting in gunicorn's queue (see
+admission.py).
+"""
+from admission import worker_threads
+
+worker_class = 'gthread'
+threads = worker_threads()
@@ -0,0 +1,129 @@
+import hashlib
+import os
+import time
+
+import numpy as np
+
+from forest import CompiledForest
+from prediction_table import MODEL_DIR, PredictionTable
+from rules import RULES, RuleSet
+
+BACKENDS = ('rules', 'table', 'model')
+
+# Rows used to warm an engine up before it takes traffic (API encoding)
+WARM_UP_ROWS = [
+    [7, 1, 0, 1, 2, 3, 1, 5, 4, 3],
+    [4, 0, 1, 0, 5, 1, 0, 1, 8, 10],
+    [10, 2, 0, 1, 1, 5, 1, 3, 2, 2],
+]
+
+
+class RuleEngine:
+    """The hand-written rule table (see rules.py)."""
+
+    name = 'rules'
+
+    def __init__(self, rule_set=None):
+        self.rule_set = rule_set or RuleSet()
+
+    def check_row(self, row):
+        pass
+
+    def predict(self, row):
+        return self.rule_set.predict_one(row)
+
+    def predict_batch(self, X):
+        return self.rule_set.predict(X)
+
+    def warm_up(self):
+        self.predict_batch(np.array(WARM_UP_ROWS))
+
+
+class ModelEngine:
+    """The trained random forest, served through a PredictionTable or CompiledForest.
+
+    Rows arrive in the API encoding, where academic_performance indexes
+    academic_options; the model uses the label encoder's (alphabetical)
+    codes, so that column is remapped before scoring.
+    """
+
+    def __init__(self, name, model, academic_options):
+        self.name = name
+        self.model = model
+        self.academic_codes = [model.academic_classes.index(option) for option in academic_options]
+        self._academic_code_array = np.array(self.academic_codes)
+
+    def check_row(self, row):
+        """Raise ValueError for a row predict_batch() could not score."""
+        if not 0 <= row[1] < len(self.academic_codes):
+            raise ValueError(f'Invalid academic_performance: {row[1]}')
+
+    def predict(self, row):
+        self.check_row(row)
+        row = list(row)
+        row[1] = self.academic_codes[row[1]]
+        return self.model.predict_one(row)
+
+    def predict_batch(self, X):
+        X = X.copy()
+        X[:, 1] = self._academic_code_array.take(X[:, 1])
+        return self.model.predict(X)
+
+    def explain_batch(self, X):
+        """CompiledForest.explain() for rows in the API encoding ('model' backend only)."""
+        X = X.copy()
+        X[:, 1] = self._academic_code_array.take(X[:, 1])
+        return self.model.explain(X)
+
+    def warm_up(self):
+        if isinstance(self.model, CompiledForest):
+            self.model.prepare_explanations()
+        if isinstance(self.model, PredictionTable):
+            # Fault the whole memory-mapped table into the page cache, which
+            # forked workers then share
+            int(np.asarray(self.model.codes).sum())
+        for row in WARM_UP_ROWS:
+            self.predict(row)
+        self.predict_batch(np.array(WARM_UP_ROWS * 32))
+
+
+def content_version(*parts):
+    """Short content hash identifying a model version; parts are file paths or bytes."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            digest.update(part)
+        else:
+            with open(part, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def load_engine(backend, academic_options, bundle_path=None):
+    """Load and warm up an inference engine; returns it with load and warm-up times in seconds.
+
+    The engine's `version` is a content hash of its rules or artifacts, so
+    it changes whenever predictions could. `bundle` is the loaded model
+    bundle for the 'model' backend and None otherwise; bundle_path picks
+    a bundle other than the shipped one.
+    """
+    start = time.perf_counter()
+    bundle = None
+    if backend == 'rules':
+        engine = RuleEngine()
+        engine.version = 'rules-' + content_version(repr(RULES).encode())
+    elif backend == 'table':
+        engine = ModelEngine('table', PredictionTable(), academic_options)
+        engine.version = 'table-' + content_version(os.path.join(MODEL_DIR, 'prediction_table.json'),
+                                                     os.path.join(MODEL_DIR, 'prediction_table.npy'))
+    elif backend == 'model':
+        engine = ModelEngine('model', CompiledForest.load(bundle_path), academic_options)
+        bundle = engine.model.bundle
+        engine.version = 'model-' + bundle.version
+    else:
+        raise ValueError(f"Unknown inference backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+    engine.bundle = bundle
+    loaded = time.perf_counter()
+    engine.warm_up()
+    return engine, loaded - start, time.perf_counter() - loaded
@@ -0,0 +1,250 @@
+"""Offline load test and latency benchmark for the prediction API.
+
+Payloads are resampled from boarding_school_mental_health_2500.csv, so the
+mix of answers matches the training data. Targets:
+
+    flask     the Flask app in-process, through its test client
+    gunicorn  a local `gunicorn wsgi:app --preload` (threaded workers, as
+              configured by gunicorn.conf.py)
+    asgi      a local gunicorn with uvicorn workers serving asgi.py
+
+For each target and concurrency level the report gives requests per second
+and p50/p95/p99 latency as JSON. With --baseline, results are compared to
+a stored report and the exit code is 1 if throughput drops or p95 latency
+rises by more than --tolerance:
+
+    python loadtest.py --target flask gunicorn --concurrency 1 8 32 --output report.json
+    python loadtest.py --target gunicorn --baseline loadtest_baseline.json --save-baseline
+    python loadtest.py --target gunicorn --baseline loadtest_baseline.json
+"""
+import argparse
+import csv
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATASET = os.path.join(HERE, '..', 'vivek', 'boarding_school_mental_health_2500.csv')
+ACADEMIC_OPTIONS = ['Poor', 'Average', 'Good']
+BOOL_COLUMNS = ('bullied', 'has_close_friends', 'sports_participation')
+
+
+def load_payloads(n, seed=0, path=DATASET):
+    """n /api/predict payloads resampled (with replacement) from the training CSV."""
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    rng = random.Random(seed)
+    payloads = []
+    for row in rng.choices(rows, k=n):
+        payload = {}
+        for column, value in row.items():
+            if column == 'mental_health_condition':
+                continue
+            if column == 'academic_performance':
+                payload[column] = ACADEMIC_OPTIONS.index(value)
+            elif column in BOOL_COLUMNS:
+                payload[column] = 1 if value == 'True' else 0
+            else:
+                payload[column] = int(value)
+        payloads.append(payload)
+    return payloads
+
+
+def summarize(latencies, errors, elapsed):
+    ms = np.array(latencies) * 1000
+    result = {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+    }
+    if len(ms):
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        result.update(mean_ms=round(ms.mean(), 3), p50_ms=round(p50, 3), p95_ms=round(p95, 3),
+                      p99_ms=round(p99, 3), max_ms=round(ms.max(), 3))
+    return result
+
+
+def run_load(make_client, payloads, concurrency):
+    """Send every payload once, split across `concurrency` threads each with its own client."""
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    bodies = [json.dumps(payload) for payload in payloads]
+
+    def worker(i):
+        post = make_client()
+        for body in bodies[i::concurrency]:
+            start = time.perf_counter()
+            ok = post(body)
+            latencies[i].append(time.perf_counter() - start)
+            if not ok:
+                errors[i] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return summarize([x for worker_latencies in latencies for x in worker_latencies], sum(errors), elapsed)
+
+
+def flask_client_factory():
+    from app import app
+
+    def make_client():
+        client = app.test_client()
+
+        def post(body):
+            return client.post('/api/predict', data=body, content_type='application/json').status_code == 200
+        return post
+    return make_client
+
+
+def http_client_factory(port):
+    def make_client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        headers = {'Content-Type': 'application/json'}
+
+        def post(body):
+            try:
+                conn.request('POST', '/api/predict', body, headers)
+                response = conn.getresponse()
+                response.read()
+                return response.status == 200
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                return False
+        return post
+    return make_client
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(target, workers, port, env):
+    command = [sys.executable, '-m', 'gunicorn', '--preload', '--workers', str(workers),
+               '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    if target == 'asgi':
+        command += ['-k', 'uvicorn.workers.UvicornWorker', 'asgi:app']
+    else:
+        command += ['wsgi:app']
+    server = subprocess.Popen(command, cwd=HERE, env=env)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'{target} server exited with code {server.returncode}')
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/ready')
+            if conn.getresponse().status == 200:
+                return server
+        except OSError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f'{target} server did not become ready')
+
+
+def run_target(target, payloads, concurrency_levels, workers, warmup):
+    results = {}
+    if target == 'flask':
+        make_client = flask_client_factory()
+        run_load(make_client, payloads[:warmup], 1)
+        for concurrency in concurrency_levels:
+            results[str(concurrency)] = run_load(make_client, payloads, concurrency)
+        return results
+
+    port = free_port()
+    server = start_server(target, workers, port, dict(os.environ))
+    try:
+        make_client = http_client_factory(port)
+        run_load(make_client, payloads[:warmup], 1)
+        for concurrency in concurrency_levels:
+            results[str(concurrency)] = run_load(make_client, payloads, concurrency)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return results
+
+
+def compare(report, baseline, tolerance):
+    """Regressions of report against baseline, as human-readable strings."""
+    regressions = []
+    for target, levels in report['results'].items():
+        for concurrency, result in levels.items():
+            base = baseline.get('results', {}).get(target, {}).get(concurrency)
+            if not base:
+                continue
+            if result['rps'] < base['rps'] * (1 - tolerance):
+                regressions.append(f"{target} c={concurrency}: {result['rps']} rps < baseline {base['rps']}")
+            if 'p95_ms' in base and result.get('p95_ms', float('inf')) > base['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{target} c={concurrency}: p95 {result.get('p95_ms')} ms > baseline {base['p95_ms']} ms")
+            if result['errors'] > base['errors']:
+                regressions.append(f"{target} c={concurrency}: {result['errors']} errors > baseline {base['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', nargs='+', choices=['flask', 'gunicorn', 'asgi'], default=['flask'])
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=2000, help="requests per concurrency level")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn workers for spawned servers")
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', help="INFERENCE_BACKEND for the app under test")
+    parser.add_argument('--output', help="write the JSON report here as well as to stdout")
+    parser.add_argument('--baseline', help="stored report to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="write this run to --baseline instead of comparing")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed relative regression (default 0.2)")
+    args = parser.parse_args()
+    if args.save_baseline and not args.baseline:
+        parser.error('--save-baseline needs --baseline to name the file to write')
+
+    if args.backend:
+        os.environ['INFERENCE_BACKEND'] = args.backend
+    sys.path.insert(0, HERE)
+
+    payloads = load_payloads(args.requests, seed=args.seed)
+    report = {
+        'backend': os.environ.get('INFERENCE_BACKEND', 'rules'),
+        'requests': args.requests,
+        'workers': args.workers,
+        'cpu_count': os.cpu_count(),
+        'results': {target: run_target(target, payloads, args.concurrency, args.workers, args.warmup)
+                    for target in args.target},
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            f.write(text + '\n')
+    elif args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
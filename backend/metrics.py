@@ -0,0 +1,247 @@
+"""Low-overhead Prometheus instruments.
+
+Every thread records into its own shard (a plain list or dict reached
+through threading.local), so observe() and inc() take no lock; shards are
+only summed when /metrics is scraped. When a thread has exited, its shard
+is folded into a base total, so servers that start a thread per request
+keep as many shards as they have live threads. Values are per process: under
+gunicorn each worker keeps its own, and a scrape reports the worker that
+answered it (the `pid` label on process gauges tells them apart).
+"""
+import bisect
+import os
+import threading
+
+# Latency buckets in seconds, from 10 us to 1 s
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+
+class _Sharded:
+    def __init__(self, make_shard, merge):
+        self._make_shard = make_shard
+        # merge(base, shard) returns a new base; the old one may still be being read
+        self._merge = merge
+        self._base = make_shard()
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._make_shard()
+            with self._lock:
+                self._fold_finished()
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+            return shard
+
+    def _fold_finished(self):
+        # A finished thread never writes its shard again, so its counts can move to the base
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._base = self._merge(self._base, shard)
+        self._shards = live
+
+    def shards(self):
+        with self._lock:
+            self._fold_finished()
+            return [self._base] + [shard for _, shard in self._shards]
+
+
+def _merge_dicts(base, shard):
+    merged = dict(base)
+    for key, value in list(shard.items()):
+        merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _merge_lists(base, shard):
+    return [a + b for a, b in zip(base, shard)]
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = _Sharded(dict, _merge_dicts)
+
+    def inc(self, *labelvalues, amount=1):
+        shard = self._values.shard()
+        shard[labelvalues] = shard.get(labelvalues, 0) + amount
+
+    def collect(self):
+        totals = {}
+        for shard in self._values.shards():
+            for labelvalues, value in list(shard.items()):
+                totals[labelvalues] = totals.get(labelvalues, 0) + value
+        return totals
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for labelvalues, value in sorted(self.collect().items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """Histogram with fixed buckets; labels(...) returns the child for one label set."""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labelvalues):
+        child = self._children.get(labelvalues)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labelvalues, _HistogramChild(self.buckets))
+        return child
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            children = sorted(self._children.items())
+        for labelvalues, child in children:
+            counts, total = child.collect()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, labelvalues, [('le', _format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # Shard layout: one count per bucket plus +Inf, then the running sum
+        self._shards = _Sharded(lambda: [0] * (len(buckets) + 1) + [0.0], _merge_lists)
+
+    def observe(self, value):
+        shard = self._shards.shard()
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def collect(self):
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for shard in self._shards.shards():
+            for i in range(len(counts)):
+                counts[i] += shard[i]
+            total += shard[-1]
+        return counts, total
+
+
+class Gauge:
+    """A value computed at scrape time by a callable, or set directly."""
+
+    def __init__(self, name, documentation, function=None):
+        self.name = name
+        self.documentation = documentation
+        self.function = function
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def render(self):
+        value = self.function() if self.function is not None else self.value
+        if value is None:
+            return []
+        labels = _format_labels(('pid',), (os.getpid(),))
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge',
+                f'{self.name}{labels} {_format_value(value)}']
+
+
+class CounterFunction:
+    """A monotonically increasing count read at scrape time from a callable, exported as a counter."""
+
+    def __init__(self, name, documentation, function):
+        self.name = name
+        self.documentation = documentation
+        self.function = function
+
+    def render(self):
+        value = self.function()
+        if value is None:
+            return []
+        labels = _format_labels(('pid',), (os.getpid(),))
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter',
+                f'{self.name}{labels} {_format_value(value)}']
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def resident_memory_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+registry = Registry()
+
+STAGE_SECONDS = registry.register(Histogram(
+    'prediction_stage_seconds', 'Time spent in each stage of a /api/predict request.', ['stage']))
+PREDICTIONS = registry.register(Counter(
+    'predictions_total', 'Predictions served, by predicted condition.', ['condition']))
+PREDICTION_ERRORS = registry.register(Counter(
+    'prediction_errors_total', 'Failed /api/predict requests, by error type.', ['type']))
+REQUESTS_SHED = registry.register(Counter(
+    'requests_shed_total', '/api/predict requests rejected by admission control, by reason.', ['reason']))
+MODEL_LOAD_SECONDS = registry.register(Gauge(
+    'model_load_seconds', 'Time taken to load the inference backend.'))
+MODEL_WARM_UP_SECONDS = registry.register(Gauge(
+    'model_warm_up_seconds', 'Time taken to warm up the inference backend.'))
+RESIDENT_MEMORY = registry.register(Gauge(
+    'process_resident_memory_bytes', 'Resident set size of this process.', resident_memory_bytes))
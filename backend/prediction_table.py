@@ -0,0 +1,65 @@
+import json
+import os
+
+import numpy as np
+
+MODEL_DIR = os.environ.get('MODEL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model'))
+
+
+class PredictionTable:
+    """Random forest predictions precomputed over the whole input domain.
+
+    The table is built by vivek/build_prediction_table.py and indexed in
+    mixed radix, one axis per feature in the model's feature order. It is
+    memory-mapped, so every gunicorn worker shares the same page cache.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR):
+        with open(os.path.join(model_dir, 'prediction_table.json')) as f:
+            meta = json.load(f)
+
+        self.feature_names = [feat['name'] for feat in meta['features']]
+        self.academic_classes = meta['academic_classes']
+        self.condition_classes = meta['condition_classes']
+        self.mins = [feat['min'] for feat in meta['features']]
+        self.maxs = [feat['max'] for feat in meta['features']]
+
+        self.codes = np.load(os.path.join(model_dir, 'prediction_table.npy'), mmap_mode='r')
+        self._flat_codes = self.codes.reshape(-1)
+        self.strides = [stride // self.codes.itemsize for stride in self.codes.strides]
+        self._min_array = np.array(self.mins)
+        self._max_array = np.array(self.maxs)
+        self._stride_array = np.array(self.strides, dtype=np.int64)
+        self._condition_array = np.array(self.condition_classes, dtype=object)
+
+        self.proba = None
+        self.proba_scale = meta.get('proba_scale')
+        proba_path = os.path.join(model_dir, 'prediction_proba.npy')
+        if self.proba_scale and os.path.exists(proba_path):
+            self.proba = np.load(proba_path, mmap_mode='r')
+
+    def index(self, row):
+        """Flat table index for one row of model-encoded feature values.
+
+        Values outside the table range are clamped to it. Every split
+        threshold in the forest lies inside the training range, which the
+        table covers, so clamping does not change the prediction.
+        """
+        idx = 0
+        for value, lo, hi, stride in zip(row, self.mins, self.maxs, self.strides):
+            idx += (min(max(int(value), lo), hi) - lo) * stride
+        return idx
+
+    def predict_one(self, row):
+        return self.condition_classes[self._flat_codes[self.index(row)]]
+
+    def predict(self, X):
+        """Conditions for an (n, n_features) array of model-encoded rows."""
+        offsets = np.clip(X, self._min_array, self._max_array) - self._min_array
+        return self._condition_array[self._flat_codes[offsets @ self._stride_array]].tolist()
+
+    def predict_proba(self, row):
+        if self.proba is None:
+            return None
+        flat = np.unravel_index(self.index(row), self.codes.shape)
+        return (self.proba[flat] / self.proba_scale).tolist()
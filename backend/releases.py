@@ -0,0 +1,226 @@
+"""Model releases and hot reload.
+
+A release directory holds published bundles, named by content hash, plus
+two small text files: CURRENT names the active bundle and HISTORY lists
+every bundle made current, oldest first. Both are replaced atomically, so
+a reader sees either the old release or the new one.
+
+Publishing validates a bundle (integrity hash, encoder compatibility and a
+warm-up prediction) before it can become current. Each API worker runs a
+ModelWatcher thread that polls CURRENT, loads and warms up a new release
+off the request path, and only then swaps it in; a request keeps the
+engine it started with, so none is dropped or half-served. At startup a
+worker that cannot load CURRENT falls back to earlier releases, newest
+first, and then to the shipped bundle (load_release).
+
+Releases are bundles, so only the 'model' inference backend serves them;
+'rules' and 'table' ignore the release directory.
+
+    python releases.py publish model/mental_health_model.bundle
+    python releases.py rollback
+    python releases.py status
+
+Environment:
+    MODEL_RELEASES_DIR      release directory (default model/releases)
+    MODEL_RELOAD_INTERVAL   seconds between polls of CURRENT (default 5;
+                            0 disables hot reload)
+"""
+import argparse
+import os
+import shutil
+import sys
+import threading
+import time
+
+from bundle import load_bundle
+from prediction_table import MODEL_DIR
+from request_log import logger
+
+RELEASES_DIR = os.environ.get('MODEL_RELEASES_DIR', os.path.join(MODEL_DIR, 'releases'))
+RELOAD_INTERVAL = float(os.environ.get('MODEL_RELOAD_INTERVAL', 5))
+
+CURRENT = 'CURRENT'
+HISTORY = 'HISTORY'
+
+
+class ReleaseError(Exception):
+    """A publish or rollback that cannot be carried out."""
+
+
+def _write_atomic(path, text):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class ReleaseStore:
+    def __init__(self, root=RELEASES_DIR):
+        self.root = root
+
+    def _read(self, name):
+        try:
+            with open(os.path.join(self.root, name)) as f:
+                return f.read()
+        except FileNotFoundError:
+            return ''
+
+    def current(self):
+        """Path of the active bundle, or None before the first publish."""
+        name = self._read(CURRENT).strip()
+        return os.path.join(self.root, name) if name else None
+
+    def history(self):
+        return self._read(HISTORY).split()
+
+    def _make_current(self, name, history):
+        _write_atomic(os.path.join(self.root, HISTORY), ''.join(f'{entry}\n' for entry in history))
+        _write_atomic(os.path.join(self.root, CURRENT), name + '\n')
+
+    def publish(self, bundle_path, validate):
+        """Validate a bundle, copy it into the store and make it current; returns its release name.
+
+        `validate(path)` must raise if the bundle cannot be served.
+        """
+        validate(bundle_path)
+        name = load_bundle(bundle_path, verify=False).version + '.bundle'
+        os.makedirs(self.root, exist_ok=True)
+        target = os.path.join(self.root, name)
+        if not os.path.exists(target):
+            shutil.copyfile(bundle_path, f'{target}.tmp')
+            os.replace(f'{target}.tmp', target)
+        history = self.history()
+        if not history or history[-1] != name:
+            history.append(name)
+        self._make_current(name, history)
+        return name
+
+    def rollback(self):
+        """Make the previously current release current again; returns its name."""
+        history = self.history()
+        if len(history) < 2:
+            raise ReleaseError('No previous release to roll back to')
+        history.pop()
+        self._make_current(history[-1], history)
+        return history[-1]
+
+
+def load_release(store, load):
+    """Load the newest release that works; returns (result, path).
+
+    Tries CURRENT, then earlier HISTORY entries newest first, then
+    load(None), the shipped bundle (path None). Only the last failure is
+    raised.
+    """
+    candidates = []
+    current = store.current()
+    if current is not None:
+        candidates.append(current)
+    for name in reversed(store.history()):
+        path = os.path.join(store.root, name)
+        if path not in candidates:
+            candidates.append(path)
+    for path in candidates:
+        try:
+            return load(path), path
+        except Exception:
+            logger.exception('Failed to load model release %s; trying an earlier one', path)
+    return load(None), None
+
+
+class ModelWatcher:
+    """Per-process thread that hot-swaps the engine when the current release changes.
+
+    `load(path)` builds and warms up an engine for a bundle and `swap(result)`
+    installs what it returned. Threads do not survive fork, so start() is
+    called lazily from request handling and starts one thread per process
+    (each gunicorn worker).
+    """
+
+    def __init__(self, store, load, swap, interval=RELOAD_INTERVAL, active_path=None):
+        self.store = store
+        self.load = load
+        self.swap = swap
+        self.interval = interval
+        self.active_path = active_path
+        self.failed_path = None
+        self.reloads = 0
+        self.failures = 0
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._pid == os.getpid() or self.interval <= 0:
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._stop = threading.Event()
+            threading.Thread(target=self._run, name='model-watcher', daemon=True).start()
+            self._pid = os.getpid()
+
+    def stop(self):
+        self._stop.set()
+        self._pid = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """Load and swap in the current release if it changed; returns True if a swap happened."""
+        path = self.store.current()
+        if path is None or path in (self.active_path, self.failed_path):
+            return False
+        try:
+            result = self.load(path)
+        except Exception:
+            # Keep serving the active model; retry only once CURRENT changes again
+            logger.exception('Failed to load model release %s', path)
+            self.failed_path = path
+            self.failures += 1
+            return False
+        self.swap(result)
+        self.active_path = path
+        self.failed_path = None
+        self.reloads += 1
+        return True
+
+
+def validate_bundle(path):
+    """Raise unless the bundle at path passes its integrity check and can serve predictions."""
+    from inference import load_engine
+    # The API's academic_options (app.py); the bundle's encoder must cover them
+    load_engine('model', ['Poor', 'Average', 'Good'], bundle_path=path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish, roll back or inspect model releases.")
+    parser.add_argument('--dir', default=RELEASES_DIR, help="release directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+    publish = commands.add_parser('publish', help="validate a bundle and make it the current release")
+    publish.add_argument('bundle')
+    commands.add_parser('rollback', help="switch back to the previous release")
+    commands.add_parser('status', help="show the current release and history")
+    args = parser.parse_args()
+
+    store = ReleaseStore(args.dir)
+    try:
+        if args.command == 'publish':
+            start = time.perf_counter()
+            name = store.publish(args.bundle, validate_bundle)
+            print(f"Published {name} (validated in {time.perf_counter() - start:.2f}s)")
+        elif args.command == 'rollback':
+            print(f"Rolled back to {store.rollback()}")
+        else:
+            print(f"current: {store.current()}")
+            for name in store.history():
+                print(f"  {name}")
+    except Exception as e:
+        print(f"{args.command} failed: {type(e).__name__}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Structured, non-blocking logging for the API.
+
+Request handlers only create a record and put it on a bounded queue; a
+background listener thread formats records as JSON lines and writes them
+out. When the queue is full, records are dropped and counted instead of
+blocking the request.
+
+Environment:
+    LOG_LEVEL           level for the 'mind_recommend' loggers (default INFO)
+    LOG_SAMPLE_RATE     fraction of per-request records kept (default 1.0);
+                        errors are never sampled out
+    LOG_QUEUE_SIZE      records buffered before dropping (default 10000)
+    LOG_REDACT_FIELDS   comma-separated fields replaced by "[redacted]",
+                        default the ten student answers; empty for none
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+
+STUDENT_FIELDS = (
+    'sleep_hours', 'academic_performance', 'bullied', 'has_close_friends',
+    'homesick_level', 'mess_food_rating', 'sports_participation',
+    'social_activities', 'study_hours', 'screen_time'
+)
+REDACTED = '[redacted]'
+
+logger = logging.getLogger('mind_recommend')
+request_logger = logging.getLogger('mind_recommend.requests')
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the record's `fields` extra merged in and redacted."""
+
+    def __init__(self, redact_fields=STUDENT_FIELDS):
+        super().__init__()
+        self.redact_fields = frozenset(redact_fields)
+
+    def redact(self, value):
+        if isinstance(value, dict):
+            return {key: REDACTED if key in self.redact_fields else self.redact(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.redact(item) for item in value]
+        return value
+
+    def format(self, record):
+        payload = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            payload.update(self.redact(fields))
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: records are dropped when the queue is full.
+
+    Records are passed to the listener unformatted, so the request thread
+    pays only for the enqueue. Threads do not survive fork, so the listener
+    is started lazily in whichever process first logs (each gunicorn worker).
+    """
+
+    def __init__(self, handlers, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.maxsize = maxsize
+        self.targets = handlers
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # A queue inherited across fork may hold a lock taken by the parent's listener
+            self.queue = queue.Queue(self.maxsize)
+            self._listener = logging.handlers.QueueListener(self.queue, *self.targets, respect_handler_level=True)
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Stop the listener after it has written every queued record."""
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+                self._pid = None
+
+
+_handler = None
+_sample_rate = 1.0
+
+
+def configure_logging(stream=None):
+    """Attach the queue-backed JSON handler to the 'mind_recommend' loggers (once)."""
+    global _handler, _sample_rate
+    if _handler is not None:
+        return _handler
+
+    _sample_rate = float(os.environ.get('LOG_SAMPLE_RATE', 1.0))
+    redact = os.environ.get('LOG_REDACT_FIELDS')
+    redact_fields = STUDENT_FIELDS if redact is None else [f.strip() for f in redact.split(',') if f.strip()]
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter(redact_fields))
+    _handler = DroppingQueueHandler([output], maxsize=int(os.environ.get('LOG_QUEUE_SIZE', 10000)))
+
+    logger.addHandler(_handler)
+    logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+    atexit.register(_handler.flush)
+    return _handler
+
+
+def log_request(message, **fields):
+    """Log one sampled per-request record; costs a random() call when sampled out."""
+    if _sample_rate < 1.0 and random.random() >= _sample_rate:
+        return
+    request_logger.info(message, extra={'fields': fields})
+
+
+def dropped_records():
+    return _handler.dropped if _handler is not None else 0
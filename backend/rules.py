@@ -0,0 +1,126 @@
+import operator
+
+import numpy as np
+
+from batch import FEATURE_COLUMNS
+
+OPS = {
+    '<=': operator.le,
+    '>=': operator.ge,
+    '==': operator.eq,
+}
+
+# Rule-based prediction (similar to the original logic in hello.ipynb), a
+# simplified version of the model. Rules are checked in order and the first
+# match wins. Each rule is a condition and a list of clauses; a clause
+# matches when all of its (feature, op, value) terms hold, and a rule matches
+# when any of its clauses does.
+# academic_performance: 0 = Poor, 1 = Average, 2 = Good
+RULES = [
+    ('Depression', [
+        [('sleep_hours', '<=', 5), ('screen_time', '>=', 7)],
+        [('bullied', '==', 1), ('has_close_friends', '==', 0)],
+        [('academic_performance', '==', 0), ('social_activities', '<=', 2)],
+    ]),
+    ('Anxiety', [
+        [('homesick_level', '>=', 4), ('bullied', '==', 1)],
+        [('academic_performance', '==', 0), ('sleep_hours', '<=', 6)],
+        [('screen_time', '>=', 8), ('social_activities', '<=', 2)],
+    ]),
+    ('Stress', [
+        [('study_hours', '>=', 7)],
+        [('sleep_hours', '<=', 5), ('academic_performance', '==', 0)],
+        [('homesick_level', '>=', 4), ('study_hours', '>=', 6)],
+    ]),
+    ('ADHD', [
+        [('study_hours', '<=', 2), ('screen_time', '>=', 8), ('academic_performance', '==', 0)],
+        [('social_activities', '>=', 4), ('academic_performance', '==', 0)],
+    ]),
+    ('PTSD', [
+        [('bullied', '==', 1), ('sleep_hours', '<=', 5), ('homesick_level', '>=', 4)],
+    ]),
+    ('OCD', [
+        [('study_hours', '>=', 7), ('social_activities', '<=', 1)],
+        [('academic_performance', '==', 2), ('mess_food_rating', '<=', 2), ('study_hours', '>=', 6)],
+    ]),
+    # (sleep <= 4 or sleep >= 9) and (social >= 4 or sports) and screen >= 8
+    ('Bipolar Disorder', [
+        [('sleep_hours', '<=', 4), ('social_activities', '>=', 4), ('screen_time', '>=', 8)],
+        [('sleep_hours', '<=', 4), ('sports_participation', '==', 1), ('screen_time', '>=', 8)],
+        [('sleep_hours', '>=', 9), ('social_activities', '>=', 4), ('screen_time', '>=', 8)],
+        [('sleep_hours', '>=', 9), ('sports_participation', '==', 1), ('screen_time', '>=', 8)],
+    ]),
+    ('Eating Disorder', [
+        [('mess_food_rating', '<=', 2), ('sleep_hours', '<=', 5), ('homesick_level', '>=', 4)],
+    ]),
+    ('Adjustment Disorder', [
+        [('homesick_level', '>=', 4), ('academic_performance', '==', 1), ('sleep_hours', '>=', 5), ('sleep_hours', '<=', 7)],
+    ]),
+]
+DEFAULT_CONDITION = 'Normal'
+
+
+class RuleSet:
+    """A compiled rule table.
+
+    predict() classifies a whole (n, n_features) batch with one boolean mask
+    per distinct term, combined per clause and rule, and np.select for
+    first-match-wins priority. predict_one() walks the same table for a
+    single row.
+    """
+
+    def __init__(self, rules=RULES, default=DEFAULT_CONDITION, feature_names=FEATURE_COLUMNS):
+        self.conditions = [condition for condition, _ in rules] + [default]
+        self.default = default
+        self._condition_array = np.array(self.conditions, dtype=object)
+
+        # Terms shared between clauses are evaluated once per batch
+        self.terms = []
+        term_index = {}
+        self.compiled = []
+        for condition, clauses in rules:
+            compiled_clauses = []
+            for clause in clauses:
+                compiled_clause = []
+                for feature, op, value in clause:
+                    term = (feature_names.index(feature), op, value)
+                    if term not in term_index:
+                        term_index[term] = len(self.terms)
+                        self.terms.append(term)
+                    compiled_clause.append(term_index[term])
+                compiled_clauses.append(compiled_clause)
+            self.compiled.append((condition, compiled_clauses))
+
+        self._scalar_rules = [
+            (condition, [[(self.terms[t][0], OPS[self.terms[t][1]], self.terms[t][2]) for t in clause]
+                         for clause in clauses])
+            for condition, clauses in self.compiled
+        ]
+
+    def rule_masks(self, X):
+        """(n_rules, n) boolean matches of every rule, before priority is applied."""
+        X = np.asarray(X)
+        term_masks = [OPS[op](X[:, j], value) for j, op, value in self.terms]
+        masks = np.zeros((len(self.compiled), X.shape[0]), dtype=bool)
+        for i, (_, clauses) in enumerate(self.compiled):
+            for clause in clauses:
+                clause_mask = term_masks[clause[0]].copy()
+                for t in clause[1:]:
+                    clause_mask &= term_masks[t]
+                masks[i] |= clause_mask
+        return masks
+
+    def predict_codes(self, X):
+        """Index into self.conditions of the first matching rule for each row (the default when none match)."""
+        masks = self.rule_masks(X)
+        return np.select(list(masks), np.arange(len(masks)), default=len(masks))
+
+    def predict(self, X):
+        return self._condition_array[self.predict_codes(X)].tolist()
+
+    def predict_one(self, row):
+        for condition, clauses in self._scalar_rules:
+            for clause in clauses:
+                if all(op(row[j], value) for j, op, value in clause):
+                    return condition
+        return self.default
@@ -0,0 +1,125 @@
+"""Shadow scoring: a second engine re-scores live requests off the request path.
+
+The request thread only puts (row, primary condition) on a bounded queue
+and never waits; when the queue is full the sample is dropped and counted.
+Worker threads drain the queue in batches, score each batch with one
+predict_batch call on the shadow engine and add the pairs to a fixed-size
+confusion matrix (rows: primary engine, columns: shadow engine).
+
+Environment:
+    SHADOW_BACKEND      engine to shadow with ('rules', 'table' or 'model');
+                        unset disables shadow mode
+    SHADOW_WORKERS      worker threads per process (default 1)
+    SHADOW_QUEUE_SIZE   samples buffered before dropping (default 1024)
+"""
+import os
+import queue
+import threading
+
+import numpy as np
+
+from request_log import logger
+
+# Rows scored per shadow predict_batch call, at most
+BATCH_SIZE = 256
+
+
+class ShadowScorer:
+    """Compare a primary engine's answers with a shadow engine's.
+
+    Like the log listener, worker threads are started lazily in whichever
+    process first submits, so each gunicorn worker runs its own.
+    """
+
+    def __init__(self, engine, labels, workers=1, queue_size=1024):
+        self.engine = engine
+        self.labels = list(labels)
+        self._label_index = {label: i for i, label in enumerate(self.labels)}
+        self.workers = workers
+        self.queue_size = queue_size
+        # Last row/column counts answers outside `labels`
+        self.confusion = np.zeros((len(self.labels) + 1, len(self.labels) + 1), dtype=np.int64)
+        self.submitted = 0
+        self.dropped = 0
+        self.scored = 0
+        self.failed = 0
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_workers(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # A queue inherited across fork may hold a lock taken by a parent thread
+            self._queue = queue.Queue(self.queue_size)
+            for i in range(self.workers):
+                threading.Thread(target=self._run, name=f'shadow-{i}', daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, row, primary_condition):
+        """Queue a request for shadow scoring; never blocks."""
+        self._ensure_workers()
+        self.submitted += 1
+        try:
+            self._queue.put_nowait((row, primary_condition))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        samples = self._queue
+        while True:
+            batch = [samples.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(samples.get_nowait())
+                except queue.Empty:
+                    break
+            self.score(batch)
+            for _ in batch:
+                samples.task_done()
+
+    def score(self, batch):
+        """Score (row, primary condition) pairs with the shadow engine and record them."""
+        try:
+            shadow_conditions = self.engine.predict_batch(np.array([row for row, _ in batch], dtype=np.int64))
+        except Exception:
+            logger.exception('Shadow scoring failed')
+            self.failed += len(batch)
+            return
+        other = len(self.labels)
+        primary = np.array([self._label_index.get(condition, other) for _, condition in batch])
+        shadow = np.array([self._label_index.get(condition, other) for condition in shadow_conditions])
+        with self._lock:
+            np.add.at(self.confusion, (primary, shadow), 1)
+            self.scored += len(batch)
+
+    def wait(self):
+        """Block until every queued sample has been scored (for tests and benchmarks)."""
+        if self._queue is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def stats(self):
+        with self._lock:
+            confusion = self.confusion.copy()
+            scored = self.scored
+        labels = self.labels + ['other']
+        agreed = int(np.trace(confusion))
+        disagreements = [
+            {'primary': labels[i], 'shadow': labels[j], 'count': int(confusion[i, j])}
+            for i, j in zip(*np.nonzero(confusion)) if i != j
+        ]
+        disagreements.sort(key=lambda item: -item['count'])
+        return {
+            'submitted': self.submitted,
+            'scored': scored,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'queued': self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0,
+            'agreement_rate': round(agreed / scored, 6) if scored else None,
+            'labels': labels,
+            'confusion': confusion.tolist(),
+            'disagreements': disagreements,
+        }
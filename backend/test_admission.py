@@ -0,0 +1,111 @@
+import threading
+
+import app as flask_app
+from admission import AdmissionController
+from app import app
+
+
+def test_requests_over_limit_and_queue_are_shed():
+    reasons = []
+    controller = AdmissionController(limit=2, queue_size=0, on_shed=reasons.append)
+
+    assert controller.acquire() and controller.acquire()
+    assert not controller.acquire()
+    controller.release(0.001)
+    assert controller.acquire()
+    assert reasons == ['queue_full']
+    assert controller.stats()['shed'] == 1
+
+
+def test_queued_request_is_admitted_when_a_slot_frees():
+    controller = AdmissionController(limit=1, queue_size=1, queue_timeout=5)
+    controller.acquire()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(controller.acquire()))
+    waiter.start()
+    while controller.queued == 0:
+        pass
+
+    controller.release(0.001)
+    waiter.join()
+
+    assert results == [True] and controller.in_flight == 1
+
+
+def test_queue_wait_times_out():
+    controller = AdmissionController(limit=1, queue_size=4, queue_timeout=0.01)
+    controller.acquire()
+
+    assert not controller.acquire()
+    assert controller.queued == 0
+
+
+def test_limit_grows_when_fast_and_shrinks_when_slow():
+    controller = AdmissionController(limit=4, max_limit=8, target_latency=0.1, backoff=0.5)
+    for _ in range(4):
+        controller.acquire()
+    controller.release(0.01)
+    assert controller.limit == 4.25
+
+    controller.release(0.5)
+    assert controller.limit == 2.125
+    controller.release(0.5)  # within the same target interval: no second cut
+    assert controller.limit == 2.125
+
+
+def test_shed_request_gets_503_with_retry_after():
+    saved = flask_app.admission
+    flask_app.admission = AdmissionController(limit=0, queue_size=0, retry_after=3)
+    try:
+        response = app.test_client().post('/api/predict', json={'sleep_hours': 7},
+                                          headers={'Origin': 'https://mind-recommend.vercel.app'})
+    finally:
+        flask_app.admission = saved
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+    # Cross-origin clients can only read the header if it is exposed
+    assert 'Retry-After' in response.headers['Access-Control-Expose-Headers']
+
+
+def test_concurrent_requests_beyond_limit_and_queue_are_shed():
+    release = threading.Event()
+    real = flask_app.engine
+
+    class BlockingEngine:
+        version = real.version
+        bundle = real.bundle
+
+        def check_row(self, row):
+            real.check_row(row)
+
+        def predict(self, row):
+            release.wait()
+            return real.predict(row)
+
+    saved_engine, saved_admission = flask_app.engine, flask_app.admission
+    controller = AdmissionController(limit=2, queue_size=1, queue_timeout=5)
+    flask_app.engine, flask_app.admission = BlockingEngine(), controller
+    statuses = []
+
+    def post():
+        response = app.test_client().post('/api/predict', json={'sleep_hours': 7, 'homesick_level': 2,
+                                                                'mess_food_rating': 3, 'screen_time': 3})
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=post) for _ in range(6)]
+    try:
+        for thread in threads:
+            thread.start()
+        # Two requests run (blocked in predict), one waits in the queue, three are shed at once
+        while not (controller.in_flight == 2 and controller.queued == 1 and controller.shed == 3):
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        release.set()
+        flask_app.engine, flask_app.admission = saved_engine, saved_admission
+
+    assert sorted(statuses) == [200, 200, 200, 503, 503, 503]
+    assert controller.stats()['admitted'] == 3 and controller.in_flight == 0
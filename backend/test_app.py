@@ -0,0 +1,92 @@
+import app as flask_app
+from app import app, cached_prediction
+
+QUERY = '/api/predict?sleep_hours=4&academic_performance=0&bullied=1&homesick_level=5&screen_time=9'
+
+
+def test_ready_reports_loaded_backend():
+    response = app.test_client().get('/api/ready')
+
+    assert response.status_code == 200
+    assert response.json['ready'] is True
+
+
+def test_get_predict_matches_post():
+    client = app.test_client()
+    payload = {'sleep_hours': 4, 'academic_performance': 0, 'bullied': 1, 'homesick_level': 5, 'screen_time': 9}
+
+    assert client.get(QUERY).json == client.post('/api/predict', json=payload).json
+
+
+def test_get_predict_is_cached_and_revalidated_by_etag():
+    client = app.test_client()
+    hits = cached_prediction.cache_info().hits
+
+    first = client.get(QUERY)
+    second = client.get(QUERY)
+    revalidated = client.get(QUERY, headers={'If-None-Match': first.headers['ETag']})
+
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert 'max-age' in first.headers['Cache-Control']
+    assert cached_prediction.cache_info().hits > hits
+    assert revalidated.status_code == 304
+
+
+def test_explain_matches_model_and_adds_up():
+    client = app.test_client()
+    payload = {'sleep_hours': 4, 'academic_performance': 0, 'bullied': 1, 'homesick_level': 5, 'screen_time': 9}
+
+    result = client.post('/api/explain', json=payload).json
+    probabilities = result['probabilities']
+
+    assert result['condition'] == max(probabilities, key=probabilities.get)
+    assert abs(result['base_probabilities'][result['condition']] + sum(result['contributions'].values())
+               - probabilities[result['condition']]) < 1e-4
+
+
+def test_explain_batch_reports_invalid_rows():
+    client = app.test_client()
+    payload = {'sleep_hours': 4, 'academic_performance': 0, 'bullied': 1, 'homesick_level': 5, 'screen_time': 9}
+
+    response = client.post('/api/explain/batch?all_conditions=1', json={'rows': [payload, {'academic_performance': 7}]})
+    single = client.post('/api/explain?all_conditions=1', json=payload).json
+
+    assert response.status_code == 200
+    first, second = response.json['results']
+    assert first['contributions'] == single['contributions']
+    assert 'error' in second
+
+
+def test_explain_rejects_out_of_range_values():
+    client = app.test_client()
+
+    single = client.post('/api/explain', data='{"sleep_hours": Infinity}', content_type='application/json')
+    response = client.post('/api/explain/batch', json={'rows': [{'sleep_hours': 7}, {'study_hours': 10 ** 30}]})
+
+    assert single.status_code == 400
+    assert response.status_code == 200
+    first, second = response.json['results']
+    assert 'condition' in first and 'out of range' in second['error']
+
+
+def test_recommendation_comes_from_the_engine_that_scored_the_request(monkeypatch):
+    real = flask_app.engine
+
+    class Release:
+        recommendations = {condition: f'{condition} advice from the new release' for condition in flask_app.conditions}
+
+    class SwappedEngine:
+        version = 'model-new'
+        bundle = Release()
+
+        def check_row(self, row):
+            real.check_row(row)
+
+        def predict(self, row):
+            return real.predict(row)
+
+    monkeypatch.setattr(flask_app, 'engine', SwappedEngine())
+    result = app.test_client().post('/api/predict', json={'sleep_hours': 7}).json
+
+    assert result['recommendation'] == f"{result['condition']} advice from the new release"
+    assert flask_app.recommendations[result['condition']] != result['recommendation']
@@ -0,0 +1,102 @@
+import io
+import json
+
+import batch
+from app import app, academic_options
+
+ROW = {
+    'sleep_hours': 7, 'academic_performance': 'Average', 'bullied': False, 'has_close_friends': True,
+    'homesick_level': 2, 'mess_food_rating': 3, 'sports_participation': True,
+    'social_activities': 5, 'study_hours': 4, 'screen_time': 3
+}
+
+
+def test_json_array_is_parsed_across_read_boundaries(monkeypatch):
+    monkeypatch.setattr(batch, 'READ_SIZE', 7)
+    body = json.dumps([ROW, {'note': 'é, ]'}, ROW]).encode()
+
+    records = list(batch.iter_json_array_records(io.BytesIO(body)))
+
+    assert records == [ROW, {'note': 'é, ]'}, ROW]
+
+
+def test_encode_chunk_reports_invalid_rows():
+    X, valid, errors = batch.encode_chunk([ROW, dict(ROW, bullied='maybe'), {}], academic_options)
+
+    assert X[0].tolist() == [7, 1, 0, 1, 2, 3, 1, 5, 4, 3]
+    assert valid.tolist() == [True, False, False]
+    assert set(errors) == {1, 2}
+
+
+def test_batch_endpoint_streams_one_result_per_row_and_chunk_stats():
+    body = '\n'.join(json.dumps(row) for row in [ROW] * 5)
+    response = app.test_client().post('/api/predict/batch?chunk_size=2', data=body,
+                                      content_type='application/x-ndjson')
+
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [line['row'] for line in lines if 'row' in line] == list(range(5))
+    assert [line['rows'] for line in lines if 'chunk' in line] == [2, 2, 1]
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def test_malformed_json_element_fails_without_reading_the_rest(monkeypatch):
+    monkeypatch.setattr(batch, 'READ_SIZE', 1024)
+    body = ('[' + json.dumps(ROW) + ', {"sleep_hours": 7 "oops": 1}, ' +
+            ', '.join([json.dumps(ROW)] * 10000) + ']').encode()
+    stream = CountingStream(body)
+    records = batch.iter_json_array_records(stream)
+
+    assert next(records) == ROW
+    try:
+        next(records)
+    except batch.BatchFormatError as e:
+        assert 'element 1' in str(e)
+    else:
+        raise AssertionError('malformed element was accepted')
+    assert stream.reads <= 2
+
+
+def test_json_array_rejects_bad_separators_and_trailing_data():
+    for body in ('[{"a": 1},, {"a": 2}]', '[{"a": 1} {"a": 2}]', '[{"a": 1}] [{"a": 2}]', '[{"a": 1},]'):
+        try:
+            list(batch.iter_json_array_records(io.BytesIO(body.encode())))
+        except batch.BatchFormatError:
+            continue
+        raise AssertionError(f'accepted {body}')
+    assert list(batch.iter_json_array_records(io.BytesIO(b' [ 1 , 22 ]\n '))) == [1, 22]
+
+
+def test_batch_reports_undecodable_body_as_error_row():
+    body = b'sleep_hours,academic_performance\n7,Good\n\xff\xfe\n'
+    response = app.test_client().post('/api/predict/batch?format=csv', data=body, content_type='text/csv')
+
+    assert response.status_code == 200
+    assert 'not valid UTF-8' in response.data.decode()
+
+
+def test_batch_reports_malformed_csv_as_error_row():
+    header = ','.join(batch.FEATURE_COLUMNS)
+    body = f'{header}\n"{"x" * 200000}",Good\n'
+    lines = app.test_client().post('/api/predict/batch', data=body, content_type='text/csv').data.decode().splitlines()
+
+    assert json.loads(lines[-1]) == {'row': 0, 'error': 'Invalid CSV: field larger than field limit (131072)'}
+
+
+def test_out_of_range_values_are_reported_per_row():
+    rows = [dict(ROW, sleep_hours=10 ** 12), dict(ROW, study_hours=10 ** 30), dict(ROW, screen_time=float('inf')),
+            dict(ROW, academic_performance=float('inf')), ROW]
+    response = app.test_client().post('/api/predict/batch', data=json.dumps(rows), content_type='application/json')
+
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [line['row'] for line in lines if 'row' in line] == list(range(5))
+    assert all('out of range' in line['error'] for line in lines[:4])
+    assert 'condition' in lines[4] and lines[5]['errors'] == 4
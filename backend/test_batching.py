@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+from batching import MicroBatcher
+
+
+def test_concurrent_submissions_are_scored_in_one_batch():
+    calls = []
+
+    def predict_batch(X):
+        calls.append(len(X))
+        return [int(row.sum()) for row in X]
+
+    async def run():
+        batcher = MicroBatcher(predict_batch, max_batch_size=16, max_wait_ms=50)
+        results = await asyncio.gather(*[batcher.submit([i, i]) for i in range(10)])
+        await batcher.stop()
+        return results, batcher.stats()
+
+    results, stats = asyncio.run(run())
+
+    assert results == [2 * i for i in range(10)]
+    assert calls == [10]
+    assert stats['batches'] == 1 and stats['rows'] == 10
+
+
+def test_batches_are_capped_at_max_batch_size():
+    calls = []
+
+    def predict_batch(X):
+        calls.append(len(X))
+        return [0] * len(X)
+
+    async def run():
+        batcher = MicroBatcher(predict_batch, max_batch_size=4, max_wait_ms=50)
+        await asyncio.gather(*[batcher.submit([i]) for i in range(10)])
+        await batcher.stop()
+
+    asyncio.run(run())
+
+    assert calls == [4, 4, 2]
+
+
+def test_a_failing_row_only_fails_its_own_caller():
+    def predict_batch(X):
+        if (X < 0).any():
+            raise ValueError('negative')
+        return [int(row.sum()) for row in X]
+
+    async def run():
+        batcher = MicroBatcher(predict_batch, max_batch_size=16, max_wait_ms=50)
+        results = await asyncio.gather(*[batcher.submit([i]) for i in (1, 2, -1, 3)], return_exceptions=True)
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(run())
+
+    assert results[:2] == [1, 2] and results[3] == 3
+    assert isinstance(results[2], ValueError)
+
+
+def test_asgi_predict_keeps_the_flask_contract():
+    import asgi
+    from app import app as flask_app
+
+    payload = {'sleep_hours': 4, 'academic_performance': 0, 'bullied': 1, 'homesick_level': 5, 'screen_time': 10}
+
+    async def call():
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': json.dumps(payload).encode(), 'more_body': False}
+
+        async def send(message):
+            sent.append(message)
+
+        await asgi.app({'type': 'http', 'method': 'POST', 'path': '/api/predict'}, receive, send)
+        await asgi.batcher.stop()
+        return sent
+
+    sent = asyncio.run(call())
+
+    assert sent[0]['status'] == 200
+    assert json.loads(sent[1]['body']) == flask_app.test_client().post('/api/predict', json=payload).json
+
+
+def test_asgi_rejects_out_of_range_values_without_failing_the_batch():
+    import asgi
+
+    good = {'sleep_hours': 7, 'homesick_level': 2, 'mess_food_rating': 3, 'screen_time': 3}
+    payloads = [good] * 5 + [dict(good, sleep_hours=1e30)] + [good] * 5
+
+    async def post(payload):
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': json.dumps(payload).encode(), 'more_body': False}
+
+        async def send(message):
+            sent.append(message)
+
+        await asgi.app({'type': 'http', 'method': 'POST', 'path': '/api/predict'}, receive, send)
+        return sent[0]['status']
+
+    async def run():
+        statuses = await asyncio.gather(*[post(payload) for payload in payloads])
+        await asgi.batcher.stop()
+        return statuses
+
+    assert asyncio.run(run()) == [200] * 5 + [400] + [200] * 5
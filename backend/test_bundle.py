@@ -0,0 +1,84 @@
+import json
+
+import numpy as np
+import pytest
+
+from bundle import MAGIC, SCHEMA_VERSION, BundleError, load_bundle, write_bundle
+from forest import CompiledForest
+
+META = {
+    'feature_names': ['a', 'b'],
+    'academic_classes': ['Average', 'Good', 'Poor'],
+    'condition_classes': ['Normal', 'Stress'],
+    'recommendations': {'Normal': 'Keep it up.', 'Stress': 'Take a break.'},
+}
+
+
+def arrays():
+    return {
+        'ints': np.arange(10, dtype=np.int32),
+        'floats': np.linspace(0, 1, 12).reshape(4, 3),
+        'empty': np.zeros(0, dtype=np.int32),
+    }
+
+
+def test_round_trip_memory_maps_arrays(tmp_path):
+    path = str(tmp_path / 'model.bundle')
+    content_hash = write_bundle(path, arrays(), META)
+
+    bundle = load_bundle(path)
+    assert bundle.content_hash == content_hash
+    assert bundle.version == content_hash[:12]
+    assert bundle.meta['schema_version'] == SCHEMA_VERSION
+    assert bundle.recommendations == META['recommendations']
+    assert bundle.condition_classes == META['condition_classes']
+    assert isinstance(bundle.arrays['ints'], np.memmap)
+    assert bundle.arrays['ints'].ctypes.data % 64 == 0
+    for name, expected in arrays().items():
+        np.testing.assert_array_equal(bundle.arrays[name], expected)
+        assert bundle.arrays[name].dtype == expected.dtype
+    assert bundle.load_seconds >= 0
+
+
+def test_hash_depends_on_contents(tmp_path):
+    first = write_bundle(str(tmp_path / 'a.bundle'), arrays(), META)
+    assert write_bundle(str(tmp_path / 'b.bundle'), arrays(), META) == first
+
+    changed = arrays()
+    changed['ints'][3] = 99
+    assert write_bundle(str(tmp_path / 'c.bundle'), changed, META) != first
+    assert write_bundle(str(tmp_path / 'd.bundle'), arrays(), dict(META, condition_classes=['Normal', 'OCD'])) != first
+
+
+def test_corrupted_bundle_fails_integrity_check(tmp_path):
+    path = tmp_path / 'model.bundle'
+    write_bundle(str(path), arrays(), META)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(BundleError, match='integrity'):
+        load_bundle(str(path))
+    load_bundle(str(path), verify=False)
+
+
+def test_rejects_other_files_and_schema_versions(tmp_path):
+    path = tmp_path / 'model.bundle'
+    path.write_bytes(b'not a bundle at all')
+    with pytest.raises(BundleError, match='not a model bundle'):
+        load_bundle(str(path))
+
+    header = json.dumps({'schema_version': SCHEMA_VERSION + 1, 'arrays': {}}).encode()
+    path.write_bytes(MAGIC + len(header).to_bytes(8, 'little') + header)
+    with pytest.raises(BundleError, match='schema version'):
+        load_bundle(str(path))
+
+
+def test_shipped_bundle_loads_as_compiled_forest():
+    forest = CompiledForest.load()
+    bundle = forest.bundle
+    assert forest.feature_names == bundle.feature_names
+    assert forest.academic_classes == ['Average', 'Good', 'Poor']
+    assert set(forest.condition_classes) <= set(bundle.recommendations)
+    assert forest.n_trees == bundle.meta['n_trees']
+    assert forest.predict_one([7, 1, 0, 1, 2, 3, 1, 5, 4, 3]) in forest.condition_classes
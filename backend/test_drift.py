@@ -0,0 +1,106 @@
+import json
+import threading
+
+import numpy as np
+
+from drift import BASELINE_PATH, DriftMonitor, build_baseline
+
+
+def load_baseline():
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def training_like_rows(baseline, n, rng):
+    # Each feature drawn independently from its training histogram
+    columns = []
+    for name, counts in baseline['counts'].items():
+        lo = baseline['ranges'][name][0]
+        p = np.array(counts[1:-1], dtype=float)
+        columns.append(lo + rng.choice(len(p), n, p=p / p.sum()))
+    return np.column_stack(columns)
+
+
+def test_training_distribution_is_stable_and_shifted_one_is_not():
+    baseline = load_baseline()
+    monitor = DriftMonitor(baseline, clock=Clock())
+    rows = training_like_rows(baseline, 5000, np.random.default_rng(0))
+
+    monitor.observe_batch(rows)
+    stable = monitor.report()
+
+    shifted = rows.copy()
+    shifted[:, 0] = 3  # everyone sleeps three hours
+    monitor.observe_batch(shifted)
+    drifted = monitor.report()
+
+    assert stable['requests'] == 5000 and stable['status'] == 'stable'
+    assert drifted['requests'] == 10000 and drifted['status'] == 'significant'
+    assert drifted['features']['sleep_hours']['psi'] == drifted['max_psi']
+
+
+def test_observe_matches_observe_batch_and_counts_out_of_range():
+    baseline = load_baseline()
+    one, many = DriftMonitor(baseline, clock=Clock()), DriftMonitor(baseline, clock=Clock())
+    rows = [(7, 1, False, True, 2, 3, True, 5, 4, 3), (0, 2, True, False, 9, 1, False, 0, 24, 12)]
+
+    for row in rows:
+        one.observe(row)
+    many.observe_batch(np.array(rows, dtype=np.int64))
+
+    assert np.array_equal(one.window_counts()[0], many.window_counts()[0])
+    sleep = one.report()['features']['sleep_hours']
+    assert sleep['live'][0] == 1 and sleep['bins'][0] == 'below'
+
+
+def test_old_buckets_leave_the_window():
+    clock = Clock()
+    monitor = DriftMonitor(load_baseline(), bucket_seconds=60, buckets=10, clock=clock)
+    row = (7, 1, 0, 1, 2, 3, 1, 5, 4, 3)
+
+    monitor.observe(row)
+    clock.now += 120
+    monitor.observe(row)
+
+    assert monitor.report(60)['requests'] == 1
+    assert monitor.report()['requests'] == 2
+    clock.now += 600
+    assert monitor.report()['status'] == 'no_data'
+
+
+def test_baseline_matches_training_csv():
+    baseline = load_baseline()
+
+    assert baseline == json.loads(json.dumps(build_baseline('../vivek/boarding_school_mental_health_2500.csv')))
+
+
+def test_any_integer_lands_in_an_edge_bin():
+    monitor = DriftMonitor(load_baseline(), clock=Clock())
+
+    monitor.observe((10 ** 30, 1, 0, 1, 2, 3, 1, 5, 4, -10 ** 30))
+    monitor.observe((2 ** 63, 1, 0, 1, 2, 3, 1, 5, 4, 3))
+
+    features = monitor.report()['features']
+    assert features['sleep_hours']['live'][-1] == 2
+    assert features['screen_time']['live'][0] == 1
+
+
+def test_rings_of_finished_threads_are_folded():
+    monitor = DriftMonitor(load_baseline(), clock=Clock())
+    row = (7, 1, 0, 1, 2, 3, 1, 5, 4, 3)
+
+    for _ in range(50):
+        thread = threading.Thread(target=monitor.observe, args=(row,))
+        thread.start()
+        thread.join()
+
+    assert monitor.report()['requests'] == 50
+    assert len(monitor._rings) == 0
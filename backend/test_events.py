@@ -0,0 +1,92 @@
+import asyncio
+import json
+import sqlite3
+
+import numpy as np
+
+from events import EventStore, anonymize, bucket_label
+
+
+class Clock:
+    def __init__(self):
+        self.now = 7 * 3600 + 120.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_answers_are_coarsened_to_buckets():
+    assert [bucket_label(v, (4, 6, 8)) for v in (2, 4, 5, 6, 8, 9, 12)] == \
+        ['<=4', '<=4', '5-6', '5-6', '7-8', '>=9', '>=9']
+    assert bucket_label(3, (2, 3)) == '3'
+    assert anonymize((7, 2, True, 0, 3, 1, 1, 5, 4, 3)) == \
+        ['7-8', 'Good', 'yes', 'no', '3', '<=2', 'yes', '>=4', '3-5', '<=3']
+
+
+def test_aggregates_match_the_event_log(tmp_path):
+    clock = Clock()
+    store = EventStore(str(tmp_path / 'events.sqlite3'), clock=clock)
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.integers(lo, hi, 300) for lo, hi in
+                         [(2, 13), (0, 3), (0, 2), (0, 2), (1, 6), (1, 6), (0, 2), (0, 6), (0, 11), (1, 13)]])
+    labels = ['Stress', 'Normal', 'Anxiety']
+    conditions = [labels[i % 3] for i in range(len(X))]
+
+    for row, condition in zip(X[:100].tolist(), conditions[:100]):
+        store.record(tuple(row), condition, 'v1')
+    clock.now += 3600
+    store.record_batch(X[100:], conditions[100:], 'v1')
+    store.wait()
+
+    db = sqlite3.connect(str(tmp_path / 'events.sqlite3'))
+    assert db.execute('SELECT COUNT(*) FROM events').fetchone()[0] == 300
+    assert store.recorded == 300 and store.dropped == 0
+
+    stats = store.stats(hours=2)
+    assert stats['total'] == 300
+    assert stats['conditions'] == dict(db.execute('SELECT condition, COUNT(*) FROM events GROUP BY condition'))
+    assert [sum(item['conditions'].values()) for item in stats['timeline']] == [100, 200]
+    assert stats['features']['sleep_hours'] == dict(
+        db.execute('SELECT sleep_hours, COUNT(*) FROM events GROUP BY sleep_hours'))
+    assert store.stats(hours=1)['total'] == 200
+
+    stressed = store.stats(hours=2, condition='Stress')
+    assert sum(stressed['features']['bullied'].values()) == 100
+
+
+def test_stats_endpoint_counts_served_predictions():
+    import app as flask_app
+
+    client = flask_app.app.test_client()
+    before = client.get('/api/stats?hours=1').json['total']
+    condition = client.post('/api/predict', json={'sleep_hours': 4, 'academic_performance': 0, 'bullied': 1,
+                                                  'homesick_level': 5, 'screen_time': 9}).json['condition']
+    flask_app.events.wait()
+    stats = client.get('/api/stats?hours=1').json
+
+    assert stats['total'] == before + 1
+    assert stats['conditions'][condition] >= 1
+    assert client.get('/api/stats?hours=0').status_code == 400
+
+
+def test_asgi_predictions_are_recorded():
+    import asgi
+    import app as flask_app
+
+    payload = {'sleep_hours': 4, 'academic_performance': 0, 'bullied': 1, 'homesick_level': 5, 'screen_time': 10}
+    before = flask_app.events.stats(hours=1)['total']
+
+    async def call():
+        async def receive():
+            return {'type': 'http.request', 'body': json.dumps(payload).encode(), 'more_body': False}
+
+        async def send(message):
+            pass
+
+        await asgi.app({'type': 'http', 'method': 'POST', 'path': '/api/predict'}, receive, send)
+        await asgi.batcher.stop()
+
+    asyncio.run(call())
+    flask_app.events.wait()
+
+    assert flask_app.events.stats(hours=1)['total'] == before + 1
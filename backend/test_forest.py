@@ -0,0 +1,64 @@
+import os
+import warnings
+
+import numpy as np
+import pytest
+
+from forest import CompiledForest
+
+VIVEK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'vivek')
+
+pd = pytest.importorskip('pandas')
+joblib = pytest.importorskip('joblib')
+pytest.importorskip('sklearn')
+
+
+@pytest.fixture(scope='module')
+def clf():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return joblib.load(os.path.join(VIVEK_DIR, 'mental_health_rf_model.pkl'))
+
+
+@pytest.fixture(scope='module')
+def forest():
+    return CompiledForest.load()
+
+
+@pytest.fixture(scope='module')
+def rows(forest):
+    df = pd.read_csv(os.path.join(VIVEK_DIR, 'boarding_school_mental_health_2500.csv'))
+    df['academic_performance'] = df['academic_performance'].map(forest.academic_classes.index)
+    training_rows = df[forest.feature_names].astype(int).values
+
+    rng = np.random.default_rng(0)
+    random_rows = np.column_stack([rng.integers(lo, hi, 5000) for lo, hi in
+                                   [(0, 15), (0, 3), (0, 2), (0, 2), (0, 7), (0, 7), (0, 2), (0, 8), (0, 13), (0, 15)]])
+    return np.vstack([training_rows, random_rows])
+
+
+def test_batch_probabilities_are_bit_exact(clf, forest, rows):
+    expected = clf.predict_proba(pd.DataFrame(rows, columns=forest.feature_names))
+
+    assert np.array_equal(forest.predict_proba(rows), expected)
+
+
+def test_single_row_probabilities_are_bit_exact(clf, forest, rows):
+    expected = clf.predict_proba(pd.DataFrame(rows[:500], columns=forest.feature_names))
+
+    assert np.array_equal(np.array([forest.predict_proba_one(row) for row in rows[:500]]), expected)
+
+
+def test_predicted_conditions_match(clf, forest, rows):
+    expected = [forest.condition_classes[i] for i in clf.predict(pd.DataFrame(rows, columns=forest.feature_names))]
+
+    assert forest.predict(rows) == expected
+    assert [forest.predict_one(row) for row in rows[:500]] == expected[:500]
+
+
+def test_explanations_add_up_to_probabilities(forest, rows):
+    proba, bias, contributions = forest.explain(rows)
+
+    assert np.array_equal(proba, forest.predict_proba(rows))
+    assert np.allclose(bias + contributions.sum(axis=1), proba, atol=1e-9)
+    assert contributions.shape == (len(rows), len(forest.feature_names), len(forest.condition_classes))
@@ -0,0 +1,31 @@
+import sys
+
+import pytest
+
+import loadtest
+
+BASELINE = {'results': {'gunicorn': {'8': {'rps': 1000.0, 'p95_ms': 10.0, 'errors': 0}}}}
+
+
+def report(rps, p95_ms, errors=0):
+    return {'results': {'gunicorn': {'8': {'rps': rps, 'p95_ms': p95_ms, 'errors': errors}},
+                        'asgi': {'8': {'rps': 1.0, 'p95_ms': 999.0, 'errors': 0}}}}
+
+
+def test_compare_allows_changes_within_tolerance():
+    assert loadtest.compare(report(810.0, 11.9), BASELINE, 0.2) == []
+
+
+def test_compare_flags_throughput_latency_and_error_regressions():
+    regressions = loadtest.compare(report(790.0, 12.1, errors=3), BASELINE, 0.2)
+
+    assert len(regressions) == 3
+    assert all(regression.startswith('gunicorn c=8') for regression in regressions)
+
+
+def test_save_baseline_requires_baseline(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['loadtest.py', '--save-baseline'])
+
+    with pytest.raises(SystemExit) as exit_info:
+        loadtest.main()
+    assert exit_info.value.code == 2
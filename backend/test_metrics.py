@@ -0,0 +1,62 @@
+import threading
+
+from metrics import Counter, CounterFunction, Histogram
+
+
+def test_per_thread_shards_are_summed_on_render():
+    counter = Counter('test_total', 'Test counter.', ['kind'])
+    histogram = Histogram('test_seconds', 'Test histogram.', buckets=(0.1, 1.0))
+
+    def work():
+        for _ in range(1000):
+            counter.inc('a')
+            histogram.observe(0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 'test_total{kind="a"} 4000' in counter.render()
+    lines = histogram.render()
+    assert 'test_seconds_bucket{le="0.1"} 0' in lines
+    assert 'test_seconds_bucket{le="1.0"} 4000' in lines
+    assert 'test_seconds_bucket{le="+Inf"} 4000' in lines
+    assert 'test_seconds_count 4000' in lines
+
+
+def test_finished_threads_shards_are_folded_into_the_total():
+    counter = Counter('test_total', 'Test counter.', ['kind'])
+    histogram = Histogram('test_seconds', 'Test histogram.', buckets=(0.1, 1.0))
+
+    # One short-lived thread per "request", as under app.run
+    for _ in range(200):
+        thread = threading.Thread(target=lambda: (counter.inc('a'), histogram.observe(0.5)))
+        thread.start()
+        thread.join()
+
+    assert len(counter._values.shards()) == 1
+    assert len(histogram.labels()._shards.shards()) == 1
+    assert 'test_total{kind="a"} 200' in counter.render()
+    assert 'test_seconds_count 200' in histogram.render()
+
+
+def test_counter_function_renders_as_counter():
+    counter = CounterFunction('test_events_total', 'Test events.', lambda: 7)
+
+    lines = counter.render()
+
+    assert lines[1] == '# TYPE test_events_total counter'
+    assert lines[2].startswith('test_events_total{pid=') and lines[2].endswith(' 7')
+
+
+def test_predict_times_monitoring_apart_from_recommendation():
+    from app import app
+
+    client = app.test_client()
+    client.post('/api/predict', json={'sleep_hours': 7})
+    text = client.get('/metrics').data.decode()
+
+    for stage in ('parse', 'validate', 'inference', 'monitoring', 'recommendation', 'serialize'):
+        assert f'prediction_stage_seconds_count{{stage="{stage}"}}' in text
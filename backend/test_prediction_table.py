@@ -0,0 +1,53 @@
+import os
+import warnings
+
+import numpy as np
+import pytest
+
+from prediction_table import PredictionTable
+
+VIVEK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'vivek')
+
+pd = pytest.importorskip('pandas')
+joblib = pytest.importorskip('joblib')
+pytest.importorskip('sklearn')
+
+
+@pytest.fixture(scope='module')
+def clf():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return joblib.load(os.path.join(VIVEK_DIR, 'mental_health_rf_model.pkl'))
+
+
+@pytest.fixture(scope='module')
+def table():
+    return PredictionTable()
+
+
+def _clf_conditions(clf, table, rows):
+    X = pd.DataFrame(rows, columns=table.feature_names)
+    return [table.condition_classes[i] for i in clf.predict_proba(X).argmax(axis=1)]
+
+
+def test_table_matches_model_on_training_rows(clf, table):
+    df = pd.read_csv(os.path.join(VIVEK_DIR, 'boarding_school_mental_health_2500.csv'))
+    df['academic_performance'] = df['academic_performance'].map(table.academic_classes.index)
+    rows = df[table.feature_names].astype(int).values
+
+    assert [table.predict_one(row) for row in rows] == _clf_conditions(clf, table, rows)
+
+
+def test_table_matches_model_on_random_grid_points(clf, table):
+    rng = np.random.default_rng(0)
+    rows = np.column_stack([rng.integers(lo, hi + 1, 20000) for lo, hi in zip(table.mins, table.maxs)])
+
+    assert [table.predict_one(row) for row in rows] == _clf_conditions(clf, table, rows)
+
+
+def test_out_of_range_values_are_clamped_without_changing_prediction(clf, table):
+    rng = np.random.default_rng(1)
+    rows = np.column_stack([rng.integers(lo - 3, hi + 12, 5000) for lo, hi in zip(table.mins, table.maxs)])
+    rows[:, 1] = rng.integers(0, 3, len(rows))
+
+    assert [table.predict_one(row) for row in rows] == _clf_conditions(clf, table, rows)
@@ -0,0 +1,118 @@
+import os
+
+import numpy as np
+import pytest
+
+import app as flask_app
+from bundle import BundleError, load_bundle, write_bundle
+from forest import BUNDLE_NAME
+from inference import load_engine
+from prediction_table import MODEL_DIR
+from releases import ModelWatcher, ReleaseError, ReleaseStore, load_release, validate_bundle
+
+SHIPPED = os.path.join(MODEL_DIR, BUNDLE_NAME)
+PAYLOAD = {'sleep_hours': 4, 'academic_performance': 0, 'bullied': 1, 'homesick_level': 5, 'screen_time': 9}
+
+
+@pytest.fixture
+def other_bundle(tmp_path):
+    # The shipped forest with one leaf changed, so it has a different version
+    bundle = load_bundle(SHIPPED)
+    arrays = {name: np.array(array) for name, array in bundle.arrays.items()}
+    arrays['value'][0] = arrays['value'][0][::-1]
+    meta = {key: value for key, value in bundle.meta.items() if key not in ('arrays', 'schema_version', 'content_hash')}
+    path = str(tmp_path / 'other.bundle')
+    write_bundle(path, arrays, meta)
+    return path
+
+
+def test_publish_and_rollback(tmp_path, other_bundle):
+    store = ReleaseStore(str(tmp_path / 'releases'))
+    assert store.current() is None
+
+    first = store.publish(SHIPPED, validate_bundle)
+    second = store.publish(other_bundle, validate_bundle)
+    assert first != second
+    assert store.current() == os.path.join(store.root, second)
+    assert store.history() == [first, second]
+
+    assert store.rollback() == first
+    assert store.current() == os.path.join(store.root, first)
+    with pytest.raises(ReleaseError):
+        store.rollback()
+
+
+def test_publish_rejects_invalid_bundle(tmp_path):
+    store = ReleaseStore(str(tmp_path / 'releases'))
+    data = bytearray(open(SHIPPED, 'rb').read())
+    data[-1] ^= 0xFF
+    corrupted = tmp_path / 'corrupted.bundle'
+    corrupted.write_bytes(bytes(data))
+
+    with pytest.raises(BundleError):
+        store.publish(str(corrupted), validate_bundle)
+    assert store.current() is None
+
+
+def test_watcher_swaps_app_engine_and_reports_version(tmp_path, other_bundle):
+    store = ReleaseStore(str(tmp_path / 'releases'))
+    store.publish(SHIPPED, validate_bundle)
+    original, status = flask_app.engine, dict(flask_app.engine_status)
+    watcher = ModelWatcher(store, lambda path: load_engine('model', flask_app.academic_options, path),
+                           flask_app.reload_engine, interval=0)
+    client = flask_app.app.test_client()
+    try:
+        assert watcher.check()
+        shipped_version = flask_app.engine.version
+        assert client.post('/api/predict', json=PAYLOAD).json['model_version'] == shipped_version
+        assert client.get('/').json['model_version'] == shipped_version
+        assert not watcher.check()
+
+        store.publish(other_bundle, validate_bundle)
+        assert watcher.check()
+        assert flask_app.engine.version != shipped_version
+        assert flask_app.engine_status['version'] == flask_app.engine.version
+        assert client.get('/api/predict', query_string=PAYLOAD).json['model_version'] == flask_app.engine.version
+
+        store.rollback()
+        assert watcher.check()
+        assert flask_app.engine.version == shipped_version
+    finally:
+        flask_app.reload_engine((original, 0.0, 0.0))
+        flask_app.engine_status.clear()
+        flask_app.engine_status.update(status)
+
+
+def test_watcher_keeps_serving_when_a_release_fails_to_load(tmp_path):
+    store = ReleaseStore(str(tmp_path / 'releases'))
+    store.publish(SHIPPED, validate_bundle)
+    swapped = []
+
+    def load(path):
+        raise BundleError('broken')
+
+    watcher = ModelWatcher(store, load, swapped.append, interval=0)
+    assert not watcher.check()
+    assert not watcher.check()
+    assert watcher.failures == 1
+    assert swapped == []
+
+
+def test_startup_falls_back_when_current_release_is_broken(tmp_path, other_bundle):
+    store = ReleaseStore(str(tmp_path / 'releases'))
+    first = store.publish(SHIPPED, validate_bundle)
+    second = store.publish(other_bundle, validate_bundle)
+    with open(os.path.join(store.root, second), 'r+b') as f:
+        f.truncate(100)
+
+    def load(path):
+        return load_engine('model', ['Poor', 'Average', 'Good'], path)[0]
+
+    engine, path = load_release(store, load)
+    assert path == os.path.join(store.root, first)
+    assert engine.version == load(SHIPPED).version
+
+    with open(os.path.join(store.root, first), 'r+b') as f:
+        f.truncate(100)
+    engine, path = load_release(store, load)
+    assert path is None and engine.version == load(None).version
@@ -0,0 +1,34 @@
+import io
+import json
+import logging
+
+from request_log import DroppingQueueHandler, JsonFormatter
+
+
+def _record():
+    return logging.LogRecord('mind_recommend.requests', logging.INFO, __file__, 1, 'prediction', None, None)
+
+
+def test_formatter_redacts_student_answers():
+    record = _record()
+    record.fields = {'data': {'sleep_hours': 3, 'bullied': 1}, 'condition': 'Stress'}
+
+    line = json.loads(JsonFormatter().format(record))
+
+    assert line['data'] == {'sleep_hours': '[redacted]', 'bullied': '[redacted]'}
+    assert line['condition'] == 'Stress'
+
+
+def test_full_queue_drops_records_instead_of_blocking():
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+    handler = DroppingQueueHandler([output], maxsize=2)
+    handler._ensure_listener()
+    handler._listener.stop()  # nothing drains the queue now
+
+    for _ in range(5):
+        handler.emit(_record())
+
+    assert handler.dropped == 3
+    assert handler.queue.qsize() == 2
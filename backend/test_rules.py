@@ -0,0 +1,47 @@
+import itertools
+
+import numpy as np
+
+from rules import RuleSet
+
+# Input domain in API encoding. Every rule threshold lies inside these
+# ranges, so values outside them classify like the nearest edge and the grid
+# covers every distinct case.
+DOMAIN = [range(2, 13), range(3), range(2), range(2), range(1, 6), range(1, 6), range(2), range(6), range(11), range(1, 13)]
+
+
+def cascade(sleep_hours, academic_performance, bullied, has_close_friends, homesick_level,
+            mess_food_rating, sports_participation, social_activities, study_hours, screen_time):
+    # The if/elif cascade predict() used before the rule table, kept verbatim as the reference
+    if (sleep_hours <= 5 and screen_time >= 7) or (bullied and not has_close_friends) or (academic_performance == 0 and social_activities <= 2):
+        condition = 'Depression'
+    elif (homesick_level >= 4 and bullied) or (academic_performance == 0 and sleep_hours <= 6) or (screen_time >= 8 and social_activities <= 2):
+        condition = 'Anxiety'
+    elif (study_hours >= 7) or (sleep_hours <= 5 and academic_performance == 0) or (homesick_level >= 4 and study_hours >= 6):
+        condition = 'Stress'
+    elif (study_hours <= 2 and screen_time >= 8 and academic_performance == 0) or (social_activities >= 4 and academic_performance == 0):
+        condition = 'ADHD'
+    elif bullied and sleep_hours <= 5 and homesick_level >= 4:
+        condition = 'PTSD'
+    elif (study_hours >= 7 and social_activities <= 1) or (academic_performance == 2 and mess_food_rating <= 2 and study_hours >= 6):
+        condition = 'OCD'
+    elif (sleep_hours <= 4 or sleep_hours >= 9) and (social_activities >= 4 or sports_participation) and screen_time >= 8:
+        condition = 'Bipolar Disorder'
+    elif mess_food_rating <= 2 and sleep_hours <= 5 and homesick_level >= 4:
+        condition = 'Eating Disorder'
+    elif homesick_level >= 4 and academic_performance == 1 and 5 <= sleep_hours <= 7:
+        condition = 'Adjustment Disorder'
+    else:
+        condition = 'Normal'
+    return condition
+
+
+def test_rule_table_matches_cascade_over_full_domain():
+    rule_set = RuleSet()
+    for sleep_hours in DOMAIN[0]:
+        rows = [(sleep_hours,) + rest for rest in itertools.product(*DOMAIN[1:])]
+        expected = [cascade(*row) for row in rows]
+
+        assert rule_set.predict(np.array(rows, dtype=np.int8)) == expected
+        assert [rule_set.predict_one(row) for row in rows[::97]] == expected[::97]
+
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import threading
+
+import numpy as np
+
+from inference import RuleEngine, load_engine
+from shadow import ShadowScorer
+
+LABELS = ['Depression', 'Anxiety', 'Stress', 'ADHD', 'PTSD', 'OCD', 'Bipolar Disorder', 'Eating Disorder',
+          'Adjustment Disorder', 'Normal']
+
+
+def test_confusion_matrix_counts_primary_against_shadow():
+    rules = RuleEngine()
+    model = load_engine('model', ['Poor', 'Average', 'Good'])[0]
+    scorer = ShadowScorer(model, LABELS, workers=2)
+    rng = np.random.default_rng(0)
+    rows = [tuple(int(v) for v in row) for row in
+            np.column_stack([rng.integers(lo, hi, 500) for lo, hi in
+                             [(2, 13), (0, 3), (0, 2), (0, 2), (1, 6), (1, 6), (0, 2), (0, 6), (0, 11), (1, 13)]])]
+
+    for row in rows:
+        scorer.submit(row, rules.predict(row))
+    scorer.wait()
+    stats = scorer.stats()
+
+    expected = sum(rules.predict(row) == model.predict(row) for row in rows)
+    assert stats['scored'] == len(rows) and stats['dropped'] == 0
+    assert np.trace(np.array(stats['confusion'])) == expected
+    assert stats['agreement_rate'] == round(expected / len(rows), 6)
+    assert sum(item['count'] for item in stats['disagreements']) == len(rows) - expected
+
+
+def test_saturated_queue_drops_instead_of_blocking():
+    release = threading.Event()
+
+    class SlowEngine:
+        def predict_batch(self, X):
+            release.wait()
+            return ['Normal'] * len(X)
+
+    scorer = ShadowScorer(SlowEngine(), LABELS, workers=1, queue_size=4)
+    for _ in range(50):
+        scorer.submit((7, 1, 0, 1, 2, 3, 1, 5, 4, 3), 'Stress')
+    release.set()
+    scorer.wait()
+    stats = scorer.stats()
+
+    assert stats['dropped'] > 0
+    assert stats['scored'] + stats['dropped'] == 50
+    assert stats['disagreements'] == [{'primary': 'Stress', 'shadow': 'Normal', 'count': stats['scored']}]
+
+
+def test_asgi_predictions_are_shadow_scored():
+    import app as flask_app
+    import asgi
+
+    payload = {'sleep_hours': 4, 'academic_performance': 0, 'bullied': 1, 'homesick_level': 5, 'screen_time': 10}
+    saved = flask_app.shadow
+    flask_app.shadow = scorer = ShadowScorer(RuleEngine(), LABELS)
+
+    async def call():
+        async def receive():
+            return {'type': 'http.request', 'body': json.dumps(payload).encode(), 'more_body': False}
+
+        async def send(message):
+            pass
+
+        await asgi.app({'type': 'http', 'method': 'POST', 'path': '/api/predict'}, receive, send)
+        await asgi.batcher.stop()
+
+    try:
+        asyncio.run(call())
+    finally:
+        flask_app.shadow = saved
+    scorer.wait()
+
+    assert scorer.stats()['scored'] == 1
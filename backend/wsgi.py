@@ -1,4 +1,11 @@
+import gc
+
 from app import app
 
+# With gunicorn --preload the app (and its inference backend) is imported once
+# in the master. Freezing the GC keeps collections in the workers from
+# touching, and so copying, the pages of objects created before the fork.
+gc.freeze()
+
 if __name__ == "__main__":
     app.run()
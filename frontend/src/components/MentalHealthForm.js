@@ -118,6 +118,14 @@ const MentalHealthForm = ({ setResult, setFormData: setParentFormData }) => {
       } catch (primaryError) {
         console.error('Error with primary API, trying backup:', primaryError);
 
+        // A 503 means the server is shedding load; wait as long as it asks
+        // before retrying instead of adding to the burst
+        if (primaryError.response && primaryError.response.status === 503) {
+          const retryAfter = parseInt(primaryError.response.headers['retry-after'], 10) || 1;
+          setLoadingMessage('Server is busy, retrying shortly...');
+          await new Promise((resolve) => setTimeout(resolve, Math.min(retryAfter, 10) * 1000));
+        }
+
         // If primary API fails, try backup API
         setLoadingMessage('Primary API failed, trying backup...');
         const response = await axios.post(`${BACKUP_API_URL}/api/predict`, formattedData, {
@@ -160,6 +168,8 @@ const MentalHealthForm = ({ setResult, setFormData: setParentFormData }) => {
         setError('Request timed out. Free tier servers can take up to 50-60 seconds to wake up. Please try again.');
       } else if (error.response && error.response.status === 0) {
         setError('CORS error: The server is not allowing cross-origin requests. Please try again later.');
+      } else if (error.response && error.response.status === 503) {
+        setError('The server is busy right now. Please try again in a few seconds.');
       } else if (error.response && error.response.status === 500) {
         setError('Server error: The backend server encountered an internal error. Please try again later.');
       } else {
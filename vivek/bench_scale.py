@@ -0,0 +1,128 @@
+"""Training and scoring benchmarks on synthetic datasets of increasing size.
+
+For each --rows size, a dataset is generated once with generate_dataset.py
+(fixed seed, cached under .cache/datasets) and then used to time:
+
+    train          RandomForestClassifier with train_model.py's settings on
+                   an 80/20 split: fit time and test accuracy
+    score_compiled CompiledForest (the API's 'model' backend) over all rows
+    score_batch    `student_assessment.py --input` on the CSV form of the
+                   dataset, end to end
+
+    python bench_scale.py --rows 100000 1000000 --output scale_report.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from generate_dataset import CACHE_DIR, FEATURES, HERE, DatasetModel, generate, load_columnar
+
+sys.path.insert(0, os.path.join(HERE, '..', 'backend'))
+
+from forest import CompiledForest  # noqa: E402
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def dataset(model, rows, seed, fmt):
+    """Path of the cached synthetic dataset, generating it on first use."""
+    path = os.path.join(CACHE_DIR, 'datasets', f'synthetic-{rows}-{seed}' + ('.csv' if fmt == 'csv' else ''))
+    if not os.path.exists(path if fmt == 'csv' else os.path.join(path, 'meta.json')):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        generate(model, rows, path, fmt, seed, progress=False)
+    return path
+
+
+def bench_train(X, y, n_jobs):
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+
+    X_train, X_test, y_train, y_test = train_test_split(np.asarray(X), np.asarray(y), test_size=0.2, random_state=42)
+    clf = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
+    start = time.perf_counter()
+    clf.fit(pd.DataFrame(X_train, columns=FEATURES), y_train)
+    fit_seconds = time.perf_counter() - start
+    return {
+        'fit_seconds': round(fit_seconds, 3),
+        'rows_per_second': round(len(X_train) / fit_seconds, 1),
+        'test_accuracy': round(float((clf.predict(pd.DataFrame(X_test, columns=FEATURES)) == y_test).mean()), 4),
+        'total_nodes': int(sum(estimator.tree_.node_count for estimator in clf.estimators_)),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def bench_compiled(X):
+    forest = CompiledForest.load()
+    block = 100000
+    start = time.perf_counter()
+    for i in range(0, len(X), block):
+        forest.predict_proba(X[i:i + block])
+    seconds = time.perf_counter() - start
+    return {'seconds': round(seconds, 3), 'rows_per_second': round(len(X) / seconds, 1), 'peak_rss_mb': peak_rss_mb()}
+
+
+def bench_batch_cli(csv_path, workers):
+    output = csv_path + '.predictions'
+    command = [sys.executable, '-W', 'ignore', os.path.join(HERE, 'student_assessment.py'), '--input', csv_path, '--output', output]
+    if workers:
+        command += ['--workers', str(workers)]
+    stdout = subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            universal_newlines=True).stdout
+    os.remove(output)
+    os.remove(output + '.progress')
+    report = json.loads(stdout[stdout.index('{'):])
+    return {key: report[key] for key in ('seconds', 'rows_per_second', 'parent_peak_rss_mb', 'worker_peak_rss_mb',
+                                         'workers')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark training and scoring on synthetic datasets.")
+    parser.add_argument('--rows', nargs='+', type=int, default=[100000, 1000000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="training workers (default: all cores)")
+    parser.add_argument('--workers', type=int, help="batch scoring processes (default: all cores)")
+    parser.add_argument('--train-max-rows', type=int, default=1000000,
+                        help="skip the training benchmark above this size (default 1,000,000)")
+    parser.add_argument('--skip', nargs='*', default=[], choices=['train', 'score_compiled', 'score_batch'])
+    parser.add_argument('--output', help="write the JSON report here as well as to stdout")
+    args = parser.parse_args()
+
+    model = DatasetModel()
+    results = {}
+    for rows in args.rows:
+        start = time.perf_counter()
+        path = dataset(model, rows, args.seed, 'columnar')
+        X, y, meta = load_columnar(path)
+        result = {'generate_seconds': round(time.perf_counter() - start, 3), 'prior_tvd': meta['prior_tvd'],
+                  'max_marginal_tvd': meta['max_marginal_tvd']}
+        if 'train' not in args.skip and rows <= args.train_max_rows:
+            result['train'] = bench_train(X, y, args.n_jobs)
+        if 'score_compiled' not in args.skip:
+            result['score_compiled'] = bench_compiled(X)
+        if 'score_batch' not in args.skip:
+            result['score_batch'] = bench_batch_cli(dataset(model, rows, args.seed, 'csv'), args.workers)
+        results[str(rows)] = result
+        print(f"{rows:,} rows done", file=sys.stderr)
+
+    report = {'seed': args.seed, 'cpu_count': os.cpu_count(), 'results': results}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == "__main__":
+    main()
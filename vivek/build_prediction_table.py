@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Input domain, in the model's feature order. These are the ranges enforced by
+# student_assessment.py; every value seen in the training CSV lies inside them.
+FEATURE_RANGES = [
+    ('sleep_hours', 2, 12),
+    ('academic_performance', 0, 2),
+    ('bullied', 0, 1),
+    ('has_close_friends', 0, 1),
+    ('homesick_level', 1, 5),
+    ('mess_food_rating', 1, 5),
+    ('sports_participation', 0, 1),
+    ('social_activities', 0, 5),
+    ('study_hours', 0, 10),
+    ('screen_time', 1, 12),
+]
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'model')
+
+
+def build_table(clf, with_proba=False):
+    """Run the forest over every point of the input grid, one sleep_hours slice at a time."""
+    names = [name for name, _, _ in FEATURE_RANGES]
+    mins = np.array([lo for _, lo, _ in FEATURE_RANGES])
+    shape = tuple(hi - lo + 1 for _, lo, hi in FEATURE_RANGES)
+
+    codes = np.empty(shape, dtype=np.uint8)
+    proba = np.empty(shape + (len(clf.classes_),), dtype=np.uint8) if with_proba else None
+
+    # Grid offsets for one slice of the leading axis, in C (mixed-radix) order
+    slice_offsets = np.indices(shape[1:]).reshape(len(shape) - 1, -1).T
+    for i in range(shape[0]):
+        grid = np.empty((slice_offsets.shape[0], len(shape)), dtype=np.int64)
+        grid[:, 0] = i
+        grid[:, 1:] = slice_offsets
+        grid += mins
+        X = pd.DataFrame(grid, columns=names)
+
+        p = clf.predict_proba(X)
+        codes[i] = p.argmax(axis=1).reshape(shape[1:])
+        if with_proba:
+            proba[i] = np.rint(p * 255).astype(np.uint8).reshape(shape[1:] + (p.shape[1],))
+        print(f"slice {i + 1}/{shape[0]} done")
+
+    return codes, proba
+
+
+def write_table(clf, le_academic, le_condition, output_dir=DEFAULT_OUTPUT_DIR, with_proba=False):
+    """Build the table for a fitted forest and write it with its metadata to output_dir."""
+    codes, proba = build_table(clf, with_proba=with_proba)
+
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, 'prediction_table.npy'), codes)
+    if proba is not None:
+        np.save(os.path.join(output_dir, 'prediction_proba.npy'), proba)
+
+    meta = {
+        'features': [{'name': name, 'min': lo, 'max': hi} for name, lo, hi in FEATURE_RANGES],
+        'academic_classes': list(le_academic.classes_),
+        'condition_classes': list(le_condition.inverse_transform(clf.classes_)),
+        'proba_scale': 255 if proba is not None else None,
+    }
+    with open(os.path.join(output_dir, 'prediction_table.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    print(f"Wrote {codes.size} predictions to {output_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute model predictions over the full input domain.")
+    parser.add_argument('--model', default='mental_health_rf_model.pkl')
+    parser.add_argument('--academic-encoder', default='le_academic.pkl')
+    parser.add_argument('--condition-encoder', default='le_condition.pkl')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--with-proba', action='store_true',
+                        help="also write class probabilities quantized to uint8 (about 47 MB)")
+    args = parser.parse_args()
+
+    clf = joblib.load(args.model)
+    clf.n_jobs = -1
+    le_academic = joblib.load(args.academic_encoder)
+    le_condition = joblib.load(args.condition_encoder)
+
+    write_table(clf, le_academic, le_condition, args.output_dir, with_proba=args.with_proba)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import sys
+
+import joblib
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'backend'))
+
+from bundle import write_bundle  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(HERE, '..', 'backend', 'model', 'mental_health_model.bundle')
+RECOMMENDATIONS = os.path.join(HERE, 'recommendations.json')
+
+
+def flatten_forest(clf):
+    """Concatenate the trees of a fitted RandomForestClassifier into flat node arrays.
+
+    Node indices are global across the forest. Leaves point to themselves on
+    both sides, so a fixed number of descent steps always ends on a leaf.
+    Leaf values are the per-tree class probabilities, normalized exactly as
+    DecisionTreeClassifier.predict_proba does. Returns the arrays and the
+    deepest tree's depth.
+    """
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in clf.estimators_:
+        tree = estimator.tree_
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+        rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+
+        proba = tree.value[:, 0, :clf.n_classes_].copy()
+        normalizer = proba.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        proba /= normalizer
+        values.append(proba)
+
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    return {
+        'feature': np.concatenate(features).astype(np.int32),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'left': np.concatenate(lefts).astype(np.int32),
+        'right': np.concatenate(rights).astype(np.int32),
+        'value': np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+        'root': np.array(roots, dtype=np.int32),
+    }, max_depth
+
+
+def export_bundle(clf, le_academic, le_condition, output=DEFAULT_OUTPUT, recommendations_path=RECOMMENDATIONS):
+    """Write a fitted forest and its encoders as a model bundle; returns the content hash."""
+    import sklearn
+
+    arrays, max_depth = flatten_forest(clf)
+    with open(recommendations_path, encoding='utf-8') as f:
+        recommendations = json.load(f)
+    meta = {
+        'feature_names': [str(name) for name in clf.feature_names_in_],
+        'academic_classes': [str(name) for name in le_academic.classes_],
+        'condition_classes': [str(name) for name in le_condition.inverse_transform(clf.classes_)],
+        'recommendations': recommendations,
+        'max_depth': int(max_depth),
+        'n_trees': len(arrays['root']),
+        'sklearn_version': sklearn.__version__,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    content_hash = write_bundle(output, arrays, meta)
+    print(f"Exported {meta['n_trees']} trees, {len(arrays['feature'])} nodes to {output} ({content_hash[:12]})")
+    return content_hash
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the random forest and its encoders as a model bundle for serving.")
+    parser.add_argument('--model', default='mental_health_rf_model.pkl')
+    parser.add_argument('--academic-encoder', default='le_academic.pkl')
+    parser.add_argument('--condition-encoder', default='le_condition.pkl')
+    parser.add_argument('--recommendations', default=RECOMMENDATIONS)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    export_bundle(joblib.load(args.model), joblib.load(args.academic_encoder), joblib.load(args.condition_encoder),
+                  args.output, args.recommendations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Synthetic datasets for scale testing, learned from the training CSV.
+
+The generator fits the condition prior, each condition's rows and the
+per-feature value distribution within each condition. A row is generated
+by drawing a condition, copying a random source row with that condition
+(which keeps the joint distribution of its features) and then redrawing
+each feature with probability --mutation from that condition's marginal,
+so large datasets are not just copies of the 2,500 source rows.
+--method marginal draws every feature independently from the
+condition's marginals instead.
+
+Rows are generated in fixed blocks of BLOCK_ROWS, each seeded from
+(--seed, block index), so a given seed always produces the same rows and
+memory stays flat from 100k to 100M rows. Output is streamed to either
+
+    csv       the training CSV's columns and spelling
+    columnar  a directory of one int8 .npy file per column in the model's
+              encoding, plus meta.json, read back with load_columnar()
+
+    python generate_dataset.py --rows 1000000 --format columnar --output .cache/datasets/synthetic-1m
+    python generate_dataset.py --rows 100000000 --format csv --output synthetic-100m.csv
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCE_CSV = os.path.join(HERE, 'boarding_school_mental_health_2500.csv')
+CACHE_DIR = os.path.join(HERE, '.cache')
+
+FEATURES = ['sleep_hours', 'academic_performance', 'bullied', 'has_close_friends', 'homesick_level',
+            'mess_food_rating', 'sports_participation', 'social_activities', 'study_hours', 'screen_time']
+TARGET = 'mental_health_condition'
+BOOL_COLUMNS = ('bullied', 'has_close_friends', 'sports_participation')
+BLOCK_ROWS = 1 << 20
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DatasetModel:
+    """Condition prior, per-condition source rows and per-condition feature marginals.
+
+    Features use the model encoding (academic_performance and the condition
+    as LabelEncoder's alphabetical codes, booleans as 0/1).
+    """
+
+    def __init__(self, csv_path=SOURCE_CSV):
+        import pandas as pd
+
+        df = pd.read_csv(csv_path)
+        self.source = csv_path
+        self.source_hash = file_hash(csv_path)
+        self.academic_classes = sorted(df['academic_performance'].unique().tolist())
+        self.condition_classes = sorted(df[TARGET].unique().tolist())
+
+        df['academic_performance'] = df['academic_performance'].map(self.academic_classes.index)
+        for column in BOOL_COLUMNS:
+            df[column] = df[column].astype(int)
+        y = df[TARGET].map(self.condition_classes.index).to_numpy()
+        X = df[FEATURES].to_numpy(dtype=np.int8)
+
+        # Source rows grouped by condition, for drawing donors by offset
+        order = np.argsort(y, kind='stable')
+        self.rows = X[order]
+        self.class_counts = np.bincount(y, minlength=len(self.condition_classes))
+        self.class_starts = np.concatenate([[0], np.cumsum(self.class_counts)[:-1]])
+        self.prior = self.class_counts / self.class_counts.sum()
+
+        # marginals[j][c, v]: P(feature j == v | condition c), for v in 0..max
+        self.n_values = [int(X[:, j].max()) + 1 for j in range(len(FEATURES))]
+        self.marginals = []
+        for j, n_values in enumerate(self.n_values):
+            counts = np.zeros((len(self.condition_classes), n_values))
+            np.add.at(counts, (y, X[:, j]), 1)
+            self.marginals.append(counts / counts.sum(axis=1, keepdims=True))
+        self._cumulative = [np.cumsum(marginal, axis=1) for marginal in self.marginals]
+
+    def _draw_marginal(self, j, y, rng):
+        # Inverse-CDF draw of feature j for each row's condition
+        u = rng.random(len(y))
+        cumulative = self._cumulative[j].take(y, axis=0)
+        return np.minimum((u[:, np.newaxis] > cumulative).sum(axis=1), self.n_values[j] - 1)
+
+    def sample(self, n, rng, method='resample', mutation=0.1):
+        """n rows: (X int8 (n, 10), y int8 (n,))."""
+        y = np.searchsorted(np.cumsum(self.prior), rng.random(n), side='right')
+        y = np.minimum(y, len(self.prior) - 1)
+        if method == 'resample':
+            donors = self.class_starts.take(y) + (rng.random(n) * self.class_counts.take(y)).astype(np.int64)
+            X = self.rows.take(donors, axis=0)
+            redraw = rng.random((n, len(FEATURES))) < mutation
+        else:
+            X = np.empty((n, len(FEATURES)), dtype=np.int8)
+            redraw = np.ones((n, len(FEATURES)), dtype=bool)
+        for j in range(len(FEATURES)):
+            rows = np.flatnonzero(redraw[:, j])
+            if len(rows):
+                X[rows, j] = self._draw_marginal(j, y.take(rows), rng)
+        return X, y.astype(np.int8)
+
+
+def generate_blocks(model, rows, seed, method='resample', mutation=0.1):
+    """Yield (X, y) blocks totalling `rows`; block i depends only on (seed, i)."""
+    for index, start in enumerate(range(0, rows, BLOCK_ROWS)):
+        rng = np.random.default_rng([seed, index])
+        yield model.sample(min(BLOCK_ROWS, rows - start), rng, method, mutation)
+
+
+class CsvWriter:
+    def __init__(self, path, model):
+        self.f = open(path, 'w', newline='')
+        self.f.write(','.join(FEATURES + [TARGET]) + '\n')
+        self.academic = np.array(model.academic_classes, dtype=object)
+        self.conditions = np.array(model.condition_classes, dtype=object)
+        self.booleans = np.array(['False', 'True'], dtype=object)
+
+    def write(self, X, y):
+        import pandas as pd
+
+        columns = {}
+        for j, name in enumerate(FEATURES):
+            if name == 'academic_performance':
+                columns[name] = self.academic.take(X[:, j])
+            elif name in BOOL_COLUMNS:
+                columns[name] = self.booleans.take(X[:, j])
+            else:
+                columns[name] = X[:, j]
+        columns[TARGET] = self.conditions.take(y)
+        pd.DataFrame(columns).to_csv(self.f, header=False, index=False)
+
+    def close(self, meta):
+        self.f.close()
+
+
+class ColumnarWriter:
+    """One int8 .npy per column, preallocated and filled block by block through a memory map."""
+
+    def __init__(self, path, model, rows):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.offset = 0
+        self.columns = {name: np.lib.format.open_memmap(os.path.join(path, f'{name}.npy'), mode='w+',
+                                                        dtype=np.int8, shape=(rows,))
+                        for name in FEATURES + [TARGET]}
+
+    def write(self, X, y):
+        end = self.offset + len(y)
+        for j, name in enumerate(FEATURES):
+            self.columns[name][self.offset:end] = X[:, j]
+        self.columns[TARGET][self.offset:end] = y
+        self.offset = end
+
+    def close(self, meta):
+        for column in self.columns.values():
+            column.flush()
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+
+def load_columnar(path, mmap_mode='r'):
+    """(X int8 (n, 10), y int8 (n,), meta) from a columnar dataset directory.
+
+    X is assembled from the memory-mapped columns; use the `columns` of the
+    returned meta with np.load(..., mmap_mode='r') to read one column at a time.
+    """
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    X = np.column_stack([np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode) for name in FEATURES])
+    y = np.load(os.path.join(path, f'{TARGET}.npy'), mmap_mode=mmap_mode)
+    return X, y, meta
+
+
+def total_variation(counts, expected):
+    """Largest total variation distance between observed per-condition distributions and expected ones."""
+    observed = counts / np.maximum(counts.sum(axis=-1, keepdims=True), 1)
+    return float(np.abs(observed - expected).sum(axis=-1).max() / 2)
+
+
+def generate(model, rows, output, fmt, seed=0, method='resample', mutation=0.1, progress=True):
+    """Stream `rows` generated rows to output; returns the dataset's meta (including similarity figures)."""
+    writer = ColumnarWriter(output, model, rows) if fmt == 'columnar' else CsvWriter(output, model)
+    class_counts = np.zeros(len(model.condition_classes), dtype=np.int64)
+    feature_counts = [np.zeros_like(marginal, dtype=np.int64) for marginal in model.marginals]
+
+    start = time.perf_counter()
+    done = 0
+    for X, y in generate_blocks(model, rows, seed, method, mutation):
+        writer.write(X, y)
+        class_counts += np.bincount(y, minlength=len(class_counts))
+        for j, counts in enumerate(feature_counts):
+            n_values = counts.shape[1]
+            counts += np.bincount(y.astype(np.int64) * n_values + X[:, j], minlength=counts.size).reshape(counts.shape)
+        done += len(y)
+        if progress:
+            print(f"{done:,} rows, {done / (time.perf_counter() - start):,.0f} rows/s")
+    seconds = time.perf_counter() - start
+
+    meta = {
+        'rows': rows,
+        'seed': seed,
+        'method': method,
+        'mutation': mutation if method == 'resample' else None,
+        'source': os.path.basename(model.source),
+        'source_sha256': model.source_hash,
+        'columns': FEATURES + [TARGET],
+        'academic_classes': model.academic_classes,
+        'condition_classes': model.condition_classes,
+        'seconds': round(seconds, 3),
+        # Distance from the source: condition prior, and the worst feature/condition marginal
+        'prior_tvd': total_variation(class_counts, model.prior),
+        'max_marginal_tvd': max(total_variation(counts, marginal)
+                                for counts, marginal in zip(feature_counts, model.marginals)),
+    }
+    writer.close(meta)
+    return meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset resembling the training CSV.")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--output', required=True, help="CSV file, or directory for --format columnar")
+    parser.add_argument('--format', choices=['csv', 'columnar'], default='csv')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--method', choices=['resample', 'marginal'], default='resample')
+    parser.add_argument('--mutation', type=float, default=0.1,
+                        help="probability each feature of a resampled row is redrawn (default 0.1)")
+    parser.add_argument('--source', default=SOURCE_CSV)
+    args = parser.parse_args()
+
+    model = DatasetModel(args.source)
+    meta = generate(model, args.rows, args.output, args.format, args.seed, args.method, args.mutation)
+    print(json.dumps({key: meta[key] for key in ('rows', 'seconds', 'prior_tvd', 'max_marginal_tvd')}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,63 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import joblib
-import pandas as pd
+import os
+import queue
+import sys
+import threading
+import time
 from PIL import Image, ImageTk
 import random
 import math
 from datetime import datetime
 
-# Load model and encoders
-clf = joblib.load('mental_health_rf_model.pkl')
-le_academic = joblib.load('le_academic.pkl')
-le_condition = joblib.load('le_condition.pkl')
-
-recommendations = {
-    'Depression': "Spend time outside and do light exercise daily, keep a regular routine, and talk with supportive friends or family. Try to do small enjoyable activities even if your mood is low.",
-    'Anxiety': "Practice slow deep breathing, use grounding techniques like focusing on your senses, and limit caffeine. Keep a journal to track worries and notice what helps you feel calmer.",
-    'Stress': "Take short breaks to relax, organize your space, and try simple mindfulness or stretching exercises. Connect with others and do something fun each day.",
-    'ADHD': "Use reminders and lists to stay organized, break tasks into small steps, and keep a regular routine. Include daily physical activity to help with focus.",
-    'PTSD': "Practice grounding by focusing on your breath or surroundings, use creative outlets like drawing or writing, and spend time with people or pets who make you feel safe.",
-    'OCD': "Set aside a short time each day for worries, practice noticing thoughts without acting on them, and keep healthy daily habits like sleep and exercise.",
-    'Bipolar Disorder': "Stick to a regular sleep and meal schedule, track your moods, and practice gentle exercise. Reach out to trusted people if your mood changes.",
-    'Eating Disorder': "Eat regular meals and snacks, avoid labeling foods as good or bad, and practice self-kindness. Do activities you enjoy that don’t focus on food or appearance.",
-    'Adjustment Disorder': "Talk to someone you trust about changes in your life, take small positive steps each day, and write down things you’re grateful for. Give yourself time to adjust.",
-    'Normal': "Keep up healthy habits, stay connected with friends and family, and make time for activities you enjoy. Check in with your feelings and seek support if you need it."
-}
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'backend'))
+
+from forest import BUNDLE_NAME, CompiledForest
+
+BUNDLE_PATH = os.path.join(HERE, '..', 'backend', 'model', BUNDLE_NAME)
+FRAME_MS = 50
+# How often the Tk loop checks for results from the inference worker
+POLL_MS = 20
+# GUI_FRAME_OVERLAY=1 shows per-frame animation cost and frame interval
+FRAME_OVERLAY = os.environ.get('GUI_FRAME_OVERLAY') == '1'
+
+class InferenceWorker:
+    """Loads the forest and runs predictions on a background thread.
+
+    Tk may only be used from the main thread, so results go back through
+    a queue that the app drains with root.after: ('ready', (academic
+    classes, recommendations)), ('result', condition) or ('error', message).
+    """
+
+    def __init__(self, bundle_path=BUNDLE_PATH):
+        self.bundle_path = bundle_path
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        threading.Thread(target=self._run, name='inference', daemon=True).start()
+
+    def submit(self, answers):
+        # answers: the ten features in model order, academic performance as its label
+        self.requests.put(answers)
+
+    def _run(self):
+        try:
+            # Forest and encoders from the model bundle written by export_forest.py
+            forest = CompiledForest.load(self.bundle_path)
+        except Exception as e:
+            self.results.put(('error', f"Could not load the model.\nError: {e}"))
+            return
+        # Recommendation text comes from the bundle, like the API's
+        self.results.put(('ready', (forest.academic_classes, forest.bundle.recommendations)))
+        while True:
+            answers = self.requests.get()
+            try:
+                row = list(answers)
+                row[1] = forest.academic_classes.index(row[1])
+                self.results.put(('result', forest.predict_one(row)))
+            except Exception as e:
+                self.results.put(('error', f"Please check your inputs.\nError: {e}"))
+
 
 class Particle:
     def __init__(self, canvas, width, height):
@@ -49,7 +83,7 @@ class Particle:
         return random.choice(colors)
 
     def update(self):
-        # Update position
+        # Update position; returns the (dx, dy) to move the oval by
         self.x += self.vx
         self.y += self.vy
 
@@ -59,8 +93,7 @@ class Particle:
         if self.y <= 0 or self.y >= self.height:
             self.vy *= -1
 
-        # Move the particle on canvas
-        self.canvas.move(self.id, self.vx, self.vy)
+        return self.vx, self.vy
 
 class MentalHealthApp:
     def __init__(self, root):
@@ -81,6 +114,14 @@ class MentalHealthApp:
         for _ in range(50):  # Number of particles
             self.particles.append(Particle(self.canvas, 900, 700))
 
+        # Frame timing for the optional overlay
+        self.frame_costs = []
+        self.frame_intervals = []
+        self.last_frame = None
+        self.overlay = None
+        if FRAME_OVERLAY:
+            self.overlay = self.canvas.create_text(8, 8, anchor='nw', fill='#f2e9e4', font=('Courier', 10), text='')
+
         # Start animation
         self.animate_particles()
 
@@ -129,10 +170,11 @@ class MentalHealthApp:
 
             if widget == ttk.Combobox:
                 if "Academic" in q:
-                    entry = ttk.Combobox(self.main_frame, values=list(le_academic.classes_), state='readonly')
+                    # Filled in with the model's classes once it has loaded
+                    entry = ttk.Combobox(self.main_frame, values=[], state='readonly')
                 else:
                     entry = ttk.Combobox(self.main_frame, values=["Yes", "No"], state='readonly')
-                entry.current(0)
+                    entry.current(0)
             else:
                 entry = widget(self.main_frame, bg='white')
             entry.grid(row=row, column=1, padx=10, pady=4, sticky="ew")
@@ -140,7 +182,7 @@ class MentalHealthApp:
             row += 1
 
         # Create result labels with semi-transparent background
-        self.result_label = tk.Label(self.main_frame, text="", font=('Arial', 16, 'bold'), fg='#007f5f', bg='#fffbe6', wraplength=600)
+        self.result_label = tk.Label(self.main_frame, text="Loading model...", font=('Arial', 16, 'bold'), fg='#007f5f', bg='#fffbe6', wraplength=600)
         self.result_label.grid(row=row, column=0, columnspan=2, pady=10)
 
         self.recommend_label = tk.Label(self.main_frame, text="", font=('Arial', 12), bg='#fffbe6', fg='#333', wraplength=600, justify='left')
@@ -151,12 +193,17 @@ class MentalHealthApp:
         btn_frame.grid(row=row+2, column=0, columnspan=2, pady=10)
 
         # Create a more visible button
-        submit_btn = tk.Button(btn_frame, text="Predict", font=('Arial', 12, 'bold'),
-                              bg='#22223b', fg='white',
-                              activebackground='#4a4e69', activeforeground='white',
-                              relief=tk.RAISED, bd=2, padx=20, pady=5,
-                              command=self.predict)
-        submit_btn.pack(pady=5)
+        self.submit_btn = tk.Button(btn_frame, text="Predict", font=('Arial', 12, 'bold'),
+                                    bg='#22223b', fg='white',
+                                    activebackground='#4a4e69', activeforeground='white',
+                                    relief=tk.RAISED, bd=2, padx=20, pady=5,
+                                    command=self.predict, state=tk.DISABLED)
+        self.submit_btn.pack(pady=5)
+
+        # Model loading and inference run off the Tk thread
+        self.recommendations = {}
+        self.worker = InferenceWorker()
+        self.poll_worker()
 
     def predict(self):
         try:
@@ -171,30 +218,38 @@ class MentalHealthApp:
             study_hours = int(self.entries['study_hours'].get())
             screen_time = int(self.entries['screen_time'].get())
 
-            academic_performance_enc = le_academic.transform([academic_performance])[0]
-
-            input_dict = {
-                'sleep_hours': [sleep_hours],
-                'academic_performance': [academic_performance_enc],
-                'bullied': [bullied],
-                'has_close_friends': [has_close_friends],
-                'homesick_level': [homesick_level],
-                'mess_food_rating': [mess_food_rating],
-                'sports_participation': [sports_participation],
-                'social_activities': [social_activities],
-                'study_hours': [study_hours],
-                'screen_time': [screen_time]
-            }
-            input_df = pd.DataFrame(input_dict)
-
-            pred_idx = clf.predict(input_df)[0]
-            condition = le_condition.inverse_transform([pred_idx])[0]
-
-            self.result_label.config(text=f"Predicted Condition: {condition}")
-            self.recommend_label.config(text=f"Recommendation:\n{recommendations.get(condition, '')}")
-
+            row = [sleep_hours, academic_performance, bullied, has_close_friends, homesick_level,
+                   mess_food_rating, sports_participation, social_activities, study_hours, screen_time]
         except Exception as e:
             messagebox.showerror("Input Error", f"Please check your inputs.\nError: {e}")
+            return
+
+        # The answer arrives in poll_worker; one prediction at a time
+        self.submit_btn.config(state=tk.DISABLED)
+        self.result_label.config(text="Predicting...")
+        self.worker.submit(row)
+
+    def poll_worker(self):
+        try:
+            while True:
+                kind, value = self.worker.results.get_nowait()
+                if kind == 'ready':
+                    academic_classes, self.recommendations = value
+                    academic = self.entries['academic_performance']
+                    academic.config(values=academic_classes)
+                    academic.current(0)
+                    self.result_label.config(text="")
+                elif kind == 'result':
+                    self.result_label.config(text=f"Predicted Condition: {value}")
+                    self.recommend_label.config(text=f"Recommendation:\n{self.recommendations.get(value, '')}")
+                else:
+                    self.result_label.config(text="")
+                    messagebox.showerror("Error", value)
+                if self.entries['academic_performance'].cget('values'):
+                    self.submit_btn.config(state=tk.NORMAL)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self.poll_worker)
 
     def create_gradient_background(self):
         # Create a gradient background from dark to light
@@ -207,12 +262,41 @@ class MentalHealthApp:
             self.canvas.create_line(0, y, 900, y, fill=color, width=1)
 
     def animate_particles(self):
-        # Update all particles
+        start = time.perf_counter()
+        # Update all particles and move them with one Tcl evaluation rather than a call per particle
+        canvas = str(self.canvas)
+        script = []
         for particle in self.particles:
-            particle.update()
+            dx, dy = particle.update()
+            script.append(f'{canvas} move {particle.id} {dx!r} {dy!r}')
+        if self.overlay is not None:
+            self.record_frame(start)
+            if len(self.frame_costs) >= 1000 // FRAME_MS:
+                script.append(f'{canvas} itemconfigure {self.overlay} -text {{{self.frame_summary()}}}')
+                script.append(f'{canvas} raise {self.overlay}')
+        self.root.tk.eval('\n'.join(script))
+        if self.overlay is not None:
+            self.frame_costs[-1] = time.perf_counter() - start
 
         # Schedule the next animation frame
-        self.root.after(50, self.animate_particles)
+        self.root.after(FRAME_MS, self.animate_particles)
+
+    def record_frame(self, start):
+        if self.last_frame is not None:
+            self.frame_intervals.append(start - self.last_frame)
+        self.last_frame = start
+        self.frame_costs.append(0.0)
+
+    def frame_summary(self):
+        # Stats over the frames since the last summary (about one second), then start over
+        costs = self.frame_costs[:-1] or [0.0]
+        intervals = self.frame_intervals or [FRAME_MS / 1000]
+        text = (f"frame {1000 * sum(costs) / len(costs):.2f} ms avg, {1000 * max(costs):.2f} ms max | "
+                f"interval {1000 * sum(intervals) / len(intervals):.1f} ms avg, {1000 * max(intervals):.1f} ms max "
+                f"(target {FRAME_MS} ms)")
+        self.frame_costs = self.frame_costs[-1:]
+        self.frame_intervals = []
+        return text
 
 if __name__ == "__main__":
     root = tk.Tk()
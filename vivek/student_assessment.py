@@ -1,11 +1,23 @@
-import joblib
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
 import numpy as np
-import pandas as pd
 
-# Load model and encoders
-clf = joblib.load('mental_health_rf_model.pkl')
-le_academic = joblib.load('le_academic.pkl')
-le_condition = joblib.load('le_condition.pkl')
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'backend'))
+
+from forest import BUNDLE_NAME, CompiledForest
+
+# Load the model bundle (forest, encoders and recommendation text); written by export_forest.py
+forest = CompiledForest.load(os.path.join(HERE, '..', 'backend', 'model', BUNDLE_NAME))
+bundle = forest.bundle
 
 def ask_bool(prompt):
     while True:
@@ -25,7 +37,7 @@ def ask_int(prompt, minv, maxv):
             pass
 
 def ask_academic():
-    options = list(le_academic.classes_)
+    options = forest.academic_classes
     print("Academic performance options:", ', '.join(f"{i}: {v}" for i, v in enumerate(options)))
     while True:
         idx = input("Enter the number corresponding to your academic performance: ")
@@ -33,19 +45,7 @@ def ask_academic():
             return int(idx)
 
 def get_recommendation(condition):
-    recs = {
-        'Depression': "Engage in regular exercise, maintain social connections, and seek support from friends/family. If symptoms persist, consult a mental health professional.",
-        'Anxiety': "Practice relaxation techniques (deep breathing, meditation). Maintain a routine, avoid excessive caffeine, and talk to someone you trust. Seek professional help if anxiety interferes with daily life.",
-        'Stress': "Try mindfulness, yoga, or physical activity. Break tasks into manageable steps and take regular breaks. Reach out to support groups or counselors if needed.",
-        'ADD': "Establish routines, use reminders, and break tasks into smaller steps. Consider professional evaluation for therapy or medication if attention issues are persistent.",
-        'PTSD': "Seek trauma-informed counseling. Practice grounding techniques and connect with support groups. Professional therapy (CBT, EMDR) is highly recommended.",
-        'OCD': "Cognitive-behavioral therapy (CBT) is effective. Practice exposure and response prevention with professional guidance. Medication may help in some cases.",
-        'Bipolar Disorder': "Consult a psychiatrist for mood stabilizers and therapy. Maintain regular sleep and activity patterns. Avoid substance misuse and seek ongoing support.",
-        'Eating Disorder': "Seek help from a nutritionist and mental health professional. Join support groups and involve family in recovery. Early intervention is key.",
-        'Adjustment Disorder': "Talk to a counselor about recent changes. Practice stress management and self-care. Most cases resolve with time and support.",
-        'Normal': "Continue healthy habits: regular sleep, balanced diet, exercise, and social engagement. Monitor your well-being and seek help if you notice changes."
-    }
-    return recs.get(condition, "Consult a mental health professional for personalized advice.")
+    return bundle.recommendations.get(condition, "Consult a mental health professional for personalized advice.")
 
 def main():
     print("Welcome to the Student Mental Health Assessment\nPlease answer the following questions:")
@@ -61,26 +61,252 @@ def main():
     study_hours = ask_int("How many hours do you study per day?", 0, 10)
     screen_time = ask_int("How many hours do you spend on screens per day?", 1, 12)
 
-    input_dict = {
-        'sleep_hours': [sleep_hours],
-        'academic_performance': [academic_performance],
-        'bullied': [bullied],
-        'has_close_friends': [has_close_friends],
-        'homesick_level': [homesick_level],
-        'mess_food_rating': [mess_food_rating],
-        'sports_participation': [sports_participation],
-        'social_activities': [social_activities],
-        'study_hours': [study_hours],
-        'screen_time': [screen_time]
-    }
-    features_df = pd.DataFrame(input_dict)
-    pred_idx = clf.predict(features_df)[0]
-
-    condition = le_condition.inverse_transform([pred_idx])[0]
+    row = [sleep_hours, academic_performance, bullied, has_close_friends, homesick_level,
+           mess_food_rating, sports_participation, social_activities, study_hours, screen_time]
+    condition = forest.predict_one(row)
 
     print(f"\nPredicted Mental Health Condition: {condition}")
     print("\nExpert Recommendation:")
     print(get_recommendation(condition))
 
+# Batch mode: score an exported survey CSV (same columns as the training
+# data, any extra columns ignored) without prompting. The parent only splits
+# the file into byte ranges of chunk_size lines; a process pool reads each
+# range with compact dtypes, encodes, scores and formats it, and the results
+# are written out in input order; at most two chunks per worker are in flight, so memory stays
+# flat however large the file is. Progress (rows done and the input byte
+# offset they end at) is checkpointed after every chunk so an interrupted
+# run continues with --resume, seeking straight to where it stopped.
+
+BOOL_COLUMNS = ['bullied', 'has_close_friends', 'sports_participation']
+TRUE_VALUES = {'true', '1', 'yes', 'y'}
+FALSE_VALUES = {'false', '0', 'no', 'n'}
+# Valid answers for the numeric questions, as asked in interactive mode
+NUMERIC_RANGES = {
+    'sleep_hours': (2, 12),
+    'homesick_level': (1, 5),
+    'mess_food_rating': (1, 5),
+    'social_activities': (0, 5),
+    'study_hours': (0, 10),
+    'screen_time': (1, 12),
+}
+ERROR_MESSAGES = ['', 'missing value', 'unknown academic_performance', 'invalid boolean', 'not a number',
+                  'not an integer', 'out of range']
+
+
+def read_dtypes():
+    # Every column is read as a category: a survey has few distinct answers, empty cells stay
+    # <NA>, and a bad value (300, 7.5, 'seven') becomes a per-row error in encode_chunk
+    # instead of wrapping around a narrow integer type or aborting the read
+    return {name: 'category' for name in forest.feature_names}
+
+
+def category_codes(column, mapping):
+    # Map a categorical column through {category: code} in one take over its categories; unmapped -> -1
+    lookup = np.array([mapping.get(str(value).strip().lower(), -1) for value in column.cat.categories] + [-1],
+                      dtype=np.int8)
+    return lookup.take(column.cat.codes.to_numpy())
+
+
+def encode_chunk(df):
+    """Model-encoded int8 rows and a per-row error code (index into ERROR_MESSAGES)."""
+    import pandas as pd
+
+    X = np.zeros((len(df), len(forest.feature_names)), dtype=np.int8)
+    errors = np.zeros(len(df), dtype=np.uint8)
+    errors[df.isna().any(axis=1).to_numpy()] = 1
+    academic = {name.lower(): code for code, name in enumerate(forest.academic_classes)}
+    booleans = dict([(value, 1) for value in TRUE_VALUES] + [(value, 0) for value in FALSE_VALUES])
+    for j, name in enumerate(forest.feature_names):
+        column = df[name]
+        if name == 'academic_performance':
+            codes = category_codes(column, academic)
+            errors[(codes < 0) & (errors == 0)] = 2
+        elif name in BOOL_COLUMNS:
+            codes = category_codes(column, booleans)
+            errors[(codes < 0) & (errors == 0)] = 3
+        else:
+            categories = pd.to_numeric(pd.Series(column.cat.categories.astype(str)), errors='coerce')
+            values = np.append(categories.to_numpy(dtype=np.float64), np.nan).take(column.cat.codes.to_numpy())
+            lo, hi = NUMERIC_RANGES[name]
+            present = ~column.isna().to_numpy()
+            for code, bad in ((4, present & np.isnan(values)),
+                              (5, ~np.isnan(values) & (values != np.floor(values))),
+                              (6, ~np.isnan(values) & ((values < lo) | (values > hi)))):
+                errors[bad & (errors == 0)] = code
+            codes = np.where(errors == 0, values, 0)
+        X[:, j] = np.maximum(codes, 0)
+    return X, errors
+
+
+def read_chunk(path, header, start, end):
+    """DataFrame for the survey CSV lines between two byte offsets, read with the file's header."""
+    import pandas as pd
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return pd.read_csv(io.BytesIO(header + data), dtype=read_dtypes(), usecols=forest.feature_names)
+
+
+def score_chunk(path, header, start, end, first_row):
+    """Read, encode and score one chunk in a worker process; returns its output CSV text and row/error counts."""
+    import pandas as pd
+
+    X, errors = encode_chunk(read_chunk(path, header, start, end))
+    codes = forest.predict_proba(X).argmax(axis=1)
+    conditions = np.array(forest.condition_classes, dtype=object).take(codes)
+    recommendations = np.array([get_recommendation(name) for name in forest.condition_classes], dtype=object).take(codes)
+    failed = errors > 0
+    conditions[failed] = ''
+    recommendations[failed] = ''
+    out = pd.DataFrame({
+        'row': np.arange(first_row, first_row + len(X)),
+        'condition': conditions,
+        'recommendation': recommendations,
+        'error': np.array(ERROR_MESSAGES, dtype=object).take(errors),
+    })
+    return out.to_csv(header=False, index=False), len(X), int(failed.sum())
+
+
+def split_chunks(path, offset, chunk_size):
+    """Yield (header, start, end, lines) byte ranges of chunk_size lines of a survey CSV.
+
+    The parent only finds line boundaries; parsing and encoding happen in
+    the workers (score_chunk). Chunks are split on lines, so records must
+    not contain quoted newlines (exported survey CSVs have one record per
+    line). Starting at a byte offset, rather than skipping rows, keeps
+    resuming flat in memory.
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        if offset:
+            f.seek(offset)
+        else:
+            offset = f.tell()
+        while True:
+            lines = 0
+            end = offset
+            for line in islice(f, chunk_size):
+                lines += 1
+                end += len(line)
+            if not lines:
+                return
+            yield header, offset, end, lines
+            offset = end
+
+
+def peak_rss_mb(children=False):
+    """Peak RSS in MB of this process, or with children=True of its largest finished child; None on Windows."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    return round(resource.getrusage(who).ru_maxrss / 1024, 1)
+
+
+def load_progress(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_progress(path, progress):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(progress, f)
+    os.replace(path + '.tmp', path)
+
+
+def run_batch(args):
+    stat = os.stat(args.input)
+    progress_path = args.output + '.progress'
+    progress = {'input': os.path.abspath(args.input), 'input_bytes': stat.st_size, 'input_mtime': stat.st_mtime,
+                'chunk_size': args.chunk_size, 'bundle': bundle.version, 'rows': 0, 'errors': 0, 'output_bytes': 0,
+                'input_offset': 0}
+    checkpoint = ('rows', 'errors', 'output_bytes', 'input_offset')
+    previous = load_progress(progress_path) if args.resume else None
+    if previous is not None:
+        same_run = {key: value for key, value in previous.items() if key not in checkpoint}
+        if 'input_offset' not in previous or same_run != {key: value for key, value in progress.items()
+                                                           if key not in checkpoint}:
+            sys.exit(f"{progress_path} belongs to a different input, chunk size or model; run without --resume")
+        progress = previous
+        print(f"Resuming after {progress['rows']} rows")
+
+    output = open(args.output, 'r+b' if previous is not None else 'wb')
+    # Drop anything written after the last checkpoint
+    output.truncate(progress['output_bytes'])
+    output.seek(progress['output_bytes'])
+    if previous is None:
+        output.write(b'row,condition,recommendation,error\n')
+
+    chunks = split_chunks(args.input, progress['input_offset'], args.chunk_size)
+    start = time.perf_counter()
+    rows_at_start = progress['rows']
+    next_row = progress['rows']
+    pending = deque()
+    max_pending = 2 * (args.workers or os.cpu_count())
+
+    def write_oldest():
+        future, input_offset = pending.popleft()
+        text, rows, errors = future.result()
+        output.write(text.encode())
+        output.flush()
+        os.fsync(output.fileno())
+        progress['rows'] += rows
+        progress['errors'] += errors
+        progress['output_bytes'] = output.tell()
+        progress['input_offset'] = input_offset
+        save_progress(progress_path, progress)
+        elapsed = time.perf_counter() - start
+        print(f"{progress['rows']} rows, {(progress['rows'] - rows_at_start) / elapsed:,.0f} rows/s", file=sys.stderr)
+
+    with output, ProcessPoolExecutor(args.workers) as pool:
+        for header, chunk_start, chunk_end, lines in chunks:
+            pending.append((pool.submit(score_chunk, args.input, header, chunk_start, chunk_end, next_row), chunk_end))
+            next_row += lines
+            if len(pending) >= max_pending:
+                write_oldest()
+        while pending:
+            write_oldest()
+
+    elapsed = time.perf_counter() - start
+    scored = progress['rows'] - rows_at_start
+    report = {
+        'input': args.input,
+        'output': args.output,
+        'rows': progress['rows'],
+        'errors': progress['errors'],
+        'scored_this_run': scored,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(scored / elapsed, 1) if elapsed else None,
+        'workers': args.workers or os.cpu_count(),
+        'chunk_size': args.chunk_size,
+        # The pool has shut down, so its workers count as finished children
+        'parent_peak_rss_mb': peak_rss_mb(),
+        'worker_peak_rss_mb': peak_rss_mb(children=True),
+        'model_version': bundle.version,
+    }
+    print(json.dumps(report, indent=2))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Student mental health assessment. With --input, scores a CSV in batch "
+                                                 "instead of asking questions.")
+    parser.add_argument('--input', help="survey CSV to score (training data columns)")
+    parser.add_argument('--output', default='predictions.csv', help="CSV of row, condition, recommendation, error")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="rows read and scored at a time")
+    parser.add_argument('--workers', type=int, help="scoring processes (default: all cores)")
+    parser.add_argument('--resume', action='store_true', help="continue an interrupted run from its progress file")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.input:
+        run_batch(args)
+    else:
+        main()
@@ -1,3 +1,6 @@
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
@@ -6,8 +9,18 @@ from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import classification_report, accuracy_score
 import joblib
 
+from build_prediction_table import write_table
+from export_forest import export_bundle
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'backend'))
+
+from drift import write_baseline  # noqa: E402
+
+CSV_PATH = 'boarding_school_mental_health_2500.csv'
+
 # Load your CSV
-df = pd.read_csv('boarding_school_mental_health_2500.csv')
+df = pd.read_csv(CSV_PATH)
 
 # Encode categorical features
 le_academic = LabelEncoder()
@@ -42,3 +55,10 @@ joblib.dump(clf, 'mental_health_rf_model.pkl')
 joblib.dump(le_academic, 'le_academic.pkl')
 joblib.dump(le_condition, 'le_condition.pkl')
 
+# Export the serving bundle (forest arrays, encoders, recommendation text), and
+# rebuild what the API derives from the model and its training data: the
+# 'table' backend's predictions and the drift baseline
+export_bundle(clf, le_academic, le_condition)
+clf.n_jobs = -1
+write_table(clf, le_academic, le_condition)
+write_baseline(CSV_PATH)
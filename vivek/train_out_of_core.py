@@ -0,0 +1,319 @@
+"""Random forest training for datasets larger than memory.
+
+train_model.py reads the whole CSV with pandas' default int64/object
+dtypes and fits 100 trees at once. Here the data is streamed instead and
+the forest grows a few trees at a time (warm_start), each batch fitted on
+one subset:
+
+    --sampling chunk      consecutive chunks of --chunk-size rows, read from
+                          a CSV with int8/bool/category dtypes or sliced from
+                          a columnar dataset (generate_dataset.py)
+    --sampling bootstrap  --subset-rows rows drawn at random from the whole
+                          dataset for every batch (columnar input only)
+
+A background thread reads or gathers the next subset while the current
+one is being fitted. Every --test-every'th row (by position in the file)
+is held out for evaluation; --in-memory fits train_model.py's way on the
+same split for comparison. --compare runs both on synthetic datasets of
+several sizes, each in its own process so peak RSS is measured separately:
+
+    python train_out_of_core.py --input big.csv --trees-per-chunk 10 --bundle
+    python train_out_of_core.py --compare 100000 1000000 --max-depth 16
+"""
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from generate_dataset import FEATURES, HERE, SOURCE_CSV, TARGET, DatasetModel
+
+BOOL_COLUMNS = ('bullied', 'has_close_friends', 'sports_participation')
+# Held-out test rows kept in memory at most
+MAX_TEST_ROWS = 200000
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def source_classes(csv_path=SOURCE_CSV):
+    """Academic and condition classes, in LabelEncoder order, from the training CSV."""
+    import pandas as pd
+
+    df = pd.read_csv(csv_path, usecols=['academic_performance', TARGET])
+    return sorted(df['academic_performance'].unique().tolist()), sorted(df[TARGET].unique().tolist())
+
+
+def is_columnar(path):
+    return os.path.isdir(path)
+
+
+def iter_csv_chunks(path, chunk_size, academic_classes, condition_classes):
+    """Yield (first_row, X int8, y int8) chunks of a training-format CSV."""
+    import pandas as pd
+
+    dtypes = {name: 'bool' if name in BOOL_COLUMNS else 'int8' for name in FEATURES}
+    dtypes['academic_performance'] = pd.CategoricalDtype(academic_classes)
+    dtypes[TARGET] = pd.CategoricalDtype(condition_classes)
+    first_row = 0
+    for df in pd.read_csv(path, dtype=dtypes, usecols=FEATURES + [TARGET], chunksize=chunk_size):
+        X = np.empty((len(df), len(FEATURES)), dtype=np.int8)
+        for j, name in enumerate(FEATURES):
+            column = df[name]
+            X[:, j] = column.cat.codes if name == 'academic_performance' else column.to_numpy()
+        y = df[TARGET].cat.codes.to_numpy()
+        if (X[:, FEATURES.index('academic_performance')] < 0).any() or (y < 0).any():
+            raise ValueError(f'Unknown academic_performance or condition in rows {first_row}-{first_row + len(df)}')
+        yield first_row, X, y.astype(np.int8)
+        first_row += len(df)
+
+
+def open_columnar(path):
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    columns = [np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in FEATURES]
+    return columns, np.load(os.path.join(path, f'{TARGET}.npy'), mmap_mode='r'), meta
+
+
+def iter_columnar_chunks(path, chunk_size):
+    columns, y, meta = open_columnar(path)
+    for start in range(0, meta['rows'], chunk_size):
+        end = min(start + chunk_size, meta['rows'])
+        yield start, np.column_stack([column[start:end] for column in columns]), np.asarray(y[start:end])
+
+
+def iter_bootstrap_subsets(path, subset_rows, rounds, test_every, seed):
+    """Yield (None, X, y) random training subsets; rows are gathered from the memory map in sorted order."""
+    columns, y, meta = open_columnar(path)
+    rng = np.random.default_rng(seed)
+    for _ in range(rounds):
+        index = np.sort(rng.integers(0, meta['rows'], subset_rows))
+        index = index[index % test_every != 0]
+        yield None, np.column_stack([column[index] for column in columns]), np.asarray(y[index])
+
+
+def prefetch(iterable, depth=1):
+    """Iterate in a background thread, `depth` items ahead; yields (item, seconds the caller waited)."""
+    items = queue.Queue(depth)
+    done = object()
+
+    def producer():
+        try:
+            for item in iterable:
+                items.put(item)
+        except Exception as e:  # re-raised in the consumer
+            items.put(e)
+        items.put(done)
+
+    threading.Thread(target=producer, daemon=True).start()
+    while True:
+        start = time.perf_counter()
+        item = items.get()
+        waited = time.perf_counter() - start
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item, waited
+
+
+def split_test(first_row, X, y, test_every, test_parts, test_rows):
+    """Remove held-out rows (global row index divisible by test_every) from a chunk."""
+    if first_row is None:
+        return X, y
+    held_out = (np.arange(first_row, first_row + len(y)) % test_every) == 0
+    if test_rows[0] < MAX_TEST_ROWS:
+        keep = np.flatnonzero(held_out)[:MAX_TEST_ROWS - test_rows[0]]
+        test_parts.append((X[keep], y[keep]))
+        test_rows[0] += len(keep)
+    return X[~held_out], y[~held_out]
+
+
+def train_incremental(args, academic_classes, condition_classes):
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+
+    n_classes = len(condition_classes)
+    clf = RandomForestClassifier(n_estimators=0, warm_start=True, random_state=42, n_jobs=args.n_jobs,
+                                 max_depth=args.max_depth, min_samples_leaf=args.min_samples_leaf)
+    if args.sampling == 'bootstrap':
+        subsets = iter_bootstrap_subsets(args.input, args.subset_rows, args.rounds, args.test_every, args.seed)
+        # Test rows for bootstrap mode come from a sequential pass over the held-out positions
+        columns, y_all, meta = open_columnar(args.input)
+        test_index = np.arange(0, meta['rows'], args.test_every)[:MAX_TEST_ROWS]
+        test_parts = [(np.column_stack([column[test_index] for column in columns]), np.asarray(y_all[test_index]))]
+    else:
+        subsets = (iter_columnar_chunks(args.input, args.chunk_size) if is_columnar(args.input)
+                   else iter_csv_chunks(args.input, args.chunk_size, academic_classes, condition_classes))
+        test_parts = []
+    test_rows = [0]
+
+    wait_seconds = fit_seconds = 0.0
+    train_rows = skipped_rows = 0
+    carry = None
+    for (first_row, X, y), waited in prefetch(subsets):
+        wait_seconds += waited
+        X, y = split_test(first_row, X, y, args.test_every, test_parts, test_rows)
+        if carry is not None:
+            X, y = np.concatenate([carry[0], X]), np.concatenate([carry[1], y])
+            carry = None
+        if len(np.unique(y)) < n_classes:
+            # Every batch of trees must see every class, or their probability columns would not line up
+            carry = (X, y)
+            continue
+        start = time.perf_counter()
+        clf.n_estimators += args.trees_per_chunk
+        clf.fit(pd.DataFrame(X, columns=FEATURES), y)
+        fit_seconds += time.perf_counter() - start
+        train_rows += len(y)
+        print(f"{clf.n_estimators} trees, {train_rows:,} rows, RSS peak {peak_rss_mb()} MB", file=sys.stderr)
+    if carry is not None:
+        skipped_rows = len(carry[1])
+    if not clf.n_estimators:
+        raise ValueError('No chunk contained every condition; use a larger --chunk-size')
+
+    X_test = np.concatenate([part[0] for part in test_parts])
+    y_test = np.concatenate([part[1] for part in test_parts])
+    return clf, X_test, y_test, {'train_rows': train_rows, 'skipped_rows': skipped_rows,
+                                 'fit_seconds': round(fit_seconds, 3), 'load_wait_seconds': round(wait_seconds, 3)}
+
+
+def train_in_memory(args, academic_classes, condition_classes):
+    """train_model.py's fit: whole file in a default-dtype DataFrame, 100 trees at once."""
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+
+    if is_columnar(args.input):
+        columns, y, _ = open_columnar(args.input)
+        df = pd.DataFrame({name: np.asarray(column, dtype=np.int64) for name, column in zip(FEATURES, columns)})
+        df[TARGET] = np.asarray(y, dtype=np.int64)
+    else:
+        df = pd.read_csv(args.input)
+        df['academic_performance'] = df['academic_performance'].map(academic_classes.index)
+        df[TARGET] = df[TARGET].map(condition_classes.index)
+        for column in BOOL_COLUMNS:
+            df[column] = df[column].astype(int)
+    held_out = (np.arange(len(df)) % args.test_every) == 0
+    test = df[held_out].iloc[:MAX_TEST_ROWS]
+    train = df[~held_out]
+
+    clf = RandomForestClassifier(n_estimators=args.n_estimators, random_state=42, n_jobs=args.n_jobs,
+                                 max_depth=args.max_depth, min_samples_leaf=args.min_samples_leaf)
+    start = time.perf_counter()
+    clf.fit(train[FEATURES], train[TARGET])
+    fit_seconds = time.perf_counter() - start
+    return clf, test[FEATURES].to_numpy(dtype=np.int8), test[TARGET].to_numpy(dtype=np.int8), {
+        'train_rows': len(train), 'fit_seconds': round(fit_seconds, 3)}
+
+
+def train(args):
+    academic_classes, condition_classes = source_classes()
+    start = time.perf_counter()
+    if args.in_memory:
+        clf, X_test, y_test, result = train_in_memory(args, academic_classes, condition_classes)
+    else:
+        clf, X_test, y_test, result = train_incremental(args, academic_classes, condition_classes)
+    result.update({
+        'mode': 'in_memory' if args.in_memory else args.sampling,
+        'input': args.input,
+        'wall_seconds': round(time.perf_counter() - start, 3),
+        'peak_rss_mb': peak_rss_mb(),
+        'trees': len(clf.estimators_),
+        'total_nodes': int(sum(estimator.tree_.node_count for estimator in clf.estimators_)),
+        'test_rows': len(y_test),
+    })
+    import pandas as pd
+    predictions = np.concatenate([clf.predict(pd.DataFrame(X_test[i:i + 100000], columns=FEATURES))
+                                  for i in range(0, len(X_test), 100000)])
+    result['test_accuracy'] = round(float((predictions == y_test).mean()), 4)
+
+    if args.bundle:
+        from sklearn.preprocessing import LabelEncoder
+        from export_forest import export_bundle
+        export_bundle(clf, LabelEncoder().fit(academic_classes), LabelEncoder().fit(condition_classes))
+    return result
+
+
+def compare(args):
+    """Run in-memory and out-of-core training on synthetic datasets of each size, one process per run."""
+    from bench_scale import dataset
+
+    model = DatasetModel()
+    runs = []
+    for rows in args.compare:
+        path = dataset(model, rows, args.seed, 'csv' if args.sampling == 'chunk' else 'columnar')
+        modes = [[], ['--in-memory']] if rows <= args.in_memory_max_rows else [[]]
+        for extra in modes:
+            command = [sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--input', path, '--json',
+                       '--sampling', args.sampling, '--chunk-size', str(args.chunk_size),
+                       '--trees-per-chunk', str(args.trees_per_chunk), '--subset-rows', str(args.subset_rows),
+                       '--rounds', str(args.rounds), '--n-estimators', str(args.n_estimators),
+                       '--n-jobs', str(args.n_jobs), '--test-every', str(args.test_every),
+                       '--min-samples-leaf', str(args.min_samples_leaf)] + extra
+            if args.max_depth is not None:
+                command += ['--max-depth', str(args.max_depth)]
+            stdout = subprocess.run(command, check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+            result = json.loads(stdout)
+            result['rows'] = rows
+            runs.append(result)
+
+    print(f"{'rows':>11} {'mode':>10} {'wall_s':>8} {'rss_mb':>8} {'accuracy':>8} {'trees':>5} {'nodes':>9}")
+    for result in runs:
+        rss = 'n/a' if result['peak_rss_mb'] is None else f"{result['peak_rss_mb']:.0f}"
+        print(f"{result['rows']:>11,} {result['mode']:>10} {result['wall_seconds']:>8.1f} {rss:>8} "
+              f"{result['test_accuracy']:>8.4f} {result['trees']:>5} {result['total_nodes']:>9}", file=sys.stderr)
+    return {'cpu_count': os.cpu_count(), 'runs': runs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Out-of-core random forest training.")
+    parser.add_argument('--input', help="training-format CSV, or a columnar dataset directory")
+    parser.add_argument('--sampling', choices=['chunk', 'bootstrap'], default='chunk')
+    parser.add_argument('--chunk-size', type=int, default=250000)
+    parser.add_argument('--trees-per-chunk', type=int, default=10, help="trees added per chunk or subset")
+    parser.add_argument('--subset-rows', type=int, default=250000, help="rows per bootstrap subset")
+    parser.add_argument('--rounds', type=int, default=10, help="bootstrap subsets (trees = rounds x trees-per-chunk)")
+    parser.add_argument('--n-estimators', type=int, default=100, help="trees for --in-memory")
+    parser.add_argument('--max-depth', type=int)
+    parser.add_argument('--min-samples-leaf', type=int, default=1)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--test-every', type=int, default=10, help="hold out every Nth row for evaluation")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--in-memory', action='store_true', help="fit train_model.py's way, for comparison")
+    parser.add_argument('--bundle', action='store_true', help="export the fitted forest as the serving bundle")
+    parser.add_argument('--json', action='store_true', help="print only the JSON result")
+    parser.add_argument('--compare', nargs='+', type=int, metavar='ROWS',
+                        help="compare in-memory and out-of-core training on synthetic datasets of these sizes")
+    parser.add_argument('--in-memory-max-rows', type=int, default=2000000,
+                        help="largest --compare size also fitted in memory (default 2,000,000)")
+    parser.add_argument('--report', help="write the JSON result here as well")
+    args = parser.parse_args()
+    if args.sampling == 'bootstrap' and args.input and not is_columnar(args.input):
+        parser.error('--sampling bootstrap needs a columnar dataset (generate_dataset.py --format columnar)')
+
+    if args.compare:
+        result = compare(args)
+    elif args.input:
+        result = train(args)
+    else:
+        parser.error('--input or --compare is required')
+
+    text = json.dumps(result, indent=None if args.json else 2)
+    print(text)
+    if args.report:
+        with open(args.report, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GridSearchCV, ParameterGrid, train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+from export_forest import export_bundle
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'backend'))
+
+from forest import CompiledForest  # noqa: E402
+
+CACHE_DIR = os.path.join(HERE, '.cache')
+
+PARAM_GRID = {
+    'n_estimators': [25, 50, 100, 200],
+    'max_depth': [None, 8, 12, 16],
+    'min_samples_leaf': [1, 2, 5],
+}
+
+BOOL_COLUMNS = ['bullied', 'has_close_friends', 'sports_participation']
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_encoded(csv_path, cache_dir=CACHE_DIR):
+    """Encoded (X, y) and encoder classes for a CSV, cached on disk by a hash of its contents."""
+    cache_path = os.path.join(cache_dir, f'encoded-{file_hash(csv_path)[:16]}.npz')
+    if os.path.exists(cache_path):
+        with np.load(cache_path) as data:
+            print(f"Using cached encoded data {cache_path}")
+            return (data['X'], data['y'], data['feature_names'].tolist(),
+                    data['academic_classes'].tolist(), data['condition_classes'].tolist())
+
+    # Same encoding as train_model.py
+    df = pd.read_csv(csv_path)
+    le_academic = LabelEncoder()
+    df['academic_performance'] = le_academic.fit_transform(df['academic_performance'])
+    le_condition = LabelEncoder()
+    df['mental_health_condition'] = le_condition.fit_transform(df['mental_health_condition'])
+    for column in BOOL_COLUMNS:
+        df[column] = df[column].astype(int)
+
+    X_df = df.drop('mental_health_condition', axis=1)
+    X = X_df.to_numpy(dtype=np.int8)
+    y = df['mental_health_condition'].to_numpy(dtype=np.int8)
+    feature_names = list(X_df.columns)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Class labels as fixed-width strings: object arrays would need allow_pickle to load
+    np.savez(cache_path, X=X, y=y, feature_names=feature_names,
+             academic_classes=le_academic.classes_.astype(str), condition_classes=le_condition.classes_.astype(str))
+    return X, y, feature_names, list(le_academic.classes_), list(le_condition.classes_)
+
+
+def search_key(csv_path, cv):
+    """Cache key for a search: the data, the parameter grid and the CV settings."""
+    config = json.dumps({'csv': file_hash(csv_path), 'grid': PARAM_GRID, 'cv': cv, 'random_state': 42},
+                        sort_keys=True)
+    return hashlib.sha256(config.encode()).hexdigest()[:16]
+
+
+def cross_validate(X_train, y_train, feature_names, cv, n_jobs, key, cache_dir=CACHE_DIR):
+    """Candidate params with mean and std CV accuracy, cached on disk under `key`."""
+    cache_path = os.path.join(cache_dir, f'search-{key}.json')
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            print(f"Using cached search results {cache_path}")
+            return json.load(f)
+
+    search = GridSearchCV(RandomForestClassifier(random_state=42), PARAM_GRID, cv=cv,
+                          scoring='accuracy', n_jobs=n_jobs)
+    search.fit(pd.DataFrame(X_train, columns=feature_names), y_train)
+    cv_results = {
+        'params': search.cv_results_['params'],
+        'mean_test_score': search.cv_results_['mean_test_score'].tolist(),
+        'std_test_score': search.cv_results_['std_test_score'].tolist(),
+    }
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_path, 'w') as f:
+        json.dump(cv_results, f)
+    return cv_results
+
+
+def best_time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(clf, le_academic, le_condition, X_test, y_test, bundle_path):
+    """Accuracy, bundle size and latency of a fitted candidate as the API serves it.
+
+    The candidate is exported to bundle_path and scored by CompiledForest
+    from the memory-mapped bundle, like the 'model' backend. Run serially so
+    timings are not contended.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        export_bundle(clf, le_academic, le_condition, bundle_path)
+    forest = CompiledForest.load(bundle_path)
+    row = X_test[0].tolist()
+    batch = np.resize(X_test, (1000, X_test.shape[1]))
+    labels = np.array(le_condition.classes_)[y_test]
+    return {
+        'test_accuracy': float((np.array(forest.predict(X_test)) == labels).mean()),
+        'bundle_bytes': os.path.getsize(bundle_path),
+        'bundle_load_ms': forest.bundle.load_seconds * 1000,
+        'total_nodes': int(len(forest.feature)),
+        'single_row_ms': best_time(lambda: forest.predict_one(row), 20) * 1000,
+        'batch_1000_ms': best_time(lambda: forest.predict(batch), 5) * 1000,
+    }
+
+
+def fit_candidate(params, X_train, y_train, feature_names):
+    clf = RandomForestClassifier(random_state=42, n_jobs=1, **params)
+    clf.fit(pd.DataFrame(X_train, columns=feature_names), y_train)
+    return clf
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validated random forest search with serving-cost report.")
+    parser.add_argument('--csv', default='boarding_school_mental_health_2500.csv')
+    parser.add_argument('--cv', type=int, default=5)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="parallel workers (default: all cores)")
+    parser.add_argument('--report', default='training_report.json')
+    parser.add_argument('--save', type=int, metavar='RANK',
+                        help="save the candidate at this rank in the report (1 = best CV accuracy) "
+                             "as mental_health_rf_model.pkl with its encoders, and export the serving bundle")
+    args = parser.parse_args()
+    candidate_count = len(ParameterGrid(PARAM_GRID))
+    if args.save is not None and not 1 <= args.save <= candidate_count:
+        parser.error(f"--save must be a rank between 1 and {candidate_count}")
+
+    X, y, feature_names, academic_classes, condition_classes = load_encoded(args.csv)
+    # Same split as train_model.py, so test accuracy is comparable
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    start = time.perf_counter()
+    cv_results = cross_validate(X_train, y_train, feature_names, args.cv, args.n_jobs,
+                                search_key(args.csv, args.cv))
+    search_seconds = time.perf_counter() - start
+
+    candidates = cv_results['params']
+    start = time.perf_counter()
+    fitted = Parallel(n_jobs=args.n_jobs)(
+        delayed(fit_candidate)(params, X_train, y_train, feature_names) for params in candidates)
+    fit_seconds = time.perf_counter() - start
+
+    le_academic = LabelEncoder().fit(academic_classes)
+    le_condition = LabelEncoder().fit(condition_classes)
+    results = []
+    with tempfile.TemporaryDirectory() as bundle_dir:
+        for i, (params, clf) in enumerate(zip(candidates, fitted)):
+            result = {
+                'params': params,
+                'cv_accuracy': float(cv_results['mean_test_score'][i]),
+                'cv_accuracy_std': float(cv_results['std_test_score'][i]),
+            }
+            result.update(measure(clf, le_academic, le_condition, X_test, y_test,
+                                  os.path.join(bundle_dir, f'candidate-{i}.bundle')))
+            results.append(result)
+    order = sorted(range(len(results)), key=lambda i: -results[i]['cv_accuracy'])
+    results = [results[i] for i in order]
+    fitted = [fitted[i] for i in order]
+
+    print(f"{'rank':>4} {'trees':>5} {'depth':>5} {'leaf':>4} {'cv_acc':>7} {'test_acc':>8} "
+          f"{'size_kb':>8} {'row_ms':>7} {'batch_ms':>8}")
+    for rank, result in enumerate(results, 1):
+        params = result['params']
+        print(f"{rank:>4} {params['n_estimators']:>5} {str(params['max_depth']):>5} {params['min_samples_leaf']:>4} "
+              f"{result['cv_accuracy']:>7.4f} {result['test_accuracy']:>8.4f} {result['bundle_bytes'] / 1024:>8.0f} "
+              f"{result['single_row_ms']:>7.2f} {result['batch_1000_ms']:>8.2f}")
+
+    report = {
+        'csv': args.csv,
+        'rows': int(len(X)),
+        'cv_folds': args.cv,
+        'n_jobs': args.n_jobs,
+        'cpu_count': os.cpu_count(),
+        'search_seconds': search_seconds,
+        'fit_seconds': fit_seconds,
+        'candidates': results,
+    }
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Search took {search_seconds:.1f}s; report written to {args.report}")
+
+    if args.save is not None:
+        clf = fitted[args.save - 1]
+        joblib.dump(clf, 'mental_health_rf_model.pkl')
+        joblib.dump(le_academic, 'le_academic.pkl')
+        joblib.dump(le_condition, 'le_condition.pkl')
+        export_bundle(clf, le_academic, le_condition)
+        print(f"Saved candidate {args.save}: {results[args.save - 1]['params']}")
+
+
+if __name__ == "__main__":
+    main()